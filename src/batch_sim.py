@@ -0,0 +1,307 @@
+"""Batched simulation of many Sushi Go games in lock-step.
+
+The state of N two-player games lives in NumPy arrays, and every step of
+``Game.conduct_round`` (dealing, the maximizer choice, switching hands
+and scoring) runs as one array operation across the whole batch.
+
+Games seeded through ``BatchGame.from_seeds`` replay exactly the games
+``Game`` plays with ``Deck(random.Random(seed))``: dealing consumes the
+same uniform draws in the same order, and ties between cards are broken
+by position in the hand, as ``SushiGoMaximizer`` does.
+"""
+
+import random
+from functools import cache
+
+import numpy as np
+
+from cards import DECK_COUNTS, DEFAULT_RULES, NUM_KINDS
+
+HAND_SIZE = 3  # cards dealt to each player per round, as in Game
+NUM_PLAYERS = 2
+DECK_SIZE = sum(DECK_COUNTS)
+EMPTY = -1  # hand slot of a card that was already played
+
+_DECK_KINDS = np.repeat(np.arange(NUM_KINDS, dtype=np.int8), DECK_COUNTS)
+_KIND_INDEX = np.arange(NUM_KINDS)
+
+
+def cards_per_game(rounds):
+    """Number of cards a game of ``rounds`` rounds deals."""
+    return rounds * NUM_PLAYERS * HAND_SIZE
+
+
+@cache
+def _rule_arrays(rules):
+    """NumPy forms of the lookup tables of ``rules``."""
+    nigiri = np.zeros(NUM_KINDS, dtype=np.int64)
+    for kind in rules.nigiri_kinds:
+        nigiri[kind] = rules.faces[kind]
+    wasabi = np.zeros(NUM_KINDS, dtype=bool)
+    wasabi[list(rules.wasabi_kinds)] = True
+    return (
+        np.array(rules.points, dtype=np.int64),
+        np.array(rules.best_scores, dtype=np.int64),
+        np.array(rules.faces, dtype=np.int64),
+        nigiri,
+        wasabi,
+        np.array(rules.icons, dtype=np.int64),
+    )
+
+
+def _top_nigiri(counts, nigiri):
+    """Value of the best nigiri of each count vector."""
+    return ((counts > 0) * nigiri).max(axis=-1)
+
+
+def score_tables(counts, rules=DEFAULT_RULES):
+    """Score table count arrays of shape (..., NUM_KINDS).
+
+    Maki majority, a bonus of the round, is not included.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    points, _, _, nigiri, wasabi, _ = _rule_arrays(rules)
+    has_wasabi = (counts[..., wasabi] > 0).any(axis=-1)
+    return points[_KIND_INDEX, counts].sum(axis=-1) + np.where(
+        has_wasabi, rules.wasabi_extra * _top_nigiri(counts, nigiri), 0
+    )
+
+
+def round_bonuses(tables, rules=DEFAULT_RULES):
+    """Vectorized ``Rules.round_bonuses`` of two-player rounds.
+
+    Args:
+        tables: Table counts of both seats, shape (..., 2, NUM_KINDS).
+        rules: ``rules.Rules`` with the maki majority points, if any.
+
+    Returns:
+        The bonus of each seat, shape (..., 2).
+    """
+    tables = np.asarray(tables, dtype=np.int64)
+    bonuses = np.zeros(tables.shape[:-1], dtype=np.int64)
+    if rules.maki_majority is None:
+        return bonuses
+    icons = tables @ _rule_arrays(rules)[5]
+    first, second = (*rules.maki_majority, 0, 0)[:2]
+    for seat in range(NUM_PLAYERS):
+        mine = icons[..., seat]
+        theirs = icons[..., 1 - seat]
+        bonuses[..., seat] = np.where(
+            mine > theirs,
+            first,
+            np.where(
+                mine == theirs,
+                first // 2,
+                second,
+            ),
+        ) * (mine > 0)
+    return bonuses
+
+
+def score_rounds(tables, rules=DEFAULT_RULES):
+    """Scores of two-player rounds, round bonuses included.
+
+    Args:
+        tables: Table counts of both seats, shape (..., 2, NUM_KINDS).
+        rules: ``rules.Rules`` to score with.
+    """
+    return score_tables(tables, rules) + round_bonuses(tables, rules)
+
+
+def maximizer_values(counts, rules=DEFAULT_RULES):
+    """Vectorized ``TableTally.best_score`` of every kind.
+
+    Args:
+        counts: Shared table counts of shape (..., NUM_KINDS).
+        rules: ``rules.Rules`` the values come from.
+
+    Returns:
+        The maximizer score of one card of each kind against each table,
+        with the same shape as ``counts``.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    _, best_scores, faces, nigiri, wasabi, _ = _rule_arrays(rules)
+    values = best_scores[_KIND_INDEX, counts]
+    has_wasabi = (counts[..., wasabi] > 0).any(axis=-1, keepdims=True)
+    is_nigiri = nigiri > 0
+    values[..., is_nigiri] = faces[is_nigiri] * np.where(
+        has_wasabi, rules.wasabi_extra, 1
+    )
+    values[..., wasabi] = (
+        rules.wasabi_extra * _top_nigiri(counts, nigiri)[..., None]
+    )
+    return values
+
+
+class BatchGame:
+    """A batch of two-player games played in lock-step.
+
+    Attributes:
+        decks: Card kinds of each game's deck, shape (N, DECK_SIZE).
+        hands: Card kind in each hand slot, shape (N, 2, HAND_SIZE);
+            played slots are ``EMPTY`` so the others keep their order.
+        tables: Card counts on each player's table, shape (N, 2, KINDS).
+        common: Counts of the shared ``cards_on_table``, shape (N, KINDS).
+        round_scores: Score of each round, shape (N, rounds, 2).
+        rules: ``rules.Rules`` the games are scored with.
+    """
+
+    def __init__(self, uniforms, rounds, rules=None):
+        """Initializes the batch.
+
+        Args:
+            uniforms: Uniform draws in [0, 1) used to shuffle, shape
+                (N, cards_per_game(rounds)).
+            rounds: Number of rounds of each game.
+            rules: ``rules.Rules`` of the variant to play; the game's by
+                default.
+        """
+        uniforms = np.asarray(uniforms, dtype=np.float64)
+        if cards_per_game(rounds) > DECK_SIZE:
+            raise ValueError("Not enough cards in the deck.")
+        if uniforms.shape[1] < cards_per_game(rounds):
+            raise ValueError("Not enough uniform draws for the rounds.")
+        num_games = uniforms.shape[0]
+        self.rounds = rounds
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.uniforms = uniforms
+        self.decks = np.tile(_DECK_KINDS, (num_games, 1))
+        self.hands = np.full(
+            (num_games, NUM_PLAYERS, HAND_SIZE), EMPTY, dtype=np.int8
+        )
+        self.tables = np.zeros(
+            (num_games, NUM_PLAYERS, NUM_KINDS), dtype=np.int64
+        )
+        self.common = np.zeros((num_games, NUM_KINDS), dtype=np.int64)
+        self.round_scores = np.zeros(
+            (num_games, rounds, NUM_PLAYERS), dtype=np.int64
+        )
+        self._rows = np.arange(num_games)
+        self._cursor = 0
+
+    @classmethod
+    def from_seeds(cls, seeds, rounds, rules=None):
+        """Batch of the games ``Deck(random.Random(seed))`` would deal."""
+        draws = cards_per_game(rounds)
+        uniforms = np.empty((len(seeds), draws))
+        for row, seed in enumerate(seeds):
+            rand = random.Random(seed).random
+            uniforms[row] = [rand() for _ in range(draws)]
+        return cls(uniforms, rounds, rules)
+
+    @classmethod
+    def from_generator(cls, num_games, rounds, generator=None, rules=None):
+        """Batch of games shuffled with a NumPy ``Generator``."""
+        if generator is None:
+            generator = np.random.default_rng()
+        uniforms = generator.random((num_games, cards_per_game(rounds)))
+        return cls(uniforms, rounds, rules)
+
+    def __len__(self):
+        """Number of games in the batch."""
+        return len(self.decks)
+
+    def deal(self, num_cards):
+        """Deals the next ``num_cards`` cards of every deck.
+
+        Runs the next steps of a Fisher-Yates shuffle across the batch,
+        exactly like ``Deck.draw_kinds``.
+
+        Returns:
+            The dealt card kinds, shape (N, num_cards).
+        """
+        decks = self.decks
+        rows = self._rows
+        start = self._cursor
+        for i in range(start, start + num_cards):
+            j = i + (self.uniforms[:, i] * (DECK_SIZE - i)).astype(np.intp)
+            swapped = decks[rows, j]
+            decks[rows, j] = decks[:, i]
+            decks[:, i] = swapped
+        self._cursor = start + num_cards
+        return decks[:, start : self._cursor]
+
+    def hand_counts(self):
+        """Card counts of every hand, shape (N, 2, NUM_KINDS)."""
+        one_hot = self.hands[..., None] == np.arange(NUM_KINDS)
+        return one_hot.sum(axis=2)
+
+    def play(self, values, seat=None):
+        """Every player plays the best card of their hand.
+
+        Args:
+            values: Score of each card kind, shape (NUM_KINDS,),
+                (N, NUM_KINDS) or, for values of each seat,
+                (N, 2, NUM_KINDS). The first card in hand order with the
+                highest value is played, like ``SushiGoMaximizer``.
+            seat: Only the player in this seat plays; by default every
+                player does.
+
+        Returns:
+            The kinds played, shape (N, 2), or (N, 1) for one seat.
+        """
+        values = np.asarray(values)
+        hands = self.hands.astype(np.intp)
+        if values.ndim == 1:
+            scores = values[hands]
+        else:
+            if values.ndim == 2:
+                values = values[:, None, :]
+            scores = np.take_along_axis(values, hands.clip(min=0), axis=2)
+        scores = np.where(self.hands == EMPTY, -np.inf, scores)
+        slots = scores.argmax(axis=2)
+        seats = np.arange(NUM_PLAYERS) if seat is None else np.array([seat])
+        slots = slots[:, seats]
+        rows = self._rows[:, None]
+        seats = seats[None, :]
+        kinds = self.hands[rows, seats, slots]
+        self.tables[rows, seats, kinds] += 1
+        self.hands[rows, seats, slots] = EMPTY
+        return kinds
+
+    def switch_hands(self):
+        """Switches hands of players."""
+        self.hands = self.hands[:, ::-1].copy()
+
+    def conduct_round(self, strategy=None):
+        """Plays every round of every game in the batch.
+
+        Args:
+            strategy: ``strategies.Strategy`` with ``values_batch`` both
+                players play with; by default the first card is the
+                highest base score, as in ``Player.play_max_scoring_card``,
+                and the others are the maximizer's.
+        """
+        rules = self.rules
+        for round_index in range(self.rounds):
+            for player in range(NUM_PLAYERS):
+                self.hands[:, player] = self.deal(HAND_SIZE)
+
+            if strategy is None:
+                self.play(rules.faces)
+            else:
+                self.play(
+                    strategy.values_batch(self.common, first=True, rules=rules)
+                )
+            self.switch_hands()
+            for _ in range(HAND_SIZE - 1):
+                if strategy is None:
+                    self.play(maximizer_values(self.common, rules))
+                else:
+                    self.play(strategy.values_batch(self.common, rules=rules))
+                self.switch_hands()
+
+            self.round_scores[:, round_index] = score_rounds(
+                self.tables, rules
+            )
+            self.tables[:] = 0
+        return self.round_scores
+
+    def winners(self):
+        """Index of each game's winner, or -1 for a tie."""
+        totals = self.round_scores.sum(axis=1)
+        return np.where(
+            totals[:, 0] > totals[:, 1],
+            0,
+            np.where(totals[:, 1] > totals[:, 0], 1, -1),
+        )
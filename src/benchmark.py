@@ -0,0 +1,372 @@
+"""Benchmark suite for the Sushi Go simulation.
+
+Micro-benchmarks time the building blocks of a game (deck construction,
+dealing, card scores, the maximizer's decision and table scoring) and
+macro-benchmarks time whole headless games. Every benchmark draws its
+inputs from a fixed seed, and its time is the best of several repeats,
+so runs on different commits can be compared.
+
+Results are written as JSON and can be compared against a saved
+baseline; a benchmark regresses when its time per operation grows by
+more than the threshold::
+
+    python src/benchmark.py --output baseline.json
+    python src/benchmark.py --baseline baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import timeit
+
+from cards import KIND_NAMES
+from decision_cache import DecisionCache
+from events import NullSink
+from strategies import MAXIMIZER
+from sushi_go_game import (
+    CARDS,
+    Deck,
+    Game,
+    Player,
+    RandomTable,
+    SushiGoMaximizer,
+)
+
+RESULTS_VERSION = 1
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_TIME = 0.2
+DEFAULT_THRESHOLD = 0.10
+
+BENCHMARK_SEED = 2024
+HAND_SIZE = 3
+GAME_ROUNDS = 3
+GAMES_PER_RUN = 100
+BATCH_GAMES = 10_000
+SAMPLES = 1000
+
+
+def _random_cards(rng, count):
+    return [CARDS[rng.randrange(len(KIND_NAMES))] for _ in range(count)]
+
+
+def bench_deck():
+    """Builds a new deck."""
+    rng = random.Random(BENCHMARK_SEED)
+    return (lambda: Deck(rng)), 1
+
+
+def bench_assign_cards():
+    """Deals a new deck out in hands; includes building the deck."""
+    rng = random.Random(BENCHMARK_SEED)
+    player = Player("Benchmark")
+    hands = len(Deck(rng)) // HAND_SIZE
+
+    def run():
+        deck = Deck(rng)
+        for _ in range(hands):
+            player.assign_cards(deck, HAND_SIZE)
+
+    return run, hands
+
+
+def bench_card_score():
+    """Base score of a card."""
+    cards = _random_cards(random.Random(BENCHMARK_SEED), SAMPLES)
+
+    def run():
+        for card in cards:
+            card.score()
+
+    return run, len(cards)
+
+
+def bench_select_best_card():
+    """Maximizer decision for a hand against a shared table."""
+    rng = random.Random(BENCHMARK_SEED)
+    maximizers = []
+    for _ in range(SAMPLES):
+        player = Player("Benchmark")
+        player.hand = _random_cards(rng, HAND_SIZE)
+        table = RandomTable(_random_cards(rng, 4), player, None)
+        maximizers.append(SushiGoMaximizer(player, table))
+
+    def run():
+        for maximizer in maximizers:
+            maximizer.select_best_card()
+
+    return run, len(maximizers)
+
+
+def bench_choose_batch():
+    """Maximizer batch decision, per hand, with hands sharing tables."""
+    rng = random.Random(BENCHMARK_SEED)
+    tables = [
+        RandomTable(_random_cards(rng, 4), None, None)
+        for _ in range(SAMPLES // 10)
+    ]
+    hands = [_random_cards(rng, HAND_SIZE) for _ in range(SAMPLES)]
+    tables = [tables[i % len(tables)] for i in range(SAMPLES)]
+
+    def run():
+        MAXIMIZER.choose_batch(hands, tables)
+
+    return run, len(hands)
+
+
+def bench_calculate_final_score():
+    """Final score of a table of a full round."""
+    rng = random.Random(BENCHMARK_SEED)
+    game = Game("Player 1", "Player 2", 1, Deck(rng), sink=NullSink())
+    tables = [_random_cards(rng, 9) for _ in range(SAMPLES)]
+
+    def run():
+        for table in tables:
+            game.calculate_final_score(table)
+
+    return run, len(tables)
+
+
+def _bench_games(cache):
+    seeds = random.Random(BENCHMARK_SEED).sample(range(1 << 30), 1000)
+    cursor = [0]
+
+    def run():
+        start = cursor[0]
+        for seed in seeds[start : start + GAMES_PER_RUN]:
+            game = Game(
+                "Player 1",
+                "Player 2",
+                GAME_ROUNDS,
+                Deck(random.Random(seed)),
+                sink=NullSink(),
+                cache=cache,
+            )
+            game.conduct_round()
+        cursor[0] = (start + GAMES_PER_RUN) % len(seeds)
+
+    return run, GAMES_PER_RUN
+
+
+def bench_game():
+    """Whole headless game with the maximizer strategy."""
+    return _bench_games(None)
+
+
+def bench_game_cached():
+    """Whole headless game sharing a ``DecisionCache``."""
+    return _bench_games(DecisionCache())
+
+
+def bench_batch_game():
+    """Whole game played in a NumPy batch, per game."""
+    from batch_sim import BatchGame
+
+    seeds = range(BATCH_GAMES)
+    return (
+        lambda: BatchGame.from_seeds(seeds, GAME_ROUNDS).conduct_round()
+    ), BATCH_GAMES
+
+
+MICRO_BENCHMARKS = {
+    "deck": bench_deck,
+    "assign_cards": bench_assign_cards,
+    "card_score": bench_card_score,
+    "select_best_card": bench_select_best_card,
+    "choose_batch": bench_choose_batch,
+    "calculate_final_score": bench_calculate_final_score,
+}
+MACRO_BENCHMARKS = {
+    "game": bench_game,
+    "game_cached": bench_game_cached,
+    "batch_game": bench_batch_game,
+}
+BENCHMARKS = {**MICRO_BENCHMARKS, **MACRO_BENCHMARKS}
+
+
+def time_benchmark(factory, repeat=DEFAULT_REPEAT, min_time=DEFAULT_MIN_TIME):
+    """Times one benchmark.
+
+    Args:
+        factory: Function returning ``(run, ops)``, a callable to time
+            and the number of operations one call performs.
+        repeat: Number of timed repeats; the fastest one is kept.
+        min_time: Smallest duration of a repeat, in seconds.
+
+    Returns:
+        A dict with the time per operation and operations per second.
+    """
+    run, ops = factory()
+    timer = timeit.Timer(run)
+    run()  # warm up lazily built state
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    best = min(timer.repeat(repeat, number)) / number
+    return {
+        "ns_per_op": best / ops * 1e9,
+        "ops_per_sec": ops / best,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def _commit():
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def run_benchmarks(
+    names=None, repeat=DEFAULT_REPEAT, min_time=DEFAULT_MIN_TIME
+):
+    """Runs benchmarks and returns the results as a JSON-ready dict.
+
+    Args:
+        names: Benchmarks to run, keys of ``BENCHMARKS``; all by default.
+        repeat: Number of timed repeats of each benchmark.
+        min_time: Smallest duration of a repeat, in seconds.
+
+    Raises:
+        ValueError: If a name is not a known benchmark.
+    """
+    names = list(BENCHMARKS) if names is None else list(names)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(unknown)}")
+    return {
+        "version": RESULTS_VERSION,
+        "metadata": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "commit": _commit(),
+            "seed": BENCHMARK_SEED,
+        },
+        "benchmarks": {
+            name: time_benchmark(BENCHMARKS[name], repeat, min_time)
+            for name in names
+        },
+    }
+
+
+def save_results(results, path):
+    """Writes benchmark results to a JSON file."""
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def load_results(path):
+    """Reads benchmark results written by ``save_results``.
+
+    Raises:
+        ValueError: If the file holds results of another version.
+    """
+    with open(path) as file:
+        results = json.load(file)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(
+            f"Benchmark results version {results.get('version')} "
+            f"is not supported."
+        )
+    return results
+
+
+def compare(results, baseline):
+    """Compares results against a baseline.
+
+    Args:
+        results: Results of ``run_benchmarks``.
+        baseline: Earlier results to compare against.
+
+    Returns:
+        A list of ``(name, baseline ns/op, ns/op, change)`` tuples for
+        the benchmarks present in both, where ``change`` is the relative
+        change of the time per operation.
+    """
+    rows = []
+    for name, current in results["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+        if previous is None:
+            continue
+        before = previous["ns_per_op"]
+        after = current["ns_per_op"]
+        rows.append((name, before, after, after / before - 1))
+    return rows
+
+
+def regressions(rows, threshold=DEFAULT_THRESHOLD):
+    """Names of the compared benchmarks that slowed beyond ``threshold``."""
+    return [name for name, _, _, change in rows if change > threshold]
+
+
+def format_results(results, rows=None, threshold=DEFAULT_THRESHOLD):
+    """Formats results, and their comparison if given, as a table."""
+    changes = {name: change for name, _, _, change in rows or ()}
+    lines = [f"{'benchmark':<24}{'ns/op':>14}{'ops/s':>14}{'change':>10}"]
+    for name, result in results["benchmarks"].items():
+        line = (
+            f"{name:<24}{result['ns_per_op']:>14.1f}"
+            f"{result['ops_per_sec']:>14.1f}"
+        )
+        if name in changes:
+            change = changes[name]
+            flag = " !" if change > threshold else ""
+            line += f"{change:>+10.1%}{flag}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Runs the suite from the command line; returns the exit status."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark suite for the Sushi Go simulation."
+    )
+    parser.add_argument(
+        "names",
+        nargs="*",
+        help="benchmarks to run, or 'micro' or 'macro'; all by default",
+    )
+    parser.add_argument("--output", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare against these results")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME)
+    args = parser.parse_args(argv)
+
+    names = []
+    for name in args.names:
+        if name == "micro":
+            names += MICRO_BENCHMARKS
+        elif name == "macro":
+            names += MACRO_BENCHMARKS
+        else:
+            names.append(name)
+    results = run_benchmarks(names or None, args.repeat, args.min_time)
+    if args.output:
+        save_results(results, args.output)
+
+    rows = None
+    if args.baseline:
+        rows = compare(results, load_results(args.baseline))
+    print(format_results(results, rows, args.threshold))
+    if rows is not None:
+        slower = regressions(rows, args.threshold)
+        if slower:
+            print(f"\nRegressions: {', '.join(slower)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,602 @@
+"""Asyncio server that plays matches between bots over local sockets.
+
+Bots are separate processes that connect over TCP or a Unix socket and
+speak a line-delimited protocol: one compact JSON object per line, in
+both directions. A bot sends ``hello`` once, is paired with the next
+waiting bot, and plays a two-player match under the ``Game`` rules:
+both seats choose simultaneously from the state before the turn, then
+the hands are switched.
+
+Messages from the server:
+
+- ``{"type": "start", "match": id, "seat": s, "opponent": name,
+  "rounds": r}``
+- ``{"type": "move", "move": n, "round": r, "turn": t, "hand": kinds,
+  "table": kinds, "opponent_table": kinds}``: the bot must answer
+  ``{"type": "play", "move": n, "kind": k}`` with a kind in its hand.
+- ``{"type": "round", "round": r, "scores": [own, opponent]}``
+- ``{"type": "end", "totals": [own, opponent], "result": "win"}``, or
+  ``"loss"`` or ``"tie"``; the bot answers ``{"type": "ready"}`` to be
+  paired again, or closes the connection.
+
+A move not answered within ``move_timeout`` seconds, or answered with a
+card that is not in the hand, is played for the bot by the fallback
+strategy, so one slow or broken bot never stalls its opponent. Replies
+to an earlier move are discarded by their ``move`` number.
+
+Every step of a match between two socket reads is a few table lookups,
+so game logic runs on the event loop itself; handing it to a thread
+would cost more than it takes. Outgoing lines wait on
+``StreamWriter.drain``, so a bot that stops reading is slowed down (and
+eventually timed out) instead of growing the server's buffers, and at
+most ``max_matches`` matches are played at once; other pairs wait.
+
+``python src/bot_server.py selfplay`` plays matches between stand-in
+bots (``run_bot``) in one process and prints the move latency.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import time
+from array import array
+
+from stats import ResultsAggregator
+from strategies import get_strategy
+from sushi_go_game import CARDS, Deck, Player, RandomTable
+from tournament import game_seed
+
+DEFAULT_ROUNDS = 3
+HAND_SIZE = 3  # cards dealt to each player per round, as in Game
+DEFAULT_MOVE_TIMEOUT = 1.0
+DEFAULT_IDLE_TIMEOUT = 30.0
+DEFAULT_MAX_MATCHES = 10_000
+DEFAULT_MAX_SAMPLES = 1_000_000
+MAX_LINE = 1 << 16
+WAITING_CHECK = 0.1  # seconds between checks that a waiting bot is there
+RESULTS = ("loss", "tie", "win")
+
+
+def encode(message):
+    """One protocol line of a message."""
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+class LatencyRecorder:
+    """Move latencies in nanoseconds, with percentiles.
+
+    Beyond ``max_samples`` moves a uniform reservoir sample is kept, so
+    memory stays bounded on a long-running server.
+
+    Attributes:
+        count: Moves recorded.
+        samples: Recorded latencies, or a uniform sample of them.
+    """
+
+    def __init__(self, max_samples=DEFAULT_MAX_SAMPLES, rng=None):
+        """Initializes an empty recorder."""
+        self.max_samples = max_samples
+        self.count = 0
+        self.samples = array("Q")
+        self._rng = random.Random() if rng is None else rng
+
+    def add(self, latency):
+        """Records the latency of one move."""
+        self.count += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append(latency)
+            return
+        index = self._rng.randrange(self.count)
+        if index < self.max_samples:
+            self.samples[index] = latency
+
+    def percentile(self, q):
+        """Latency below which ``q`` percent of the moves fall.
+
+        Uses the nearest rank; 0 without samples.
+        """
+        if not self.samples:
+            return 0
+        ordered = sorted(self.samples)
+        rank = max(1, -(-len(ordered) * q // 100))
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def report(self):
+        """Move count and p50/p99 latency in microseconds."""
+        return (
+            f"moves {self.count}, p50 {self.percentile(50) / 1e3:.1f} us, "
+            f"p99 {self.percentile(99) / 1e3:.1f} us"
+        )
+
+
+class _Bot:
+    """Connection of one bot."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.name = None
+        self.connected = True
+
+    @property
+    def alive(self):
+        """Whether the bot is still connected.
+
+        A bot waiting for an opponent is not read from, so a closed
+        connection shows only as the end of its stream.
+        """
+        if self.connected and (
+            self.reader.at_eof() or self.writer.is_closing()
+        ):
+            self.connected = False
+        return self.connected
+
+    async def send(self, message):
+        """Writes a message, waiting while the socket buffer is full."""
+        if not self.connected:
+            return
+        try:
+            self.writer.write(encode(message))
+            await self.writer.drain()
+        except (ConnectionError, RuntimeError):
+            self.connected = False
+
+    async def receive(self):
+        """Next message, or None once the bot is gone."""
+        if not self.connected:
+            return None
+        try:
+            line = await self.reader.readline()
+            message = json.loads(line) if line else None
+        except (ConnectionError, ValueError):
+            # ValueError also covers lines longer than MAX_LINE
+            message = None
+        if not isinstance(message, dict):
+            self.connected = False
+            return None
+        return message
+
+    async def request(self):
+        """Next message that is not a late ``play``, or None."""
+        message = await self.receive()
+        while message is not None and message.get("type") == "play":
+            message = await self.receive()
+        return message
+
+    async def ask(self, message):
+        """Sends a move request and waits for its reply.
+
+        Returns:
+            The reply, or None if the bot is gone, and its latency in
+            nanoseconds.
+        """
+        await self.send(message)
+        start = time.perf_counter_ns()
+        while True:
+            reply = await self.receive()
+            if reply is None or reply.get("move") == message["move"]:
+                return reply, time.perf_counter_ns() - start
+
+
+class BotServer:
+    """Pairs connected bots and plays their matches.
+
+    Attributes:
+        rounds: Rounds per match.
+        move_timeout: Seconds a bot has to answer a move.
+        idle_timeout: Seconds a bot has to say ``hello`` or ``ready``.
+        seed: Match ``i`` is dealt from ``Deck(Random(game_seed(seed,
+            i)))``, the deck of ``tournament.play_game(seed, i)``.
+        fallback: ``Strategy`` that plays the moves a bot misses.
+        latency: ``LatencyRecorder`` of every answered move.
+        results: ``stats.ResultsAggregator`` of the finished matches.
+        matches: Matches started.
+        timeouts: Moves not answered in time.
+        invalid_moves: Moves answered with a card not in the hand.
+    """
+
+    def __init__(
+        self,
+        rounds=DEFAULT_ROUNDS,
+        move_timeout=DEFAULT_MOVE_TIMEOUT,
+        idle_timeout=DEFAULT_IDLE_TIMEOUT,
+        max_matches=DEFAULT_MAX_MATCHES,
+        seed=0,
+        fallback="default",
+    ):
+        """Initializes the server; call ``start_tcp`` or ``start_unix``."""
+        self.rounds = rounds
+        self.move_timeout = move_timeout
+        self.idle_timeout = idle_timeout
+        self.seed = seed
+        self.fallback = get_strategy(fallback)
+        self.latency = LatencyRecorder()
+        self.results = ResultsAggregator()
+        self.matches = 0
+        self.timeouts = 0
+        self.invalid_moves = 0
+        self._slots = asyncio.Semaphore(max_matches)
+        self._waiting = None
+        self._connections = set()
+
+    async def start_tcp(self, host="127.0.0.1", port=0):
+        """Listens on a TCP port; returns the ``asyncio.Server``."""
+        return await asyncio.start_server(
+            self._serve, host, port, limit=MAX_LINE
+        )
+
+    async def start_unix(self, path):
+        """Listens on a Unix socket; returns the ``asyncio.Server``."""
+        return await asyncio.start_unix_server(
+            self._serve, path, limit=MAX_LINE
+        )
+
+    async def wait_idle(self):
+        """Waits until every connected bot has left."""
+        while self._connections:
+            await asyncio.wait(set(self._connections))
+
+    def report(self):
+        """Summary of the matches and the move latency."""
+        return (
+            f"matches {self.matches}, timeouts {self.timeouts}, "
+            f"invalid moves {self.invalid_moves}\n"
+            f"{self.latency.report()}"
+        )
+
+    async def _serve(self, reader, writer):
+        """Plays matches for one connection until it leaves."""
+        bot = _Bot(reader, writer)
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            hello = await self._wait(bot.receive(), self.idle_timeout)
+            if hello is None or hello.get("type") != "hello":
+                return
+            bot.name = str(hello.get("name", "bot"))
+            while bot.connected:
+                await self._pair(bot)
+                if not bot.connected:
+                    break
+                ready = await self._wait(bot.request(), self.idle_timeout)
+                if ready is None or ready.get("type") != "ready":
+                    break
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+            self._connections.discard(task)
+
+    async def _pair(self, bot):
+        """Waits for an opponent; the second bot of a pair hosts.
+
+        A waiting bot that leaves gives up its place as soon as it is
+        noticed, every ``WAITING_CHECK`` seconds, so its connection is
+        closed without waiting for an opponent.
+        """
+        if self._waiting is not None and not self._waiting[0].alive:
+            self._release()
+        if self._waiting is None:
+            done = asyncio.get_running_loop().create_future()
+            self._waiting = (bot, done)
+            while not done.done():
+                await asyncio.wait((done,), timeout=WAITING_CHECK)
+                # Once paired the bot is out of the slot until its match
+                # ends
+                waiting = self._waiting is not None and (
+                    self._waiting[0] is bot
+                )
+                if waiting and not bot.alive:
+                    self._release()
+            return
+        opponent, done = self._waiting
+        self._waiting = None
+        try:
+            async with self._slots:
+                await self._play_match(opponent, bot)
+        finally:
+            done.set_result(None)
+
+    def _release(self):
+        """Frees the waiting slot and its bot, unpaired."""
+        _, done = self._waiting
+        self._waiting = None
+        done.set_result(None)
+
+    async def _wait(self, awaitable, timeout):
+        """Result of ``awaitable``, or None after ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            # Not the builtin TimeoutError before Python 3.11
+            return None
+
+    async def _move(self, bot, player, table, message, first):
+        """The card a bot plays, or the fallback's card for it."""
+        reply = None
+        if bot.connected:
+            answer = await self._wait(bot.ask(message), self.move_timeout)
+            if answer is None:
+                self.timeouts += 1
+                # A late reply is discarded by its move number
+            else:
+                reply, latency = answer
+                if reply is not None:
+                    self.latency.add(latency)
+        hand = player.hand
+        if reply is not None:
+            kind = reply.get("kind")
+            for card in hand:
+                if card.kind == kind:
+                    return card
+            self.invalid_moves += 1
+        return self.fallback.choose(hand, table, first=first)
+
+    async def _play_match(self, bot1, bot2):
+        """Plays one match between two bots."""
+        match_id = self.matches
+        self.matches += 1
+        bots = (bot1, bot2)
+        players = (Player(bot1.name), Player(bot2.name))
+        deck = Deck(random.Random(game_seed(self.seed, match_id)))
+        for seat, bot in enumerate(bots):
+            await bot.send(
+                {
+                    "type": "start",
+                    "match": match_id,
+                    "seat": seat,
+                    "opponent": bots[1 - seat].name,
+                    "rounds": self.rounds,
+                }
+            )
+
+        move = 0
+        round_scores = []
+        for round_number in range(1, self.rounds + 1):
+            for player in players:
+                player.assign_cards(deck, HAND_SIZE)
+            table = RandomTable([], *players)
+            turn = 0
+            while players[0].hand:
+                kinds = [
+                    [card.kind for card in table.tables[seat]]
+                    for seat in range(2)
+                ]
+                cards = await asyncio.gather(
+                    *(
+                        self._move(
+                            bot,
+                            players[seat],
+                            table,
+                            {
+                                "type": "move",
+                                "move": move,
+                                "round": round_number,
+                                "turn": turn,
+                                "hand": [c.kind for c in players[seat].hand],
+                                "table": kinds[seat],
+                                "opponent_table": kinds[1 - seat],
+                            },
+                            turn == 0,
+                        )
+                        for seat, bot in enumerate(bots)
+                    )
+                )
+                for seat, card in enumerate(cards):
+                    players[seat].hand.remove(card)
+                    table.add_card(seat, card)
+                players[0].hand, players[1].hand = (
+                    players[1].hand,
+                    players[0].hand,
+                )
+                move += 1
+                turn += 1
+
+            scores = tuple(tally.score for tally in table.tallies)
+            round_scores.append(scores)
+            self.results.add_round(scores, table.tables)
+            for seat, bot in enumerate(bots):
+                await bot.send(
+                    {
+                        "type": "round",
+                        "round": round_number,
+                        "scores": [scores[seat], scores[1 - seat]],
+                    }
+                )
+
+        totals = [
+            sum(scores[seat] for scores in round_scores) for seat in (0, 1)
+        ]
+        self.results.add_totals(totals)
+        for seat, bot in enumerate(bots):
+            own, other = totals[seat], totals[1 - seat]
+            await bot.send(
+                {
+                    "type": "end",
+                    "match": match_id,
+                    "totals": [own, other],
+                    "result": RESULTS[(own > other) - (own < other) + 1],
+                }
+            )
+        return round_scores
+
+
+async def run_bot(
+    host=None,
+    port=None,
+    path=None,
+    name="stand-in",
+    matches=1,
+    strategy="default",
+    delay=0.0,
+):
+    """Stand-in bot that plays with a built-in strategy.
+
+    Args:
+        host: Host of a TCP server.
+        port: Port of a TCP server.
+        path: Unix socket of the server, instead of ``host`` and ``port``.
+        name: Name the bot says ``hello`` with.
+        matches: Matches to play before leaving.
+        strategy: Name of the registered strategy to play with.
+        delay: Seconds to wait before each reply, to act slow.
+
+    Returns:
+        The ``end`` message of every match played, fewer than
+        ``matches`` if the server closes the connection first.
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    strategy = get_strategy(strategy)
+    ends = []
+    try:
+        writer.write(encode({"type": "hello", "name": name}))
+        while len(ends) < matches:
+            line = await reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            if message["type"] == "move":
+                hand = [CARDS[kind] for kind in message["hand"]]
+                table = RandomTable([], "me", "opponent")
+                for kind in message["table"]:
+                    table.add_card(0, CARDS[kind])
+                for kind in message["opponent_table"]:
+                    table.add_card(1, CARDS[kind])
+                card = strategy.choose(hand, table, message["turn"] == 0)
+                if delay:
+                    await asyncio.sleep(delay)
+                writer.write(
+                    encode(
+                        {
+                            "type": "play",
+                            "move": message["move"],
+                            "kind": card.kind,
+                        }
+                    )
+                )
+            elif message["type"] == "end":
+                ends.append(message)
+                strategy.reset()
+                if len(ends) < matches:
+                    writer.write(encode({"type": "ready"}))
+            await writer.drain()
+    except ConnectionError:
+        pass  # the server went away; return the matches played
+    finally:
+        writer.close()
+        with contextlib.suppress(ConnectionError):
+            await writer.wait_closed()
+    return ends
+
+
+async def selfplay(bots, matches, path=None, **options):
+    """Serves matches between stand-in bots in this process.
+
+    Args:
+        bots: Stand-in bots to connect; an even number.
+        matches: Matches each bot plays.
+        path: Unix socket to serve on; a free TCP port by default.
+        options: Passed to ``BotServer``.
+
+    Returns:
+        The ``BotServer`` after every match.
+    """
+    server = BotServer(**options)
+    if path is not None:
+        listener = await server.start_unix(path)
+        address = {"path": path}
+    else:
+        listener = await server.start_tcp()
+        host, port = listener.sockets[0].getsockname()[:2]
+        address = {"host": host, "port": port}
+    async with listener:
+        await asyncio.gather(
+            *(
+                run_bot(name=f"bot-{i}", matches=matches, **address)
+                for i in range(bots)
+            )
+        )
+        await server.wait_idle()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve Sushi Go matches between bots."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="serve until interrupted")
+    bot = commands.add_parser("bot", help="run stand-in bots")
+    local = commands.add_parser("selfplay", help="serve stand-in bots")
+    for command in (serve, bot, local):
+        command.add_argument("--unix", default=None, help="socket path")
+    for command in (serve, bot):
+        command.add_argument("--host", default="127.0.0.1")
+        command.add_argument("--port", type=int, default=8765)
+    for command in (serve, local):
+        command.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+        command.add_argument("--seed", type=int, default=0)
+        command.add_argument(
+            "--move-timeout", type=float, default=DEFAULT_MOVE_TIMEOUT
+        )
+    for command in (bot, local):
+        command.add_argument("--bots", type=int, default=2)
+        command.add_argument("--matches", type=int, default=1)
+    bot.add_argument(
+        "--strategy", default="default", help="registered strategy name"
+    )
+    args = parser.parse_args()
+
+    async def main():
+        """Runs the command."""
+        if args.command == "selfplay":
+            server = await selfplay(
+                args.bots,
+                args.matches,
+                args.unix,
+                rounds=args.rounds,
+                seed=args.seed,
+                move_timeout=args.move_timeout,
+            )
+            print(server.results)
+            print(server.report())
+        elif args.command == "serve":
+            server = BotServer(
+                rounds=args.rounds,
+                seed=args.seed,
+                move_timeout=args.move_timeout,
+            )
+            if args.unix is not None:
+                listener = await server.start_unix(args.unix)
+            else:
+                listener = await server.start_tcp(args.host, args.port)
+            try:
+                async with listener:
+                    await listener.serve_forever()
+            finally:
+                print(server.report())
+        else:
+            ends = await asyncio.gather(
+                *(
+                    run_bot(
+                        args.host,
+                        args.port,
+                        args.unix,
+                        name=f"bot-{i}",
+                        matches=args.matches,
+                        strategy=args.strategy,
+                    )
+                    for i in range(args.bots)
+                )
+            )
+            for i, bot_ends in enumerate(ends):
+                results = [end["result"] for end in bot_ends]
+                print(f"bot-{i}: {', '.join(results)}")
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(main())
@@ -0,0 +1,249 @@
+"""Expected-value strategy that counts the cards still unseen.
+
+``CardCountingStrategy`` keeps the count vector of the cards it has not
+seen: ``DECK_COUNTS`` minus the cards of earlier rounds and the cards of
+this round it knows about. At the first turn of a round the opponent's
+hand is a uniform draw from the unseen cards, so the number of copies of
+a kind (or of a group of kinds, such as every nigiri of at least some
+value) in it is hypergeometric. ``tail_table`` precomputes those
+probabilities once per hand size, and a decision only indexes it.
+
+After the first swap of a two-player round every card of the round is
+known: the hand received is the opponent's first hand minus the card
+they played first. From then on the probabilities are 0 or 1.
+
+A card is valued as the points it adds to the player's own table now,
+plus ``lookahead`` times the expected points of the sets it can still
+complete this round from the cards the player may receive: under the
+game's rules a tempura pair, a sashimi triple, more dumplings and a
+nigiri on wasabi. The points come from the ``rules.Rules`` of the table
+played on, so the strategy follows a variant with no change.
+"""
+
+from functools import cache
+from math import comb
+
+from cards import DECK_COUNTS, NUM_KINDS
+from rules import NIGIRI, WASABI
+from strategies import MAX_SCORING, Strategy, seat_of
+
+DECK_SIZE = sum(DECK_COUNTS)
+
+
+@cache
+def tail_table(draws):
+    """Hypergeometric tail probabilities for ``draws`` cards.
+
+    ``tail_table(n)[population][successes][j]`` is the probability that
+    ``n`` cards drawn without replacement from ``population`` cards, of
+    which ``successes`` are marked, hold at least ``j`` marked cards. It
+    is computed once per ``n`` for every population up to ``DECK_SIZE``.
+    """
+    table = []
+    for population in range(DECK_SIZE + 1):
+        ways = comb(population, draws)
+        rows = []
+        for successes in range(population + 1):
+            if ways == 0:
+                # Fewer cards than draws; never asked for in a game
+                rows.append((1.0,) + (0.0,) * draws)
+                continue
+            tails = [0.0] * (draws + 1)
+            at_least = 0
+            for marked in range(draws, -1, -1):
+                at_least += comb(successes, marked) * comb(
+                    population - successes, draws - marked
+                )
+                tails[marked] = at_least / ways
+            rows.append(tuple(tails))
+        table.append(tuple(rows))
+    return tuple(table)
+
+
+@cache
+def _nigiri_at_least(rules):
+    """Each nigiri value of ``rules`` with the nigiri worth at least it."""
+    top = max((rules.faces[kind] for kind in rules.nigiri_kinds), default=0)
+    return tuple(
+        (
+            value,
+            tuple(
+                kind
+                for kind in rules.nigiri_kinds
+                if rules.faces[kind] >= value
+            ),
+        )
+        for value in range(top, 0, -1)
+    )
+
+
+class CardCountingStrategy(Strategy):
+    """Plays the card with the best expected value for its own table.
+
+    The strategy remembers the cards of earlier rounds, so each player
+    needs an instance of its own; ``get_strategy("card_counting")``
+    builds a new one. ``reset`` forgets a finished game; ``Game`` calls
+    it before playing.
+
+    Attributes:
+        lookahead: Weight of the expected points of sets the card can
+            still complete this round; 0 plays for the points now only.
+    """
+
+    name = "card_counting"
+
+    def __init__(self, lookahead=0.75):
+        """Initializes the strategy with nothing seen."""
+        self.lookahead = lookahead
+        self.reset()
+
+    def reset(self):
+        """Forgets every card seen."""
+        self._seen = [0] * NUM_KINDS  # cards of earlier rounds
+        self._round = [0] * NUM_KINDS  # known cards of this round
+        self._first_hand = None
+        self._complete = False
+
+    def _start_round(self, hand_counts, tallies):
+        """Folds the last round into the seen cards; starts a new one."""
+        seen = self._seen
+        for kind, count in enumerate(self._round):
+            seen[kind] += count
+        known = hand_counts[:]
+        for tally in tallies:
+            for kind, count in enumerate(tally.counts):
+                known[kind] += count
+        self._round = known
+        self._first_hand = hand_counts
+        self._complete = False
+
+    def _learn_round(self, hand_counts, table, seat):
+        """Works out every card of a two-player round after a swap."""
+        tables = table.tables
+        opponent_table = tables[1 - seat]
+        if self._first_hand is None or len(tables) != 2 or not opponent_table:
+            return
+        # The hand held now is the opponent's first hand minus the card
+        # they played first
+        total = [
+            first + held
+            for first, held in zip(self._first_hand, hand_counts, strict=True)
+        ]
+        total[opponent_table[0].kind] += 1
+        self._round = total
+        self._complete = True
+
+    def choose(self, hand, table, first=False, cache=None):
+        """Chooses the card with the best expected value."""
+        if not hand:
+            return None
+        if table is None:
+            return MAX_SCORING.choose(hand, table, first)
+        seat = seat_of(hand, table)
+        tallies = table.tallies
+        own = tallies[seat]
+        hand_counts = [0] * NUM_KINDS
+        for card in hand:
+            hand_counts[card.kind] += 1
+        if first:
+            self._start_round(hand_counts, tallies)
+        elif not self._complete:
+            self._learn_round(hand_counts, table, seat)
+
+        # What the opponent holds: known exactly, or drawn from the pool
+        opponent_known = [0] * NUM_KINDS
+        unknown = len(hand)
+        if len(tallies) == 2:
+            opponent = tallies[1 - seat]
+            unknown -= opponent.size - own.size
+            if self._complete:
+                for kind in range(NUM_KINDS):
+                    opponent_known[kind] = (
+                        self._round[kind]
+                        - own.counts[kind]
+                        - opponent.counts[kind]
+                        - hand_counts[kind]
+                    )
+                unknown = 0
+        pool = [
+            deck - seen - known
+            for deck, seen, known in zip(
+                DECK_COUNTS, self._seen, self._round, strict=True
+            )
+        ]
+        if min(pool) < 0:
+            # More cards than a deck: a new game without a reset
+            self._seen = [0] * NUM_KINDS
+            pool = [
+                deck - known
+                for deck, known in zip(DECK_COUNTS, self._round, strict=True)
+            ]
+        population = sum(pool)
+        unknown = max(0, min(unknown, population))
+        tails = tail_table(unknown)[population]
+        picks = len(hand) - 1
+
+        def at_least(kinds, count, played):
+            """Probability of receiving ``count`` cards of ``kinds``."""
+            known = 0
+            marked = 0
+            for kind in kinds:
+                known += opponent_known[kind]
+                marked += pool[kind]
+                if picks >= 2:
+                    # The rest of this hand comes back after two swaps
+                    known += hand_counts[kind] - (kind == played)
+            if count <= known:
+                return 1.0
+            if count - known > unknown:
+                return 0.0
+            return tails[marked][count - known]
+
+        gain = own.gain
+        lookahead = self.lookahead
+        best_card = None
+        best_value = None
+        valued = {}
+        for card in hand:
+            kind = card.kind
+            value = valued.get(kind)
+            if value is None:
+                value = gain(kind)
+                if picks and lookahead:
+                    value += lookahead * self._future(
+                        own, kind, picks, at_least
+                    )
+                valued[kind] = value
+            if best_value is None or value > best_value:
+                best_card = card
+                best_value = value
+        return best_card
+
+    @staticmethod
+    def _future(own, played, picks, at_least):
+        """Expected points of sets still completed after ``played``."""
+        rules = own.rules
+        counts = own.counts
+        future = 0.0
+        for kind in rules.counted:
+            count = counts[kind] + (kind == played)
+            gains = rules.gains[kind]
+            for more in range(picks):
+                gain = gains[count + more]
+                if gain:
+                    future += gain * at_least((kind,), more + 1, played)
+        extra = rules.wasabi_extra
+        if not extra:
+            return future
+        top = own.top_nigiri
+        role = rules.roles[played]
+        if role == NIGIRI:
+            top = max(top, rules.faces[played])
+        if own.has_wasabi or role == WASABI:
+            # Each nigiri value above the current top adds ``extra``
+            for value, kinds in _nigiri_at_least(rules):
+                if value > top:
+                    future += extra * at_least(kinds, 1, played)
+        elif top:
+            future += extra * top * at_least(rules.wasabi_kinds, 1, played)
+        return future
@@ -0,0 +1,228 @@
+"""Card images from ``Images/``, decoded once and packed into an atlas.
+
+PIL is imported the first time an image is needed, so importing this
+module (or the engine) costs nothing when nothing is drawn.
+
+``ImageCache`` decodes each file once and keeps the decoded images in a
+bounded LRU dictionary. ``SpriteAtlas`` resizes the ten card faces to
+one size, packs them into a single strip in ``CardKind`` order and keeps
+a crop of each, so drawing a hand or a table is a few ``paste`` calls of
+ready-made sprites instead of a decode and a resize per card.
+"""
+
+import os
+from collections import OrderedDict
+from functools import cache
+
+from cards import KIND_BY_NAME, KIND_NAMES
+
+IMAGES_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "Images")
+)
+CARD_IMAGE_MAP = {
+    "Maki 1": "sushi_go_1_mr.jpeg",
+    "Maki 2": "sushi_go_2_mr.jpeg",
+    "Maki 3": "sushi_go_3_mr.jpeg",
+    "Dumpling": "sushi_go_dumpling.jpeg",
+    "Egg Nigiri": "sushi_go_egg_n.png",
+    "Salmon Nigiri": "sushi_go_salmon_n.jpeg",
+    "Sashimi": "sushi_go_sashimi.jpeg",
+    "Squid Nigiri": "sushi_go_squid_n.png",
+    "Tempura": "sushi_go_tempura.jpeg",
+    "Wasabi": "sushi_go_wasabi.jpeg",
+}
+CARD_SIZE = (64, 96)
+GAP = 4
+BACKGROUND = (255, 255, 255)
+
+
+@cache
+def _pil():
+    """The ``PIL.Image`` module, imported on first use.
+
+    Raises:
+        ImportError: If Pillow is not installed.
+    """
+    try:
+        from PIL import Image
+    except ImportError as error:
+        raise ImportError("Drawing cards needs Pillow installed.") from error
+    return Image
+
+
+def image_path(card_name, images_dir=IMAGES_DIR):
+    """Path of the image of a card.
+
+    Raises:
+        KeyError: If the card has no image.
+    """
+    return os.path.join(images_dir, CARD_IMAGE_MAP[card_name])
+
+
+class ImageCache:
+    """Bounded LRU cache of decoded images.
+
+    Attributes:
+        maxsize: Most images kept, or None for no bound.
+        hits: Loads answered from the cache.
+        misses: Loads that decoded a file.
+    """
+
+    def __init__(self, maxsize=32):
+        """Initializes an empty cache."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()
+
+    def __len__(self):
+        """Number of cached images."""
+        return len(self._images)
+
+    def load(self, path):
+        """Decoded RGB image of a file; treat it as read-only."""
+        image = self._images.get(path)
+        if image is not None:
+            self.hits += 1
+            self._images.move_to_end(path)
+            return image
+        self.misses += 1
+        Image = _pil()
+        with Image.open(path) as source:
+            source = source.convert("RGBA")
+            # Transparent PNG corners become the background colour
+            image = Image.new("RGB", source.size, BACKGROUND)
+            image.paste(source, mask=source.getchannel("A"))
+        self._images[path] = image
+        if self.maxsize is not None and len(self._images) > self.maxsize:
+            self._images.popitem(last=False)
+        return image
+
+
+# Shared by every atlas and show_card_image in this process
+IMAGE_CACHE = ImageCache()
+
+
+class SpriteAtlas:
+    """The ten card faces resized to one size and packed in one image.
+
+    Attributes:
+        card_size: Width and height of every sprite.
+        image: The atlas, one sprite per kind from left to right.
+        sprites: Crop of each kind's sprite, indexed by ``CardKind``.
+        background: Colour of empty canvas space, in the atlas's mode.
+    """
+
+    background = BACKGROUND
+
+    def __init__(
+        self, card_size=CARD_SIZE, images_dir=IMAGES_DIR, image_cache=None
+    ):
+        """Decodes, resizes and packs the card images."""
+        Image = _pil()
+        image_cache = IMAGE_CACHE if image_cache is None else image_cache
+        width, height = card_size
+        self.card_size = card_size
+        self.image = Image.new("RGB", (width * len(KIND_NAMES), height))
+        for kind, name in enumerate(KIND_NAMES):
+            face = image_cache.load(image_path(name, images_dir))
+            self.image.paste(
+                face.resize(card_size, Image.Resampling.LANCZOS),
+                (kind * width, 0),
+            )
+        self.sprites = tuple(
+            self.image.crop(self.box(kind)) for kind in range(len(KIND_NAMES))
+        )
+
+    def to_palette(self, colors=256):
+        """Copy of the atlas quantized once to a palette of ``colors``.
+
+        Canvases of the copy are palette images too, so GIF frames and
+        PNGs drawn from it are written without quantizing each image.
+        """
+        Image = _pil()
+        width, height = self.card_size
+        # A strip of background is quantized along so it gets an entry
+        source = Image.new("RGB", (self.image.width + 1, height), BACKGROUND)
+        source.paste(self.image, (0, 0))
+        quantized = source.quantize(colors)
+        atlas = object.__new__(SpriteAtlas)
+        atlas.card_size = self.card_size
+        atlas.image = quantized.crop((0, 0, self.image.width, height))
+        atlas.sprites = tuple(
+            atlas.image.crop(atlas.box(kind))
+            for kind in range(len(KIND_NAMES))
+        )
+        atlas.background = quantized.getpixel((self.image.width, 0))
+        return atlas
+
+    def box(self, kind):
+        """Box of a kind's sprite in ``image``."""
+        width, height = self.card_size
+        return (kind * width, 0, (kind + 1) * width, height)
+
+    def canvas(self, columns, rows=1, gap=GAP):
+        """Blank image with room for ``columns`` by ``rows`` cards."""
+        width, height = self.card_size
+        canvas = _pil().new(
+            self.image.mode,
+            (
+                max(columns, 1) * (width + gap) + gap,
+                max(rows, 1) * (height + gap) + gap,
+            ),
+            self.background,
+        )
+        if self.image.mode == "P":
+            canvas.putpalette(self.image.getpalette())
+        return canvas
+
+    def paste(self, canvas, kind, column, row=0, gap=GAP):
+        """Draws the sprite of a kind at a column and row of a canvas."""
+        width, height = self.card_size
+        canvas.paste(
+            self.sprites[kind],
+            (gap + column * (width + gap), gap + row * (height + gap)),
+        )
+
+    def render_cards(self, cards, gap=GAP):
+        """One row of cards, given as cards or kinds."""
+        kinds = [_kind(card) for card in cards]
+        canvas = self.canvas(len(kinds), gap=gap)
+        for column, kind in enumerate(kinds):
+            self.paste(canvas, kind, column, gap=gap)
+        return canvas
+
+    def render_tables(self, tables, gap=GAP):
+        """One row per table, for example ``RandomTable.tables``."""
+        rows = [[_kind(card) for card in table] for table in tables]
+        canvas = self.canvas(max(map(len, rows), default=0), len(rows), gap)
+        for row, kinds in enumerate(rows):
+            for column, kind in enumerate(kinds):
+                self.paste(canvas, kind, column, row, gap)
+        return canvas
+
+
+def _kind(card):
+    """Kind of a card, a kind or a card name."""
+    if isinstance(card, str):
+        return KIND_BY_NAME[card]
+    kind = getattr(card, "kind", card)
+    if kind is None:
+        raise ValueError(f"Card has no image: {card}")
+    return kind
+
+
+@cache
+def get_atlas(card_size=CARD_SIZE, palette=False):
+    """The atlas of a card size, built once per process.
+
+    With ``palette``, the atlas is ``SpriteAtlas.to_palette``'s copy.
+    """
+    if palette:
+        return get_atlas(card_size).to_palette()
+    return SpriteAtlas(card_size)
+
+
+def show_card_image(card_name):
+    """Opens the image of a card in the system viewer."""
+    IMAGE_CACHE.load(image_path(card_name)).show()
@@ -0,0 +1,135 @@
+"""Compact integer card model for the Sushi Go simulation.
+
+Every card kind is a small integer, so the hot loops of the simulation
+index precomputed lookup tables instead of comparing card names. The
+scoring rule of each kind is declared here too, and compiled by
+``rules.Rules`` into the tables every scorer and strategy reads.
+"""
+
+from enum import IntEnum
+from functools import lru_cache
+
+from rules import Curve, Maki, Nigiri, Rules, Sets, Wasabi
+
+
+class CardKind(IntEnum):
+    """Integer codes of the ten Sushi Go card kinds."""
+
+    MAKI_1 = 0
+    MAKI_2 = 1
+    MAKI_3 = 2
+    TEMPURA = 3
+    SASHIMI = 4
+    DUMPLING = 5
+    NIGIRI_SQUID = 6
+    NIGIRI_SALMON = 7
+    NIGIRI_EGG = 8
+    WASABI = 9
+
+
+class Category(IntEnum):
+    """Scoring families the card kinds belong to."""
+
+    MAKI = 0
+    NIGIRI = 1
+    WASABI = 2
+    TEMPURA = 3
+    SASHIMI = 4
+    DUMPLING = 5
+
+
+NUM_KINDS = len(CardKind)
+
+# Lookup tables, indexed by CardKind
+KIND_NAMES = (
+    "Maki 1",
+    "Maki 2",
+    "Maki 3",
+    "Tempura",
+    "Sashimi",
+    "Dumpling",
+    "Squid Nigiri",
+    "Salmon Nigiri",
+    "Egg Nigiri",
+    "Wasabi",
+)
+CATEGORIES = (
+    Category.MAKI,
+    Category.MAKI,
+    Category.MAKI,
+    Category.TEMPURA,
+    Category.SASHIMI,
+    Category.DUMPLING,
+    Category.NIGIRI,
+    Category.NIGIRI,
+    Category.NIGIRI,
+    Category.WASABI,
+)
+DECK_COUNTS = (6, 12, 8, 14, 14, 14, 10, 5, 5, 6)
+
+KIND_BY_NAME = {name: CardKind(i) for i, name in enumerate(KIND_NAMES)}
+NIGIRI_KINDS = (
+    CardKind.NIGIRI_SQUID,
+    CardKind.NIGIRI_SALMON,
+    CardKind.NIGIRI_EGG,
+)
+
+# Packed count integers hold KIND_BITS bits per kind, so up to 15 cards
+# of a kind; adding a card of a kind is adding KIND_UNITS[kind]
+KIND_BITS = 4
+KIND_MASK = (1 << KIND_BITS) - 1
+KIND_SHIFTS = tuple(KIND_BITS * kind for kind in range(len(KIND_NAMES)))
+KIND_UNITS = tuple(1 << shift for shift in KIND_SHIFTS)
+KINDS_CACHE_SIZE = 1 << 16  # packed integers whose kinds are kept
+
+# Dumpling points, indexed by the number of dumplings (capped at 5)
+DUMPLING_SCORES = (0, 1, 3, 6, 10, 15)
+
+# How each kind scores, declared once; see ``rules``
+KIND_RULES = (
+    Maki(1),
+    Maki(2),
+    Maki(3),
+    Sets(2, 5),
+    Sets(3, 10),
+    Curve(DUMPLING_SCORES),
+    Nigiri(3),
+    Nigiri(2),
+    Nigiri(1),
+    Wasabi(3),
+)
+DEFAULT_RULES = Rules(KIND_RULES, max_count=sum(DECK_COUNTS))
+# The official maki rule: 6 points for the most icons, 3 for the second
+MAKI_MAJORITY_RULES = DEFAULT_RULES.variant(maki_majority=(6, 3))
+BASE_SCORES = DEFAULT_RULES.faces
+
+score_counts = DEFAULT_RULES.score
+kind_points = DEFAULT_RULES.kind_points
+
+
+def dumpling_points(count):
+    """Points for a number of dumplings on a table."""
+    return KIND_RULES[CardKind.DUMPLING].points(count)
+
+
+def pack(kinds):
+    """Packs card kinds into a count integer."""
+    packed = 0
+    for kind in kinds:
+        packed += KIND_UNITS[kind]
+    return packed
+
+
+def unpack(packed):
+    """Count vector of a packed count integer."""
+    return [packed >> shift & KIND_MASK for shift in KIND_SHIFTS]
+
+
+@lru_cache(maxsize=KINDS_CACHE_SIZE)
+def kinds_in(packed):
+    """Distinct kinds present in a packed count integer."""
+    return tuple(
+        kind
+        for kind, shift in enumerate(KIND_SHIFTS)
+        if packed >> shift & KIND_MASK
+    )
@@ -0,0 +1,190 @@
+"""Memoized decisions of the maximizer strategy.
+
+``SushiGoMaximizer`` only looks at which kinds are in the hand and at a
+few features of the shared table, so its choice repeats across millions
+of turns. ``DecisionCache`` stores the best kinds for each canonical
+(hand multiset, table state) key in a bounded LRU dictionary.
+
+The table state in the key is the few features the default rules
+depend on, so only tallies of ``cards.DEFAULT_RULES`` are cached; a
+decision against a variant's tally is computed every time, which keeps
+a cache shared between games of different rules correct.
+"""
+
+from collections import OrderedDict
+from itertools import combinations_with_replacement
+
+from cards import DECK_COUNTS, DEFAULT_RULES, NUM_KINDS, CardKind
+from sushi_go_game import CARDS, TableTally
+
+_KIND_BITS = 4  # bits per kind in a hand key, so up to 15 of a kind
+_TABLE_BITS = 6
+# One card of each kind in a state key, above the table bits
+_KIND_UNITS = tuple(
+    1 << (_KIND_BITS * kind + _TABLE_BITS) for kind in range(NUM_KINDS)
+)
+_NIGIRI_BY_VALUE = {
+    1: CardKind.NIGIRI_EGG,
+    2: CardKind.NIGIRI_SALMON,
+    3: CardKind.NIGIRI_SQUID,
+}
+
+
+def hand_key(hand):
+    """Canonical key of the multiset of cards in a hand."""
+    key = 0
+    for card in hand:
+        key += _KIND_UNITS[card.kind]
+    return key >> _TABLE_BITS
+
+
+def table_key(tally):
+    """Canonical key of the table features the maximizer reads."""
+    dumplings = min(tally.counts[CardKind.DUMPLING], 5)
+    return tally.top_nigiri | tally.has_wasabi << 2 | dumplings << 3
+
+
+class DecisionCache:
+    """Bounded LRU cache of maximizer decisions.
+
+    Each entry maps a state key to a bit mask of the kinds in the hand
+    with the best maximizer score; the first card in hand order with one
+    of those kinds is played, just like ``SushiGoMaximizer``.
+
+    Attributes:
+        maxsize: Most entries kept, or None for no bound.
+        hits: Lookups answered from the cache.
+        misses: Lookups that had to be computed.
+        evictions: Entries dropped to stay within ``maxsize``.
+    """
+
+    def __init__(self, maxsize=100_000):
+        """Initializes an empty cache."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        """Number of cached decisions."""
+        return len(self._entries)
+
+    def info(self):
+        """Counters of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self):
+        """Drops every entry and resets the counters."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def select_best_card(self, hand, tally):
+        """Selects the maximizer's card from ``hand``.
+
+        Args:
+            hand: Cards in the player's hand.
+            tally: ``TableTally`` of the shared cards on the table.
+        """
+        if not hand:
+            return None
+        if tally.rules is not DEFAULT_RULES:
+            # The key does not describe a variant's table
+            best_kinds = _best_kinds(hand, tally)
+        else:
+            best_kinds = self._lookup(hand, tally)
+        for card in hand:
+            if best_kinds >> card.kind & 1:
+                return card
+        return None
+
+    def _lookup(self, hand, tally):
+        """Best kinds of a hand against a tally, cached."""
+        key = table_key(tally)
+        for card in hand:
+            key += _KIND_UNITS[card.kind]
+        entries = self._entries
+        best_kinds = entries.get(key)
+        if best_kinds is None:
+            self.misses += 1
+            return self._store(key, _best_kinds(hand, tally))
+        self.hits += 1
+        if self.maxsize is not None:
+            entries.move_to_end(key)
+        return best_kinds
+
+    def _store(self, key, best_kinds):
+        entries = self._entries
+        entries[key] = best_kinds
+        if self.maxsize is not None and len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return best_kinds
+
+    def prewarm(self, hand_size):
+        """Fills the cache with every reachable state.
+
+        Enumerates every hand of 1 to ``hand_size`` cards the deck can
+        deal, against every table state the maximizer tells apart.
+
+        Returns:
+            The number of entries added.
+
+        Raises:
+            ValueError: If the states do not fit within ``maxsize``.
+        """
+        tables = []
+        for top_nigiri in range(4):
+            for has_wasabi in (False, True):
+                for dumplings in range(6):
+                    tally = TableTally()
+                    if top_nigiri:
+                        tally.add(_NIGIRI_BY_VALUE[top_nigiri])
+                    if has_wasabi:
+                        tally.add(CardKind.WASABI)
+                    for _ in range(dumplings):
+                        tally.add(CardKind.DUMPLING)
+                    tables.append(tally)
+
+        hands = [
+            [CARDS[kind] for kind in kinds]
+            for size in range(1, hand_size + 1)
+            for kinds in combinations_with_replacement(range(NUM_KINDS), size)
+            if all(kinds.count(k) <= DECK_COUNTS[k] for k in set(kinds))
+        ]
+        if self.maxsize is not None and (
+            len(self._entries) + len(hands) * len(tables) > self.maxsize
+        ):
+            raise ValueError(
+                f"{len(hands) * len(tables)} states do not fit in a cache "
+                f"of {self.maxsize} entries."
+            )
+
+        before = len(self._entries)
+        for hand in hands:
+            key = hand_key(hand) << _TABLE_BITS
+            for tally in tables:
+                self._entries[key | table_key(tally)] = _best_kinds(
+                    hand, tally
+                )
+        return len(self._entries) - before
+
+
+def _best_kinds(hand, tally):
+    """Bit mask of the kinds in ``hand`` with the best maximizer score."""
+    best_score = None
+    best_kinds = 0
+    for card in hand:
+        score = tally.best_score(card.kind)
+        if best_score is None or score > best_score:
+            best_score = score
+            best_kinds = 1 << card.kind
+        elif score == best_score:
+            best_kinds |= 1 << card.kind
+    return best_kinds
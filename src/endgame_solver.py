@@ -0,0 +1,369 @@
+"""Exact solver for the perfect-information endgame of a two-player round.
+
+Once the hands have been switched for the first time, each of the two
+players knows both hands, so the rest of the round is a finite game of
+perfect information. ``EndgameSolver`` searches it exhaustively with
+alpha-beta pruning and memoizes every position it proves in a solved-
+position store that can be saved and reused across games.
+
+A table only matters to the future through a few features (top nigiri,
+wasabi, tempura and sashimi counts modulo their sets, and dumplings up
+to five), so positions are keyed by the packed hands and those features.
+Those features are the game's own scoring, ``cards.DEFAULT_RULES``; the
+solver cannot follow a variant, and ``solve_game`` and ``EndgamePlayer``
+reject a table with other rules.
+"""
+
+import pickle
+
+from cards import (
+    DEFAULT_RULES,
+    KIND_UNITS,
+    NIGIRI_KINDS,
+    NUM_KINDS,
+    CardKind,
+    kinds_in,
+    pack,
+    score_counts,
+    unpack,
+)
+from sushi_go_game import Player
+
+STORE_VERSION = 1
+
+# Seats that move in a position; seat 1 always moves first in a turn
+SEAT1 = 0
+SEAT2 = 1
+
+_HAND_BITS = 4 * NUM_KINDS
+_FEATURE_BITS = 9
+_INFINITY = 1 << 20
+
+
+def _feature(counts):
+    """Canonical feature of a table given as a count vector."""
+    top_nigiri = next(
+        (3 - i for i, kind in enumerate(NIGIRI_KINDS) if counts[kind]), 0
+    )
+    return (
+        top_nigiri
+        | (counts[CardKind.WASABI] > 0) << 2
+        | (counts[CardKind.TEMPURA] % 2) << 3
+        | (counts[CardKind.SASHIMI] % 3) << 4
+        | min(counts[CardKind.DUMPLING], 5) << 6
+    )
+
+
+def _representative(feature):
+    """Smallest count vector with a canonical feature."""
+    counts = [0] * NUM_KINDS
+    top_nigiri = feature & 3
+    if top_nigiri:
+        counts[NIGIRI_KINDS[3 - top_nigiri]] = 1
+    counts[CardKind.WASABI] = feature >> 2 & 1
+    counts[CardKind.TEMPURA] = feature >> 3 & 1
+    counts[CardKind.SASHIMI] = feature >> 4 & 3
+    counts[CardKind.DUMPLING] = feature >> 6 & 7
+    return counts
+
+
+def _build_transitions():
+    """Maps ``feature * NUM_KINDS + kind`` to ``(gain, next feature)``."""
+    transitions = [None] * ((1 << _FEATURE_BITS) * NUM_KINDS)
+    for feature in range(1 << _FEATURE_BITS):
+        counts = _representative(feature)
+        if _feature(counts) != feature:
+            continue  # not a reachable feature
+        before = score_counts(counts)
+        for kind in range(NUM_KINDS):
+            counts[kind] += 1
+            transitions[feature * NUM_KINDS + kind] = (
+                score_counts(counts) - before,
+                _feature(counts),
+            )
+            counts[kind] -= 1
+    return tuple(transitions)
+
+
+_TRANSITIONS = _build_transitions()
+
+
+def _check_rules(table):
+    """Raises ValueError if ``table`` is not scored by the game's rules."""
+    if table.rules is not DEFAULT_RULES:
+        raise ValueError("The endgame solver only solves the default rules.")
+
+
+def _kinds(cards):
+    """Kinds of a sequence of cards or card kinds."""
+    return [getattr(card, "kind", card) for card in cards]
+
+
+class EndgameSolver:
+    """Exact minimax solver for the rest of a two-player round.
+
+    Values are score differences, seat 1 minus seat 2. Seat 1 moves
+    first in every turn and the hands are switched once both seats have
+    played, as in ``Game``.
+
+    Attributes:
+        store: Solved positions; maps a position key to
+            ``(lower bound, upper bound, best kind)`` of its value.
+        nodes: Positions searched, counting store hits.
+    """
+
+    def __init__(self, store=None):
+        """Initializes the solver, optionally with a solved store."""
+        self.store = {} if store is None else store
+        self.nodes = 0
+
+    def __len__(self):
+        """Number of positions in the store."""
+        return len(self.store)
+
+    def save(self, path):
+        """Writes the solved-position store to ``path``."""
+        with open(path, "wb") as file:
+            pickle.dump(
+                {"version": STORE_VERSION, "positions": self.store},
+                file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+
+    @classmethod
+    def load(cls, path):
+        """Creates a solver from a store written by ``save``.
+
+        Raises:
+            ValueError: If the file holds a store of another version.
+        """
+        with open(path, "rb") as file:
+            data = pickle.load(file)
+        if data.get("version") != STORE_VERSION:
+            raise ValueError(
+                f"Solved-position store version {data.get('version')} "
+                f"is not supported."
+            )
+        return cls(data["positions"])
+
+    def solve(self, hand1, hand2, table1=(), table2=(), to_move=SEAT1):
+        """Solves a position exactly.
+
+        Args:
+            hand1: Cards or kinds in seat 1's hand.
+            hand2: Cards or kinds in seat 2's hand.
+            table1: Cards or kinds on seat 1's table.
+            table2: Cards or kinds on seat 2's table.
+            to_move: ``SEAT1`` at the start of a turn, ``SEAT2`` once
+                seat 1 has played its card of the turn.
+
+        Returns:
+            ``(value, kind)``: the final round score of seat 1 minus that
+            of seat 2 under optimal play, and the optimal kind for the
+            seat to move (None when the round is over).
+        """
+        counts1 = unpack(pack(_kinds(table1)))
+        counts2 = unpack(pack(_kinds(table2)))
+        h1 = pack(_kinds(hand1))
+        h2 = pack(_kinds(hand2))
+        f1 = _feature(counts1)
+        f2 = _feature(counts2)
+        value = self._search(h1, h2, f1, f2, to_move, -_INFINITY, _INFINITY)
+        entry = self.store.get(_key(h1, h2, f1, f2, to_move))
+        best = entry[2] if entry is not None else None
+        return score_counts(counts1) - score_counts(counts2) + value, best
+
+    def move_values(self, hand1, hand2, table1=(), table2=(), to_move=SEAT1):
+        """Exact value of every kind the seat to move can play.
+
+        Useful to grade another strategy's move by its regret, the gap
+        to the best value for the seat that moved.
+
+        Returns:
+            A dict mapping each kind in the mover's hand to the final
+            score difference, seat 1 minus seat 2, after playing it.
+        """
+        table1 = _kinds(table1)
+        table2 = _kinds(table2)
+        hand1 = _kinds(hand1)
+        hand2 = _kinds(hand2)
+        values = {}
+        if to_move == SEAT1:
+            for kind in kinds_in(pack(hand1)):
+                rest = list(hand1)
+                rest.remove(kind)
+                values[kind] = self.solve(
+                    rest, hand2, [*table1, kind], table2, SEAT2
+                )[0]
+        else:
+            for kind in kinds_in(pack(hand2)):
+                rest = list(hand2)
+                rest.remove(kind)
+                # Both seats have played, so the hands are switched
+                values[kind] = self.solve(
+                    rest, hand1, table1, [*table2, kind], SEAT1
+                )[0]
+        return values
+
+    def solve_game(self, game):
+        """Solves the current position of a two-player ``Game``.
+
+        The player whose table is shorter is the one to move.
+
+        Raises:
+            ValueError: If the game is played with other rules.
+        """
+        table = game.table
+        _check_rules(table)
+        to_move = (
+            SEAT2
+            if len(table.player1_table) > len(table.player2_table)
+            else SEAT1
+        )
+        return self.solve(
+            game.player1.hand,
+            game.player2.hand,
+            table.player1_table,
+            table.player2_table,
+            to_move,
+        )
+
+    def _search(self, h1, h2, f1, f2, to_move, alpha, beta):
+        """Future score difference of a position, within a window."""
+        if not (h1 if to_move == SEAT1 else h2):
+            return 0
+        self.nodes += 1
+        key = _key(h1, h2, f1, f2, to_move)
+        store = self.store
+        entry = store.get(key)
+        best_kind = None
+        if entry is not None:
+            lower, upper, best_kind = entry
+            if lower >= beta:
+                return lower
+            if upper <= alpha:
+                return upper
+            if lower == upper:
+                return lower
+            alpha = max(alpha, lower)
+            beta = min(beta, upper)
+        else:
+            lower, upper = -_INFINITY, _INFINITY
+        alpha_in, beta_in = alpha, beta
+
+        transitions = _TRANSITIONS
+        if to_move == SEAT1:
+            moves = sorted(
+                kinds_in(h1),
+                key=lambda kind: (
+                    kind != best_kind,
+                    -transitions[f1 * NUM_KINDS + kind][0],
+                ),
+            )
+            value = -_INFINITY
+            for kind in moves:
+                gain, feature = transitions[f1 * NUM_KINDS + kind]
+                child = gain + self._search(
+                    h1 - KIND_UNITS[kind],
+                    h2,
+                    feature,
+                    f2,
+                    SEAT2,
+                    alpha - gain,
+                    beta - gain,
+                )
+                if child > value:
+                    value = child
+                    best_kind = kind
+                    if value > alpha:
+                        alpha = value
+                        if alpha >= beta:
+                            break
+        else:
+            moves = sorted(
+                kinds_in(h2),
+                key=lambda kind: (
+                    kind != best_kind,
+                    -transitions[f2 * NUM_KINDS + kind][0],
+                ),
+            )
+            value = _INFINITY
+            for kind in moves:
+                gain, feature = transitions[f2 * NUM_KINDS + kind]
+                # Both seats have played, so the hands are switched
+                child = -gain + self._search(
+                    h2 - KIND_UNITS[kind],
+                    h1,
+                    f1,
+                    feature,
+                    SEAT1,
+                    alpha + gain,
+                    beta + gain,
+                )
+                if child < value:
+                    value = child
+                    best_kind = kind
+                    if value < beta:
+                        beta = value
+                        if alpha >= beta:
+                            break
+
+        if value <= alpha_in:
+            upper = value
+        elif value >= beta_in:
+            lower = value
+        else:
+            lower = upper = value
+        if entry is not None and (
+            value <= alpha_in if to_move == SEAT1 else value >= beta_in
+        ):
+            # Every move failed, so the search says nothing about which
+            # one is best; keep the kind found before
+            best_kind = entry[2]
+        store[key] = (lower, upper, best_kind)
+        return value
+
+
+def _key(h1, h2, f1, f2, to_move):
+    """Position key in the solved-position store."""
+    return (
+        (((to_move << _FEATURE_BITS | f2) << _FEATURE_BITS | f1) << _HAND_BITS)
+        | h2
+    ) << _HAND_BITS | h1
+
+
+class EndgamePlayer(Player):
+    """Player that plays perfectly once both hands are known.
+
+    The first card of a round is chosen like ``Player`` does; every
+    later card comes from ``EndgameSolver``.
+    """
+
+    def __init__(self, name, solver=None):
+        """Initializes the player, optionally sharing a solver."""
+        super().__init__(name)
+        self.solver = EndgameSolver() if solver is None else solver
+
+    def play_best_card(self, table, cache=None):
+        """Plays the optimal card; ``cache`` is not used.
+
+        Raises:
+            ValueError: If the table is scored by other rules.
+        """
+        _check_rules(table)
+        if not self.hand:
+            print(f"{self.name} has no cards to play.")
+            return None
+        to_move = SEAT1 if table.player1 is self else SEAT2
+        _, kind = self.solver.solve(
+            table.player1.hand,
+            table.player2.hand,
+            table.player1_table,
+            table.player2_table,
+            to_move,
+        )
+        for card in self.hand:
+            if card.kind == kind:
+                self.hand.remove(card)
+                return card
+        return None
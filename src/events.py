@@ -0,0 +1,186 @@
+"""Event sinks that receive what happens during a game.
+
+The engine hands plain objects (players, cards, scores) to a sink and
+never formats anything itself, so a headless run with ``NullSink`` does
+no string work at all. ``ConsoleSink`` prints the classic game output
+and ``StructuredSink`` records the events as dictionaries.
+"""
+
+
+class EventSink:
+    """Base class of event sinks; every event is ignored by default.
+
+    The engine only calls a sink whose ``enabled`` attribute is true.
+    """
+
+    enabled = True
+
+    def deal(self, round_number, players):
+        """Cards were dealt to ``players`` at the start of a round."""
+
+    def play(self, seat, player, card):
+        """The player in ``seat`` played ``card``."""
+
+    def swap(self, players):
+        """The players passed their hands on."""
+
+    def round_score(self, round_number, tables, scores):
+        """A round ended with these tables and scores, by seat."""
+
+    def game_end(self, totals):
+        """The game ended with these total scores, by seat."""
+
+
+class NullSink(EventSink):
+    """Sink for headless runs; the engine skips it entirely."""
+
+    enabled = False
+
+
+class MultiSink(EventSink):
+    """Passes every event on to several sinks.
+
+    Disabled sinks are dropped, and the sink is disabled itself when
+    none of them is enabled.
+    """
+
+    def __init__(self, *sinks):
+        """Initializes the sink."""
+        self.sinks = [sink for sink in sinks if sink.enabled]
+        self.enabled = bool(self.sinks)
+
+    def deal(self, round_number, players):
+        """Passes the deal on."""
+        for sink in self.sinks:
+            sink.deal(round_number, players)
+
+    def play(self, seat, player, card):
+        """Passes the play on."""
+        for sink in self.sinks:
+            sink.play(seat, player, card)
+
+    def swap(self, players):
+        """Passes the swap on."""
+        for sink in self.sinks:
+            sink.swap(players)
+
+    def round_score(self, round_number, tables, scores):
+        """Passes the round scores on."""
+        for sink in self.sinks:
+            sink.round_score(round_number, tables, scores)
+
+    def game_end(self, totals):
+        """Passes the totals on."""
+        for sink in self.sinks:
+            sink.game_end(totals)
+
+
+class ConsoleSink(EventSink):
+    """Prints the game as it is played."""
+
+    def deal(self, round_number, players):
+        """Prints the round number and the hands."""
+        print()
+        print(f"Round {round_number}")
+        print()
+        for player in players:
+            player.show_hand()
+        print()
+
+    def play(self, seat, player, card):
+        """Prints the card played."""
+        print(f"Player {seat + 1} plays:", card)
+
+    def swap(self, players):
+        """Prints the hands after they are switched."""
+        print()
+        print("Switch Hands - Sushi Go!")
+        print()
+        for player in players:
+            player.show_hand()
+        print()
+
+    def round_score(self, round_number, tables, scores):
+        """Prints the tables, scores and winner of the round."""
+        for seat, table in enumerate(tables):
+            print(
+                f"Player {seat + 1}'s table: "
+                f"{', '.join(str(card) for card in table)}"
+            )
+        print()
+        for seat, score in enumerate(scores):
+            print(f"Player {seat + 1}'s final score: {score}")
+        print()
+        winners = leaders(scores)
+        if len(winners) == 1:
+            print(f"Player {winners[0] + 1} wins the round!")
+        else:
+            print("The round is a tie!")
+
+    def game_end(self, totals):
+        """Prints the overall winner."""
+        winners = leaders(totals)
+        if len(winners) == 1:
+            print(f"\nOverall game winner: Player {winners[0] + 1}\n")
+        else:
+            print("\nOverall game is a tie!\n")
+
+
+class StructuredSink(EventSink):
+    """Records events as dictionaries.
+
+    Each event is passed to ``callback`` when one is given, else it is
+    appended to ``events``.
+    """
+
+    def __init__(self, callback=None):
+        """Initializes the sink."""
+        self.events = []
+        self.callback = callback if callback is not None else self._record
+
+    def _record(self, event):
+        self.events.append(event)
+
+    def deal(self, round_number, players):
+        """Records the hands dealt."""
+        self.callback(
+            {
+                "event": "deal",
+                "round": round_number,
+                "hands": [[str(card) for card in p.hand] for p in players],
+            }
+        )
+
+    def play(self, seat, player, card):
+        """Records the card played."""
+        self.callback({"event": "play", "seat": seat, "card": str(card)})
+
+    def swap(self, players):
+        """Records the hands after they are switched."""
+        self.callback(
+            {
+                "event": "swap",
+                "hands": [[str(card) for card in p.hand] for p in players],
+            }
+        )
+
+    def round_score(self, round_number, tables, scores):
+        """Records the tables and scores of the round."""
+        self.callback(
+            {
+                "event": "round_score",
+                "round": round_number,
+                "tables": [[str(card) for card in t] for t in tables],
+                "scores": list(scores),
+            }
+        )
+
+    def game_end(self, totals):
+        """Records the total scores."""
+        self.callback({"event": "game_end", "totals": list(totals)})
+
+
+def leaders(scores):
+    """Seats with the highest score."""
+    best = max(scores)
+    return [seat for seat, score in enumerate(scores) if score == best]
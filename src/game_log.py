@@ -0,0 +1,337 @@
+"""Game logs for offline analysis.
+
+``LogSink`` is an event sink that records the deals, plays, swaps and
+round scores of each game as small tuples of card kinds and numbers.
+When a game ends its records go, as one item, onto the bounded queue of
+a ``GameLogWriter``. A background thread drains the queue, encodes the
+games and writes them in large buffered batches, so the simulation
+only waits on the disk when the queue is full. A writer made with
+``block=False`` never waits: it drops and counts a game that finds the
+queue full instead.
+
+Two formats are supported:
+
+- ``"jsonl"``: one compact JSON object per game,
+  ``{"game": id, "events": [...]}``, with the events below.
+- ``"binary"``: fixed-width little-endian records of ``RECORD.size``
+  bytes, ``(game, event, round, seat, kind, value)``; see ``RECORD``.
+
+Events, as recorded and as returned by ``read_log``:
+
+- ``(DEAL, round, hands)``: the hands dealt, as kinds by seat.
+- ``(PLAY, seat, kind)``: the seat played a card.
+- ``(SWAP,)``: the hands were passed on; they follow from the plays.
+- ``(ROUND_SCORE, round, scores)``: the scores of the round by seat.
+- ``(GAME_END, totals)``: the total scores by seat.
+"""
+
+import json
+import queue
+import struct
+import threading
+
+from events import EventSink
+
+DEAL = 0
+PLAY = 1
+SWAP = 2
+ROUND_SCORE = 3
+GAME_END = 4
+
+EVENT_NAMES = ("deal", "play", "swap", "round_score", "game_end")
+FORMATS = ("jsonl", "binary")
+
+# game id (uint32), event, round, seat, kind (uint8), value (int16);
+# 255 marks an unused byte. value is the position in the hand for DEAL,
+# the turn for PLAY and SWAP, and the score for ROUND_SCORE and GAME_END
+RECORD = struct.Struct("<IBBBBh")
+NONE = 255
+
+DEFAULT_QUEUE_SIZE = 4096
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+class LogSink(EventSink):
+    """Event sink that records games for a ``GameLogWriter``.
+
+    Attributes:
+        writer: Writer that receives each finished game.
+        game_id: Id of the game being recorded; it goes up by one after
+            every game unless it is set before the next one.
+    """
+
+    def __init__(self, writer, game_id=0):
+        """Initializes the sink."""
+        self.writer = writer
+        self.game_id = game_id
+        self._events = []
+
+    def deal(self, round_number, players):
+        """Records the hands dealt."""
+        self._events.append(
+            (
+                DEAL,
+                round_number,
+                tuple(tuple(card.kind for card in p.hand) for p in players),
+            )
+        )
+
+    def play(self, seat, player, card):
+        """Records the card played."""
+        self._events.append((PLAY, seat, card.kind))
+
+    def swap(self, players):
+        """Records that the hands were passed on."""
+        self._events.append((SWAP,))
+
+    def round_score(self, round_number, tables, scores):
+        """Records the scores of the round."""
+        self._events.append((ROUND_SCORE, round_number, tuple(scores)))
+
+    def game_end(self, totals):
+        """Records the totals and hands the game to the writer."""
+        self._events.append((GAME_END, tuple(totals)))
+        self.writer.submit(self.game_id, self._events)
+        self._events = []
+        self.game_id += 1
+
+
+class GameLogWriter:
+    """Writes games to a log file from a background thread.
+
+    Use it as a context manager, or call ``close`` when done, so that
+    every queued game is written.
+
+    Attributes:
+        path: File the log is written to.
+        format: ``"jsonl"`` or ``"binary"``.
+        block: Whether ``submit`` waits for room when the queue is full,
+            the default, rather than drop the game and count it in
+            ``dropped``.
+        games: Games written so far.
+        dropped: Games dropped because the queue was full.
+    """
+
+    def __init__(
+        self,
+        path,
+        format="jsonl",
+        queue_size=DEFAULT_QUEUE_SIZE,
+        buffer_size=DEFAULT_BUFFER_SIZE,
+        block=True,
+    ):
+        """Opens the log file and starts the writer thread.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown game log format: {format}")
+        self.path = path
+        self.format = format
+        self.block = block
+        self.buffer_size = buffer_size
+        self.games = 0
+        self.dropped = 0
+        self._encode = _encode_jsonl if format == "jsonl" else _encode_binary
+        self._queue = queue.Queue(queue_size)
+        # Closed by close(), once the writer thread is done with it
+        self._file = open(path, "wb", buffering=buffer_size)  # noqa: SIM115
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="game-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self):
+        """Returns the writer."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Closes the writer."""
+        self.close()
+
+    def submit(self, game_id, events):
+        """Queues a finished game for writing.
+
+        Raises:
+            ValueError: If the writer is closed.
+            Exception: The error the writer thread failed with, such as
+                an ``OSError`` or an encoding error.
+        """
+        if self._closed:
+            raise ValueError("Game log writer is closed.")
+        if self._error is not None:
+            raise self._error
+        if self.block:
+            self._queue.put((game_id, events))
+            return
+        try:
+            self._queue.put_nowait((game_id, events))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Writes every queued game and closes the file.
+
+        Raises:
+            Exception: The error the writer thread failed with.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self):
+        """Drains the queue in batches until ``close``."""
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        encode = self._encode
+        item = ()
+        while item is not None:
+            item = get()
+            # Take whatever else is waiting, up to one buffer of output
+            chunks = []
+            size = 0
+            while item is not None:
+                if self._error is None:
+                    try:
+                        chunk = encode(*item)
+                    except Exception as error:
+                        # Kept for submit and close; the queue is still
+                        # drained so neither of them waits forever
+                        self._error = error
+                    else:
+                        chunks.append(chunk)
+                        size += len(chunk)
+                if size >= self.buffer_size:
+                    break
+                try:
+                    item = get_nowait()
+                except queue.Empty:
+                    break
+            if chunks and self._error is None:
+                try:
+                    self._file.write(b"".join(chunks))
+                    self.games += len(chunks)
+                except Exception as error:
+                    self._error = error
+
+
+def _encode_jsonl(game_id, events):
+    """One JSON line of a game."""
+    return (
+        json.dumps(
+            {"game": game_id, "events": events}, separators=(",", ":")
+        ).encode()
+        + b"\n"
+    )
+
+
+def _encode_binary(game_id, events):
+    """Fixed-width records of a game."""
+    pack = RECORD.pack
+    records = []
+    round_number = 0
+    turn = 0
+    for event in events:
+        code = event[0]
+        if code == PLAY:
+            records.append(pack(game_id, PLAY, round_number, *event[1:], turn))
+        elif code == SWAP:
+            records.append(pack(game_id, SWAP, round_number, NONE, NONE, turn))
+            turn += 1
+        elif code == DEAL:
+            round_number = event[1]
+            turn = 0
+            for seat, hand in enumerate(event[2]):
+                for position, kind in enumerate(hand):
+                    records.append(
+                        pack(game_id, DEAL, round_number, seat, kind, position)
+                    )
+        elif code == ROUND_SCORE:
+            for seat, score in enumerate(event[2]):
+                records.append(
+                    pack(game_id, ROUND_SCORE, event[1], seat, NONE, score)
+                )
+        else:
+            for seat, total in enumerate(event[1]):
+                records.append(pack(game_id, GAME_END, 0, seat, NONE, total))
+    return b"".join(records)
+
+
+def read_log(path, format="jsonl"):
+    """Yields ``(game_id, events)`` for each game of a log file.
+
+    The events are the tuples ``LogSink`` recorded.
+    """
+    if format == "jsonl":
+        with open(path, "rb") as file:
+            for line in file:
+                game = json.loads(line)
+                yield game["game"], [_event(event) for event in game["events"]]
+        return
+    if format != "binary":
+        raise ValueError(f"Unknown game log format: {format}")
+    with open(path, "rb") as file:
+        data = file.read()
+    game_id = None
+    events = []
+    for record in RECORD.iter_unpack(data):
+        if record[0] != game_id:
+            if game_id is not None:
+                yield game_id, events
+            game_id = record[0]
+            events = []
+        _add_record(events, record)
+    if game_id is not None:
+        yield game_id, events
+
+
+def _event(event):
+    """Event tuple of a decoded JSON event."""
+    code = event[0]
+    if code == DEAL:
+        return (DEAL, event[1], tuple(tuple(hand) for hand in event[2]))
+    if code == ROUND_SCORE:
+        return (ROUND_SCORE, event[1], tuple(event[2]))
+    if code == GAME_END:
+        return (GAME_END, tuple(event[1]))
+    return tuple(event)
+
+
+def _add_record(events, record):
+    """Folds one binary record into a game's event list."""
+    _, code, round_number, seat, kind, value = record
+    last = events[-1] if events else (None,)
+    if code == PLAY:
+        events.append((PLAY, seat, kind))
+    elif code == SWAP:
+        events.append((SWAP,))
+    elif code == DEAL:
+        # A hand's records are consecutive, in seat order
+        if last[0] != DEAL or last[1] != round_number:
+            events.append((DEAL, round_number, ((kind,),)))
+        elif seat == len(last[2]):
+            events[-1] = (DEAL, round_number, (*last[2], (kind,)))
+        else:
+            hands = last[2]
+            events[-1] = (
+                DEAL,
+                round_number,
+                (*hands[:-1], hands[-1] + (kind,)),
+            )
+    elif code == ROUND_SCORE:
+        if last[0] != ROUND_SCORE or last[1] != round_number:
+            events.append((ROUND_SCORE, round_number, (value,)))
+        else:
+            events[-1] = (ROUND_SCORE, round_number, (*last[2], value))
+    elif last[0] != GAME_END:
+        events.append((GAME_END, (value,)))
+    else:
+        events[-1] = (GAME_END, (*last[1], value))
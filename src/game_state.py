@@ -0,0 +1,180 @@
+"""Immutable positions of a two-player round, for search.
+
+``Game`` plays on mutable objects: ``Player.hand`` loses a card through
+``list.remove``, the ``RandomTable`` lists grow and hands are swapped,
+so a search that branches from a ``Game`` has to deep-copy it.
+``GameState`` is a value instead: a named tuple of packed count
+integers (4 bits per card kind, as in ``cards.pack``), so ``apply``
+builds the next position from a few integer operations and leaves the
+old one untouched. Branching is calling ``apply`` again on the same
+state, and undoing a move is keeping the previous state.
+
+Hands and tables are counts, not lists, so positions reached by playing
+the same cards in another order are equal and hash alike: a state is
+its own transposition key, and ``key`` packs it into one integer for
+compact tables.
+
+Seat 1 moves first in every turn and seat 2 second, as in ``Game``;
+after seat 2 moves the hands are switched. A state holds no rules: the
+moves are the same in every variant, and ``scores`` takes the
+``rules.Rules`` to score with.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+from cards import (
+    DEFAULT_RULES,
+    KIND_MASK,
+    KIND_SHIFTS,
+    KIND_UNITS,
+    NUM_KINDS,
+    CardKind,
+    kinds_in,
+    pack,
+    unpack,
+)
+
+SEAT1 = 0
+SEAT2 = 1
+
+_PACKED_BITS = 4 * NUM_KINDS
+SCORE_CACHE_SIZE = 1 << 16  # packed tables whose score is kept
+
+
+def pack_counts(counts):
+    """Packs a count vector indexed by kind."""
+    packed = 0
+    for unit, count in zip(KIND_UNITS, counts, strict=True):
+        packed += unit * count
+    return packed
+
+
+@lru_cache(maxsize=SCORE_CACHE_SIZE)
+def table_score(packed, rules=DEFAULT_RULES):
+    """Score of a packed table under ``rules``, round bonuses aside."""
+    return rules.score(unpack(packed))
+
+
+def round_scores(table1, table2, rules=DEFAULT_RULES):
+    """Scores of two packed tables, round bonuses included."""
+    score1 = table_score(table1, rules)
+    score2 = table_score(table2, rules)
+    if rules.maki_majority is None:
+        return score1, score2
+    bonus1, bonus2 = rules.round_bonuses([unpack(table1), unpack(table2)])
+    return score1 + bonus1, score2 + bonus2
+
+
+class GameState(NamedTuple):
+    """A position of a two-player round, from nobody's point of view.
+
+    Attributes:
+        hand1: Packed counts of seat 1's hand.
+        hand2: Packed counts of seat 2's hand.
+        table1: Packed counts of seat 1's table.
+        table2: Packed counts of seat 2's table.
+        to_move: ``SEAT1`` or ``SEAT2``, the seat that plays next.
+        round_index: Index of the round, from 0.
+    """
+
+    hand1: int
+    hand2: int
+    table1: int = 0
+    table2: int = 0
+    to_move: int = SEAT1
+    round_index: int = 0
+
+    @classmethod
+    def from_kinds(
+        cls,
+        hand1,
+        hand2,
+        table1=(),
+        table2=(),
+        to_move=SEAT1,
+        round_index=0,
+    ):
+        """State of hands and tables given as card kinds."""
+        return cls(
+            pack(hand1),
+            pack(hand2),
+            pack(table1),
+            pack(table2),
+            to_move,
+            round_index,
+        )
+
+    @classmethod
+    def from_game(cls, game):
+        """Current position of a two-player ``Game``.
+
+        The player whose table is shorter is the one to move.
+        """
+        tallies = game.table.tallies
+        return cls(
+            pack(card.kind for card in game.player1.hand),
+            pack(card.kind for card in game.player2.hand),
+            pack_counts(tallies[SEAT1].counts),
+            pack_counts(tallies[SEAT2].counts),
+            SEAT2 if tallies[SEAT1].size > tallies[SEAT2].size else SEAT1,
+            game.round_index,
+        )
+
+    @property
+    def key(self):
+        """The whole state packed into one integer."""
+        return (
+            self.hand1
+            | self.hand2 << _PACKED_BITS
+            | self.table1 << 2 * _PACKED_BITS
+            | self.table2 << 3 * _PACKED_BITS
+            | self.to_move << 4 * _PACKED_BITS
+            | self.round_index << 4 * _PACKED_BITS + 1
+        )
+
+    @property
+    def is_over(self):
+        """Whether every card of the round has been played."""
+        return not (self.hand1 or self.hand2)
+
+    def hand(self, seat):
+        """Count vector of a seat's hand."""
+        return unpack(self[seat])
+
+    def table(self, seat):
+        """Count vector of a seat's table."""
+        return unpack(self[2 + seat])
+
+    def moves(self):
+        """Kinds the seat to move can play, in kind order."""
+        return kinds_in(self[self.to_move])
+
+    def apply(self, kind):
+        """The state after the seat to move plays a card of ``kind``.
+
+        Raises:
+            ValueError: If the seat to move holds no card of ``kind``.
+        """
+        hand1, hand2, table1, table2, to_move, round_index = self
+        unit = KIND_UNITS[kind]
+        if to_move == SEAT1:
+            if not hand1 >> KIND_SHIFTS[kind] & KIND_MASK:
+                raise ValueError(f"Seat 1 holds no {CardKind(kind).name}.")
+            return GameState(
+                hand1 - unit, hand2, table1 + unit, table2, SEAT2, round_index
+            )
+        if not hand2 >> KIND_SHIFTS[kind] & KIND_MASK:
+            raise ValueError(f"Seat 2 holds no {CardKind(kind).name}.")
+        # Seat 2 closes the turn: hands are switched
+        return GameState(
+            hand2 - unit, hand1, table1, table2 + unit, SEAT1, round_index
+        )
+
+    def scores(self, rules=DEFAULT_RULES):
+        """Score of each seat's table under ``rules``.
+
+        Round bonuses such as maki majority are included, so the scores
+        are final once the round is over.
+        """
+        return round_scores(self.table1, self.table2, rules)
@@ -3,8 +3,8 @@
 """Version 0. This module presents a simulation of a naive maximizer decision for a sushi go game."""
 
 from random import shuffle
-from PIL import Image
 import os
+from card_images import CARD_IMAGE_MAP, show_card_image  # noqa: F401
 # from random import shuffle
 # import tkinter as tk
 
@@ -18,32 +18,8 @@ NIGIRI_EGG = "Egg Nigiri"
 WASABI = "Wasabi"
 MAKI_ROLLS = ["Maki 1", "Maki 2", "Maki 3"]
 
-# Add a helper function to display card images
-CARD_IMAGE_MAP = {
-    "Maki 1": "sushi_go_1_mr.jpeg",
-    "Maki 2": "sushi_go_2_mr.jpeg",
-    "Maki 3": "sushi_go_3_mr.jpeg",
-    "Dumpling": "sushi_go_dumpling.jpeg",
-    "Egg Nigiri": "sushi_go_egg_n.png",
-    "Salmon Nigiri": "sushi_go_salmon_n.jpeg",
-    "Sashimi": "sushi_go_sashimi.jpeg",
-    "Squid Nigiri": "sushi_go_squid_n.png",
-    "Tempura": "sushi_go_tempura.jpeg",
-    "Wasabi": "sushi_go_wasabi.jpeg"
-}
-
-# # The updated show_card_image function
-# def show_card_image(card_name):
-#     # Use the card name to get the correct image filename from the map
-#     image_name = CARD_IMAGE_MAP.get(card_name)
-#     if image_name is None:
-#         print(f"No image found for card: {card_name}")
-#         return
-#     image_path = os.path.join("..", "Images", image_name)
-#     image = Image.open(image_path)
-#     image.show()
-
-
+# Card images are drawn by card_images, which imports PIL only when an
+# image is first needed
 class Card:
     """Playing cards for Sushi Go."""
     def __init__(self, card_type: str):
@@ -0,0 +1,283 @@
+"""Information-set Monte Carlo Tree Search player.
+
+``ISMCTSPlayer`` searches the rest of the current round before each
+move. Every iteration samples the hidden part of the opponent's hand
+from the cards it has not seen yet (the deck composition minus every
+card it has observed), then descends a tree whose statistics live in a
+transposition table shared by all samples and all moves.
+
+Positions are packed into integers, 4 bits per card kind, so applying a
+move is one addition and a position is its own transposition key.
+"""
+
+import math
+import random
+import time
+
+from cards import (
+    DECK_COUNTS,
+    DEFAULT_RULES,
+    KIND_MASK,
+    KIND_SHIFTS,
+    KIND_UNITS,
+    NUM_KINDS,
+    kinds_in,
+    pack,
+    unpack,
+)
+from game_state import round_scores
+from sushi_go_game import Player
+
+# Seats in a search position; ME is the searching player
+ME = 0
+OPPONENT = 1
+
+
+def _gain(table, kind, rules):
+    """Points one more card of ``kind`` adds to a packed table."""
+    top_nigiri = 0
+    for nigiri in rules.nigiri_kinds:
+        if table >> KIND_SHIFTS[nigiri] & KIND_MASK:
+            top_nigiri = rules.faces[nigiri]
+            break
+    has_wasabi = False
+    for wasabi in rules.wasabi_kinds:
+        if table >> KIND_SHIFTS[wasabi] & KIND_MASK:
+            has_wasabi = True
+    return rules.gain(
+        kind, table >> KIND_SHIFTS[kind] & KIND_MASK, top_nigiri, has_wasabi
+    )
+
+
+class ISMCTSPlayer(Player):
+    """Player that picks each card with information-set MCTS.
+
+    Attributes:
+        iterations: Simulations per move when no time budget is set.
+        time_budget: Seconds of search per move, or None.
+        exploration: UCB1 exploration constant, in points of score.
+        transpositions: Node statistics shared by the searches of a
+            round; maps a position to ``[visits, {kind: [visits,
+            total_reward]}]``. Cleared at the start of each round.
+        rules: ``rules.Rules`` the search scores with, taken from the
+            table of each move.
+    """
+
+    def __init__(
+        self,
+        name,
+        iterations=2000,
+        time_budget=None,
+        exploration=5.0,
+        rng=None,
+    ):
+        """Initializes the player and its search budget."""
+        super().__init__(name)
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.rng = random.Random() if rng is None else rng
+        self.transpositions = {}
+        self.rules = DEFAULT_RULES
+        self.last_iterations = 0
+        self._passed = []  # hand passed on after the last play
+        self._seen = [0] * NUM_KINDS  # cards seen in finished rounds
+        self._last_table = None
+
+    def play_max_scoring_card(self, table=None):
+        """Plays the first card of a round, chosen by search.
+
+        In seat 2 the opponent's first card is already on ``table``.
+        Positions of earlier rounds never come back, so the
+        transposition table is cleared.
+        """
+        self.transpositions.clear()
+        self._passed = []  # no hand has been passed this round
+        if table is None:
+            self._observe(None)
+            return self._play(0, 0, None, pending=2)
+        return self.play_best_card(table)
+
+    def play_best_card(self, table, cache=None):
+        """Plays the card chosen by search; ``cache`` is not used."""
+        self._observe(table)
+        self.rules = table.rules
+        if table.player1 is self:
+            mine, theirs = table.player1_table, table.player2_table
+        else:
+            mine, theirs = table.player2_table, table.player1_table
+        # The opponent already moved this turn if its table is longer
+        pending = 1 if len(theirs) > len(mine) else 2
+        opponent_hand = None
+        if len(self._passed) == len(self.hand):
+            known = list(self._passed)
+            if pending == 1 and theirs[-1].kind in known:
+                known.remove(theirs[-1].kind)
+                opponent_hand = known
+            elif pending == 2:
+                opponent_hand = known
+        return self._play(
+            pack(card.kind for card in mine),
+            pack(card.kind for card in theirs),
+            opponent_hand,
+            pending,
+        )
+
+    def _observe(self, table):
+        """Remembers the final tables of a finished round."""
+        last = self._last_table
+        if last is not None and last is not table:
+            for card in last.player1_table + last.player2_table:
+                self._seen[card.kind] += 1
+        self._last_table = table
+
+    def _play(self, my_table, opponent_table, opponent_hand, pending):
+        if not self.hand:
+            print(f"{self.name} has no cards to play.")
+            return None
+        kind = self.choose(my_table, opponent_table, opponent_hand, pending)
+        for card in self.hand:
+            if card.kind == kind:
+                self.hand.remove(card)
+                break
+        self._passed = [card.kind for card in self.hand]
+        return card
+
+    def _unseen(self, my_table, opponent_table):
+        """Counts of the cards this player has not seen."""
+        unseen = [
+            DECK_COUNTS[kind] - self._seen[kind] for kind in range(NUM_KINDS)
+        ]
+        for card in self.hand:
+            unseen[card.kind] -= 1
+        for packed in (my_table, opponent_table):
+            for kind, count in enumerate(unpack(packed)):
+                unseen[kind] -= count
+        return unseen
+
+    def choose(self, my_table, opponent_table, opponent_hand, pending):
+        """Searches and returns the kind of card to play.
+
+        Args:
+            my_table: Packed counts of this player's table.
+            opponent_table: Packed counts of the opponent's table.
+            opponent_hand: Kinds in the opponent's hand, or None if the
+                hand is hidden and has to be sampled.
+            pending: Moves left before hands are switched, counting this
+                one: 2 if the opponent still moves this turn, else 1.
+        """
+        my_hand = pack(card.kind for card in self.hand)
+        actions = kinds_in(my_hand)
+        if len(actions) == 1:
+            self.last_iterations = 0
+            return actions[0]
+
+        pool = []
+        fixed_opponent = 0
+        opponent_size = len(self.hand) - (2 - pending)
+        if opponent_hand is None:
+            for kind, count in enumerate(
+                self._unseen(my_table, opponent_table)
+            ):
+                pool += [kind] * max(count, 0)
+            opponent_size = min(opponent_size, len(pool))
+        else:
+            fixed_opponent = pack(opponent_hand)
+
+        root = {kind: [0, 0.0] for kind in actions}
+        rng = self.rng
+        deadline = (
+            None
+            if self.time_budget is None
+            else time.perf_counter() + self.time_budget
+        )
+        iteration = 0
+        while True:
+            if deadline is None:
+                if iteration >= self.iterations:
+                    break
+            elif iteration % 32 == 0 and time.perf_counter() >= deadline:
+                break
+            iteration += 1
+            opponent = (
+                fixed_opponent
+                if opponent_hand is not None
+                else pack(rng.sample(pool, opponent_size))
+            )
+            self._iterate(
+                root,
+                [my_hand, opponent],
+                [my_table, opponent_table],
+                pending,
+            )
+        self.last_iterations = iteration
+        return max(root, key=lambda kind: root[kind][0])
+
+    def _select(self, edges, visits, actions, maximize):
+        """UCB1 choice among ``actions``; untried actions go first."""
+        best_action = None
+        best_value = -math.inf
+        log_visits = math.log(visits) if visits else 0.0
+        for action in actions:
+            edge = edges.get(action)
+            if edge is None or edge[0] == 0:
+                return action
+            mean = edge[1] / edge[0]
+            value = (mean if maximize else -mean) + self.exploration * (
+                math.sqrt(log_visits / edge[0])
+            )
+            if value > best_value:
+                best_action = action
+                best_value = value
+        return best_action
+
+    def _iterate(self, root, hands, tables, pending):
+        """Runs one simulation from the root and backs up its reward."""
+        root_visits = sum(edge[0] for edge in root.values())
+        action = self._select(root, root_visits, tuple(root), True)
+        path = [(None, root, action)]
+        # Whoever moved first this turn also moves first in later turns
+        first = ME if pending == 2 else OPPONENT
+        mover = ME
+        transpositions = self.transpositions
+        rules = self.rules
+        expanded = False
+        while True:
+            hands[mover] -= KIND_UNITS[action]
+            tables[mover] += KIND_UNITS[action]
+            pending -= 1
+            if pending == 0:
+                hands[ME], hands[OPPONENT] = hands[OPPONENT], hands[ME]
+                pending = 2
+                mover = first
+            else:
+                mover = 1 - mover
+            if not hands[mover]:
+                break
+            if expanded:
+                # Greedy rollout below the newly expanded node
+                action = max(
+                    kinds_in(hands[mover]),
+                    key=lambda kind: _gain(tables[mover], kind, rules),
+                )
+                continue
+            key = (mover, pending, hands[ME], hands[OPPONENT], *tables)
+            node = transpositions.get(key)
+            if node is None:
+                node = transpositions[key] = [0, {}]
+                expanded = True
+            action = self._select(
+                node[1], node[0], kinds_in(hands[mover]), mover == ME
+            )
+            path.append((node, node[1], action))
+
+        my_score, opponent_score = round_scores(*tables, rules)
+        reward = my_score - opponent_score
+        for node, edges, action in path:
+            if node is not None:
+                node[0] += 1
+            edge = edges.get(action)
+            if edge is None:
+                edge = edges[action] = [0, 0.0]
+            edge[0] += 1
+            edge[1] += reward
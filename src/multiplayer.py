@@ -0,0 +1,188 @@
+"""Sushi Go engine for two to five players.
+
+``MultiplayerGame`` keeps the hands in a ``deque`` indexed by seat, so
+passing every hand to the next seat is a single O(1) rotation, and the
+tables in a ``RandomTable`` indexed by seat. A turn costs one decision
+and one table update per player, so the cost of a game grows linearly
+with the number of players.
+
+Strategies that read the opponent's table through ``player1`` and
+``player2`` (``ISMCTSPlayer``, ``EndgamePlayer``) are two-player only;
+plain ``Player`` maximizers work at any table size.
+"""
+
+from collections import deque
+
+from cards import DEFAULT_RULES
+from events import ConsoleSink
+from instrumentation import NullTimer
+from sushi_go_game import Player, RandomTable
+
+MIN_PLAYERS = 2
+MAX_PLAYERS = 5
+HAND_SIZE = 3
+
+
+class MultiplayerGame:
+    """A game of Sushi Go between two to five players.
+
+    Hands are passed to the next seat after every turn: the player in
+    seat ``i`` receives the hand of seat ``i - 1``, and seat 0 receives
+    the hand of the last seat. With two players this is exactly
+    ``Game.switch_hands``.
+
+    Attributes:
+        players: Player in each seat.
+        hands: Hand held by each seat, as a ``deque``.
+        table: ``RandomTable`` of the current round, indexed by seat.
+        rules: ``rules.Rules`` the rounds are scored by.
+        round_scores: Scores of each finished round, by seat.
+    """
+
+    def __init__(
+        self,
+        players,
+        rounds,
+        deck,
+        hand_size=HAND_SIZE,
+        sink=None,
+        cache=None,
+        timer=None,
+        rules=None,
+    ):
+        """Initializes the game.
+
+        Args:
+            players: Players or player names, one per seat.
+            rounds: Number of rounds to play.
+            deck: Deck to deal from.
+            hand_size: Cards dealt to each player per round.
+            sink: ``EventSink`` that receives the game events; defaults to
+                a ``ConsoleSink`` that prints the game.
+            cache: Optional ``DecisionCache`` shared by all players.
+            timer: Optional ``PhaseTimer``; off by default.
+            rules: ``rules.Rules`` of the variant to play; the game's by
+                default.
+
+        Raises:
+            ValueError: If there are not 2 to 5 players, or the deck is too
+                small for every round.
+        """
+        if not MIN_PLAYERS <= len(players) <= MAX_PLAYERS:
+            raise ValueError(
+                f"A game needs {MIN_PLAYERS} to {MAX_PLAYERS} players, "
+                f"got {len(players)}."
+            )
+        if len(players) * hand_size * rounds > len(deck):
+            raise ValueError("Not enough cards in the deck.")
+        self.players = tuple(
+            player if isinstance(player, Player) else Player(player)
+            for player in players
+        )
+        self.rounds = rounds
+        self.deck = deck
+        self.hand_size = hand_size
+        self.sink = ConsoleSink() if sink is None else sink
+        self.cache = cache
+        self.timer = NullTimer() if timer is None else timer
+        for player in self.players:
+            player.timer = self.timer if self.timer.enabled else None
+        self.hands = deque(player.hand for player in self.players)
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.table = RandomTable([], *self.players, rules=self.rules)
+        self.round_scores = []
+
+    def pass_hands(self):
+        """Passes every hand to the next seat."""
+        timer = self.timer
+        if timer.enabled:
+            start = timer.clock()
+        self.hands.rotate(1)
+        if self.sink.enabled:
+            # Only the sink reads the players' hands between turns
+            for player, hand in zip(self.players, self.hands, strict=True):
+                player.hand = hand
+            self.sink.swap(self.players)
+        if timer.enabled:
+            timer.add("swap", timer.clock() - start)
+
+    def _play_turn(self, first):
+        """Every seat plays a card from the hand it holds."""
+        sink = self.sink
+        timer = self.timer
+        timing = timer.enabled
+        clock = timer.clock
+        table = self.table
+        cache = self.cache
+        for seat, (player, hand) in enumerate(
+            zip(self.players, self.hands, strict=True)
+        ):
+            player.hand = hand
+            if timing:
+                start = clock()
+            if first:
+                card = player.play_max_scoring_card(table)
+            else:
+                card = player.play_best_card(table, cache)
+            if timing:
+                timer.add("first_play" if first else "play", clock() - start)
+                start = clock()
+            table.add_card(seat, card)
+            if sink.enabled:
+                sink.play(seat, player, card)
+            if timing:
+                timer.add("table", clock() - start)
+
+    def conduct_round(self):
+        """Plays every round of the game."""
+        sink = self.sink
+        timer = self.timer
+        timing = timer.enabled
+        clock = timer.clock
+        players = self.players
+        self.round_scores = []
+
+        for round_index in range(self.rounds):
+            if timing:
+                start = clock()
+            for player in players:
+                player.assign_cards(self.deck, self.hand_size)
+            self.hands = deque(player.hand for player in players)
+            if sink.enabled:
+                sink.deal(round_index + 1, players)
+            if timing:
+                timer.add("deal", clock() - start)
+
+            self._play_turn(first=True)
+            self.pass_hands()
+            while self.hands[0]:
+                self._play_turn(first=False)
+                self.pass_hands()
+
+            if timing:
+                start = clock()
+            scores = tuple(self.table.round_scores())
+            self.round_scores.append(scores)
+            if timing:
+                timer.add("score", clock() - start)
+            if sink.enabled:
+                sink.round_score(round_index + 1, self.table.tables, scores)
+
+            self.table = RandomTable([], *players, rules=self.rules)
+
+        if sink.enabled:
+            sink.game_end(self.totals())
+
+    def totals(self):
+        """Total score of each seat over the finished rounds."""
+        totals = [0] * len(self.players)
+        for scores in self.round_scores:
+            for seat, score in enumerate(scores):
+                totals[seat] += score
+        return tuple(totals)
+
+    def winners(self):
+        """Seats with the highest total score."""
+        totals = self.totals()
+        best = max(totals)
+        return [seat for seat, total in enumerate(totals) if total == best]
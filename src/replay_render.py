@@ -0,0 +1,280 @@
+"""Pictures and animations of replayed games, rendered in batches.
+
+Games come from a ``replay_store.ReplayStore``. ``render_strip`` draws
+the tables of every round of a game, one row per seat and round, and
+``render_gif`` animates the same picture card by card. Both draw on one
+canvas incrementally: each turn pastes only the cards just played, from
+the pre-scaled sprites of ``card_images.get_atlas``, so no image is
+decoded or resized after the atlas is built. The atlas is quantized to
+a palette once, so frames are palette images that are written without
+being quantized again, and each GIF frame stores only the region that
+changed.
+
+``render_games`` spreads many games over a process pool. Each worker
+builds its atlas once and maps the replay file once per task, and
+``extreme_games`` picks the games worth looking at, such as the widest
+wins of a tournament.
+"""
+
+import argparse
+import os
+from multiprocessing import Pool
+
+from card_images import CARD_SIZE, get_atlas
+from cards import DEFAULT_RULES, NUM_KINDS
+from replay_store import ReplayStore
+
+FORMATS = ("png", "gif")
+FRAME_DURATION = 300  # milliseconds per turn of a GIF
+DEFAULT_CHUNK_SIZE = 50
+
+
+def _layout(turns, num_players):
+    """Rows and columns of a game's picture, and the row of each round."""
+    rounds = sorted({turn.round for turn in turns})
+    first_row = {
+        round_number: index * num_players
+        for index, round_number in enumerate(rounds)
+    }
+    columns = max((turn.turn + 1 for turn in turns), default=0)
+    return len(rounds) * num_players, columns, first_row
+
+
+def _frames(turns, num_players, atlas):
+    """Canvas of a game, yielded after every turn as it is drawn."""
+    rows, columns, first_row = _layout(turns, num_players)
+    canvas = atlas.canvas(columns, rows)
+    yield canvas
+    for turn in turns:
+        row = first_row[turn.round]
+        for seat, kind in enumerate(turn.played):
+            atlas.paste(canvas, kind, turn.turn, row + seat)
+        yield canvas
+
+
+def render_strip(turns, num_players=2, card_size=CARD_SIZE):
+    """Tables of every round of a game, one row per seat and round.
+
+    Args:
+        turns: ``replay_store.Turn`` records of the game, in order.
+        num_players: Seats in the game.
+        card_size: Size of each card.
+
+    Returns:
+        The picture, a palette ``PIL.Image.Image``.
+    """
+    # Every frame is the same canvas; the last one is complete
+    *_, canvas = _frames(
+        turns, num_players, get_atlas(card_size, palette=True)
+    )
+    return canvas
+
+
+def render_gif(
+    turns,
+    path,
+    num_players=2,
+    card_size=CARD_SIZE,
+    duration=FRAME_DURATION,
+):
+    """Writes a GIF that plays a game turn by turn.
+
+    The first frame is the empty table; each later frame adds the cards
+    of one turn.
+
+    Args:
+        turns: ``replay_store.Turn`` records of the game, in order.
+        path: File to write.
+        num_players: Seats in the game.
+        card_size: Size of each card.
+        duration: Milliseconds each frame is shown.
+    """
+    frames = [
+        canvas.copy()
+        for canvas in _frames(
+            turns, num_players, get_atlas(card_size, palette=True)
+        )
+    ]
+    # The frames share the atlas palette, so there is nothing for the
+    # optimizer to shrink; it would only rescan every frame
+    frames[0].save(
+        path,
+        save_all=True,
+        append_images=frames[1:],
+        duration=duration,
+        loop=0,
+        optimize=False,
+    )
+
+
+def game_totals(turns, num_players=2, rules=DEFAULT_RULES):
+    """Total score of each seat from a game's turn records.
+
+    ``rules`` are the ``rules.Rules`` the game was played with.
+    """
+    totals = [0] * num_players
+    tables = None
+    last_round = None
+    for turn in turns:
+        if turn.round != last_round:
+            if tables is not None:
+                for seat, score in enumerate(rules.score_round(tables)):
+                    totals[seat] += score
+            tables = [[0] * NUM_KINDS for _ in range(num_players)]
+            last_round = turn.round
+        for seat, kind in enumerate(turn.played):
+            tables[seat][kind] += 1
+    if tables is not None:
+        for seat, score in enumerate(rules.score_round(tables)):
+            totals[seat] += score
+    return totals
+
+
+def margin(totals):
+    """Seat 1's total minus seat 2's."""
+    return totals[0] - totals[1]
+
+
+def extreme_games(store, count, key=margin, rules=DEFAULT_RULES):
+    """Indices of the games with the lowest and the highest ``key``.
+
+    Args:
+        store: ``ReplayStore`` to rank.
+        count: Games to pick at each end.
+        key: Function of a game's totals; by default seat 1's margin.
+        rules: ``rules.Rules`` the games were played with.
+
+    Returns:
+        The ``count`` lowest games, lowest first, and the ``count``
+        highest games, highest first. With ``count`` over half the
+        games the two lists share games.
+    """
+    num_players = store.num_players
+    values = [
+        key(game_totals(store.turns(index), num_players, rules))
+        for index in range(len(store))
+    ]
+    order = sorted(range(len(values)), key=values.__getitem__)
+    return order[:count], order[::-1][:count]
+
+
+def output_path(out_dir, game_id, format):
+    """File a game's picture is written to."""
+    return os.path.join(out_dir, f"game-{game_id:010d}.{format}")
+
+
+def _render_chunk(task):
+    """Renders some games of a replay file; returns their paths."""
+    replay_path, indices, out_dir, format, card_size, duration = task
+    paths = []
+    with ReplayStore(replay_path) as store:
+        num_players = store.num_players
+        for index in indices:
+            turns = list(store.turns(index))
+            path = output_path(out_dir, store.game_id(index), format)
+            if format == "gif":
+                render_gif(turns, path, num_players, card_size, duration)
+            else:
+                render_strip(turns, num_players, card_size).save(path)
+            paths.append(path)
+    return paths
+
+
+def render_games(
+    replay_path,
+    indices,
+    out_dir,
+    format="png",
+    card_size=CARD_SIZE,
+    duration=FRAME_DURATION,
+    workers=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+):
+    """Renders games of a replay file across a process pool.
+
+    Args:
+        replay_path: Replay file written by ``replay_store.ReplayWriter``.
+        indices: Positions of the games in the file; a game given more
+            than once, as the ends of ``extreme_games`` can overlap, is
+            rendered once.
+        out_dir: Directory to write to, one file per game, as named by
+            ``output_path``.
+        format: ``"png"`` for a strip of the tables of every round,
+            ``"gif"`` for an animation.
+        card_size: Size of each card.
+        duration: Milliseconds per GIF frame.
+        workers: Number of worker processes; defaults to the CPU count.
+            With 1 the games are rendered in this process.
+        chunk_size: Number of games each task renders.
+
+    Returns:
+        The paths written, in the order the games first appear in
+        ``indices``.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown image format: {format}")
+    os.makedirs(out_dir, exist_ok=True)
+    # Two renders of one game would write the same file
+    indices = list(dict.fromkeys(indices))
+    tasks = [
+        (
+            replay_path,
+            indices[start : start + chunk_size],
+            out_dir,
+            format,
+            card_size,
+            duration,
+        )
+        for start in range(0, len(indices), chunk_size)
+    ]
+    if workers == 1:
+        chunks = map(_render_chunk, tasks)
+        return [path for paths in chunks for path in paths]
+    with Pool(workers) as pool:
+        return [
+            path for paths in pool.imap(_render_chunk, tasks) for path in paths
+        ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Render games of a replay file as images."
+    )
+    parser.add_argument("replay", help="replay file")
+    parser.add_argument("--out-dir", default="renders")
+    parser.add_argument("--format", choices=FORMATS, default="png")
+    parser.add_argument(
+        "--games", type=int, nargs="*", default=None, help="game ids"
+    )
+    parser.add_argument(
+        "--extremes",
+        type=int,
+        default=None,
+        help="render this many widest wins of each seat instead",
+    )
+    parser.add_argument(
+        "--card-size", type=int, nargs=2, default=list(CARD_SIZE)
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with ReplayStore(args.replay) as store:
+        if args.extremes is not None:
+            lowest, highest = extreme_games(store, args.extremes)
+            selected = lowest + highest
+        elif args.games is not None:
+            selected = [store.find(game_id) for game_id in args.games]
+        else:
+            selected = list(range(len(store)))
+    written = render_games(
+        args.replay,
+        selected,
+        args.out_dir,
+        args.format,
+        card_size=tuple(args.card_size),
+        workers=args.workers,
+    )
+    print(f"Wrote {len(written)} images to {args.out_dir}")
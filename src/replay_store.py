@@ -0,0 +1,369 @@
+"""Memory-mapped store of game replays with random access by game.
+
+A replay file holds one fixed-size record per turn and an index of the
+first record of every game, so any game is found without scanning the
+file. ``ReplayStore`` maps the file with ``mmap`` and hands out
+``memoryview`` slices of it, so neither random access nor a sequential
+scan copies the records.
+
+Layout, little-endian:
+
+- header, ``HEADER``: magic, version, number of players, hand size,
+  record size, number of games and offset of the index.
+- records: per turn, the round and turn numbers, then for each seat the
+  hand it held at the start of the turn (``hand_size`` kinds, padded
+  with ``NO_CARD``) and the kind it played.
+- index, 8-byte aligned: the id of every game (uint64, ascending, as
+  ``find`` bisects them), then the first record of every game plus one
+  past the end (uint64).
+
+``ReplayWriter.submit`` takes the events ``game_log.LogSink`` records,
+so a ``LogSink`` can write a replay file directly; ``replay_game``
+rebuilds the ``Game`` and ``RandomTable`` of any turn.
+"""
+
+import bisect
+import mmap
+import struct
+from array import array
+
+from cards import DEFAULT_RULES
+from events import NullSink
+from game_log import DEAL, PLAY, SWAP, read_log
+from sushi_go_game import CARDS, Deck, Game, RandomTable, TableTally
+
+MAGIC = b"SGRP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHHQQ")
+NO_CARD = 255
+_PADDING = bytes([NO_CARD])
+
+
+def record_struct(num_players, hand_size):
+    """Struct of one turn record."""
+    return struct.Struct("<BB" + f"{hand_size}sB" * num_players)
+
+
+class ReplayWriter:
+    """Writes games to a replay file.
+
+    Use it as a context manager, or call ``close``, to write the index.
+
+    Attributes:
+        num_players: Seats in every game of the file.
+        hand_size: Largest hand dealt in a round.
+        games: Games written so far.
+    """
+
+    def __init__(self, path, num_players=2, hand_size=3):
+        """Opens the replay file for writing."""
+        self.path = path
+        self.num_players = num_players
+        self.hand_size = hand_size
+        self.games = 0
+        self._record = record_struct(num_players, hand_size)
+        self._ids = array("Q")
+        self._starts = array("Q", [0])
+        # Closed by close(), which also writes the index
+        self._file = open(path, "wb")  # noqa: SIM115
+        self._file.write(bytes(HEADER.size))
+
+    def __enter__(self):
+        """Returns the writer."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Writes the index and closes the file."""
+        self.close()
+
+    def submit(self, game_id, events):
+        """Writes a game given as ``LogSink`` events.
+
+        Raises:
+            ValueError: If ``game_id`` is not larger than the last one,
+                a hand is larger than ``hand_size`` or a turn does not
+                have one play per seat.
+        """
+        if self._ids and game_id <= self._ids[-1]:
+            raise ValueError(
+                f"Game {game_id} does not follow game {self._ids[-1]}; "
+                "ids must be increasing."
+            )
+        pack = self._record.pack
+        hand_size = self.hand_size
+        num_players = self.num_players
+        records = []
+        hands = []
+        played = [NO_CARD] * num_players
+        round_number = turn = 0
+        for event in events:
+            code = event[0]
+            if code == DEAL:
+                round_number = event[1]
+                turn = 0
+                hands = [list(hand) for hand in event[2]]
+                if len(hands) != num_players or any(
+                    len(hand) > hand_size for hand in hands
+                ):
+                    raise ValueError(
+                        f"Deal does not fit {num_players} hands of "
+                        f"{hand_size} cards."
+                    )
+            elif code == PLAY:
+                played[event[1]] = event[2]
+            elif code == SWAP:
+                if NO_CARD in played:
+                    raise ValueError("Every seat must play once per turn.")
+                fields = [round_number, turn]
+                for hand, kind in zip(hands, played, strict=True):
+                    fields.append(bytes(hand).ljust(hand_size, _PADDING))
+                    fields.append(kind)
+                    hand.remove(kind)
+                records.append(pack(*fields))
+                # Every hand goes to the next seat
+                hands.insert(0, hands.pop())
+                played = [NO_CARD] * num_players
+                turn += 1
+        if any(len(hand) for hand in hands):
+            raise ValueError("Game ended with cards in hand.")
+        self._file.write(b"".join(records))
+        self._ids.append(game_id)
+        self._starts.append(self._starts[-1] + len(records))
+        self.games += 1
+
+    def close(self):
+        """Writes the index and the header and closes the file."""
+        if self._file.closed:
+            return
+        file = self._file
+        index_offset = file.tell()
+        padding = -index_offset % 8
+        file.write(bytes(padding))
+        index_offset += padding
+        file.write(self._ids.tobytes())
+        file.write(self._starts.tobytes())
+        file.seek(0)
+        file.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                self.num_players,
+                self.hand_size,
+                self._record.size,
+                self.games,
+                index_offset,
+            )
+        )
+        file.close()
+
+
+def convert_log(log_path, replay_path, log_format="jsonl", **options):
+    """Writes the games of a game log to a replay file.
+
+    ``options`` are passed to ``ReplayWriter``.
+    """
+    with ReplayWriter(replay_path, **options) as writer:
+        for game_id, events in read_log(log_path, log_format):
+            writer.submit(game_id, events)
+    return writer.games
+
+
+class ReplayStore:
+    """Read-only, memory-mapped view of a replay file.
+
+    Views returned by ``game_records`` borrow the mapping; release them
+    before ``close``.
+
+    Attributes:
+        num_players: Seats in every game.
+        hand_size: Largest hand dealt in a round.
+        record: ``struct.Struct`` of a turn record.
+    """
+
+    def __init__(self, path):
+        """Maps a replay file.
+
+        Raises:
+            ValueError: If the file is not a replay file of this version.
+        """
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        try:
+            (
+                magic,
+                version,
+                self.num_players,
+                self.hand_size,
+                record_size,
+                num_games,
+                index_offset,
+            ) = HEADER.unpack_from(view)
+        except struct.error:
+            magic = version = None
+        if magic == MAGIC and version == VERSION:
+            self.record = record_struct(self.num_players, self.hand_size)
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or (self.record.size != record_size)
+        ):
+            view.release()
+            self._mmap.close()
+            raise ValueError(f"{path} is not a version {VERSION} replay file")
+        self._view = view
+        self._records = view[HEADER.size : index_offset]
+        index = view[index_offset:].cast("Q")
+        self._ids = index[:num_games]
+        self._starts = index[num_games:]
+
+    def __enter__(self):
+        """Returns the store."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Unmaps the file."""
+        self.close()
+
+    def __len__(self):
+        """Number of games."""
+        return len(self._ids)
+
+    def close(self):
+        """Unmaps the file."""
+        if self._mmap.closed:
+            return
+        for view in (self._ids, self._starts, self._records, self._view):
+            view.release()
+        self._mmap.close()
+
+    def game_id(self, index):
+        """Id of the game at ``index``."""
+        return self._ids[index]
+
+    def find(self, game_id):
+        """Index of the game with ``game_id``.
+
+        Raises:
+            KeyError: If no game has that id.
+        """
+        index = bisect.bisect_left(self._ids, game_id)
+        if index == len(self._ids) or self._ids[index] != game_id:
+            raise KeyError(game_id)
+        return index
+
+    def num_turns(self, index):
+        """Number of turns of the game at ``index``."""
+        return self._starts[index + 1] - self._starts[index]
+
+    def game_records(self, index):
+        """Zero-copy view of the turn records of the game at ``index``."""
+        size = self.record.size
+        return self._records[
+            self._starts[index] * size : self._starts[index + 1] * size
+        ]
+
+    def turns(self, index):
+        """Decoded turn records of a game, as ``Turn`` tuples."""
+        num_players = self.num_players
+        for fields in self.record.iter_unpack(self.game_records(index)):
+            yield Turn(fields, num_players)
+
+    def __iter__(self):
+        """Sequential scan of ``(game_id, records view)`` for every game."""
+        for index in range(len(self)):
+            yield self._ids[index], self.game_records(index)
+
+
+class Turn:
+    """One decoded turn record.
+
+    Attributes:
+        round: Round number, starting at 1.
+        turn: Turn number within the round, starting at 0.
+        hands: Kinds held by each seat at the start of the turn.
+        played: Kind played by each seat.
+    """
+
+    __slots__ = ("round", "turn", "hands", "played")
+
+    def __init__(self, fields, num_players):
+        """Decodes the fields of a record."""
+        self.round = fields[0]
+        self.turn = fields[1]
+        self.hands = [
+            [kind for kind in fields[2 + 2 * seat] if kind != NO_CARD]
+            for seat in range(num_players)
+        ]
+        self.played = [fields[3 + 2 * seat] for seat in range(num_players)]
+
+
+def _round_scores(tallies, rules):
+    """Scores of a finished round, round bonuses included."""
+    return tuple(rules.score_round([tally.counts for tally in tallies]))
+
+
+def replay_game(store, index, turn, rules=DEFAULT_RULES):
+    """Rebuilds a game of a replay file just before one of its turns.
+
+    Args:
+        store: ``ReplayStore`` to read from.
+        index: Position of the game in the store.
+        turn: Turn of the game, counted from 0 over all rounds; the
+            number of turns gives the game after its last card, with the
+            table of the last round still in place.
+        rules: ``rules.Rules`` the game was played with; a replay file
+            does not record them.
+
+    Returns:
+        A two-player ``Game`` with the hands, table and ``round_scores``
+        of that moment, and a deck stacked with the cards of the rounds
+        still to be dealt.
+
+    Raises:
+        ValueError: If the store does not hold two-player games.
+        IndexError: If the turn is not in the game.
+    """
+    if store.num_players != 2:
+        raise ValueError("Only two-player games can be rebuilt.")
+    turns = list(store.turns(index))
+    if not 0 <= turn <= len(turns):
+        raise IndexError(f"Turn {turn} is not in a {len(turns)}-turn game")
+    rounds = turns[-1].round if turns else 0
+    current = turns[turn].round if turn < len(turns) else rounds
+
+    deck = Deck()
+    deck.cards = [
+        CARDS[kind]
+        for record in turns[turn:]
+        if record.turn == 0 and record.round > current
+        for hand in record.hands
+        for kind in hand
+    ]
+    game = Game(
+        "Player 1", "Player 2", rounds, deck, sink=NullSink(), rules=rules
+    )
+    players = (game.player1, game.player2)
+    table = RandomTable([], *players, rules=rules)
+
+    # Score the rounds finished before the turn
+    tallies = None
+    last_round = None
+    for record in turns[:turn]:
+        if record.round != last_round:
+            if tallies is not None:
+                game.round_scores.append(_round_scores(tallies, rules))
+            tallies = [TableTally(rules=rules), TableTally(rules=rules)]
+            last_round = record.round
+        for seat, kind in enumerate(record.played):
+            tallies[seat].add(kind)
+            if record.round == current:
+                table.add_card(seat, CARDS[kind])
+    if tallies is not None and (last_round != current or turn == len(turns)):
+        game.round_scores.append(_round_scores(tallies, rules))
+
+    hands = turns[turn].hands if turn < len(turns) else [[], []]
+    for player, hand in zip(players, hands, strict=True):
+        player.hand = [CARDS[kind] for kind in hand]
+    game.table = table
+    return game
@@ -0,0 +1,508 @@
+"""Self-play training of a learned value strategy.
+
+A drafting decision is scored by the value of its afterstate: the state
+right after the card is played and before hands are switched. Its
+features are fixed-length count vectors (see ``afterstate_features``):
+the player's table with the card on it, the opponent's table, the hand
+passed on, both table scores and the turns left. A value function fits
+the final margin of the round, the player's round score minus the
+opponent's, and ``ValueStrategy`` plays the card whose afterstate has
+the best value.
+
+``SelfPlayTrainer`` plays batches of headless games on
+``batch_sim.BatchGame``, both seats choosing with the current value
+function plus epsilon-greedy exploration. Seat 1 plays before seat 2,
+who sees the card seat 1 played, as in ``Game``. The afterstates of a
+round are kept as arrays and, once the round is scored, written to a
+preallocated ``ReplayBuffer`` in one copy; minibatches drawn from it fit
+a ``LinearValue`` or a one-hidden-layer ``MLPValue``, both plain NumPy
+on the CPU.
+
+Checkpoints are ``.npz`` files; ``get_strategy("learned", path=...)``
+plays with one::
+
+    python src/rl_trainer.py --batches 200 --out learned.npz --evaluate 2000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from batch_sim import (
+    HAND_SIZE,
+    NUM_PLAYERS,
+    BatchGame,
+    score_rounds,
+    score_tables,
+)
+from cards import DEFAULT_RULES, NUM_KINDS
+from strategies import MAX_SCORING, Strategy, seat_of
+
+NUM_FEATURES = 3 * NUM_KINDS + 3
+SCORE_SCALE = 10.0  # table scores are divided by this in the features
+
+DEFAULT_CAPACITY = 1_000_000
+DEFAULT_BATCH_GAMES = 512
+DEFAULT_EPSILON = 0.1
+DEFAULT_MINIBATCH = 512
+DEFAULT_UPDATES = 16
+
+_EYE = np.eye(NUM_KINDS, dtype=np.int64)
+
+
+def afterstate_features(own, opponent, hand, turns_left, rules=DEFAULT_RULES):
+    """Features of playing each kind of card.
+
+    Args:
+        own: The player's table counts, shape (..., NUM_KINDS).
+        opponent: The opponent's table counts, same shape.
+        hand: The player's hand counts, same shape.
+        turns_left: Turns of the round after this one, a scalar or an
+            array of shape (...).
+        rules: ``rules.Rules`` the tables are scored with.
+
+    Returns:
+        A float32 array of shape (..., NUM_KINDS, NUM_FEATURES); row
+        ``kind`` describes the afterstate of playing ``kind``. Rows of
+        kinds not in the hand are meaningless.
+    """
+    own = np.asarray(own, dtype=np.int64)
+    opponent = np.asarray(opponent, dtype=np.int64)
+    hand = np.asarray(hand, dtype=np.int64)
+    played = own[..., None, :] + _EYE
+    features = np.empty(
+        own.shape[:-1] + (NUM_KINDS, NUM_FEATURES), dtype=np.float32
+    )
+    features[..., :NUM_KINDS] = played
+    features[..., NUM_KINDS : 2 * NUM_KINDS] = opponent[..., None, :]
+    features[..., 2 * NUM_KINDS : 3 * NUM_KINDS] = hand[..., None, :] - _EYE
+    features[..., 3 * NUM_KINDS] = score_tables(played, rules) / SCORE_SCALE
+    features[..., 3 * NUM_KINDS + 1] = (
+        score_tables(opponent, rules)[..., None] / SCORE_SCALE
+    )
+    features[..., 3 * NUM_KINDS + 2] = np.asarray(turns_left)[..., None]
+    return features
+
+
+class ReplayBuffer:
+    """Ring buffer of (features, target) transitions in NumPy arrays.
+
+    The arrays are allocated once; ``add`` copies a whole batch of
+    transitions into them, overwriting the oldest once full.
+
+    Attributes:
+        features: Features of each slot, shape (capacity, num_features).
+        targets: Target of each slot, shape (capacity,).
+    """
+
+    def __init__(self, capacity, num_features=NUM_FEATURES):
+        """Allocates an empty buffer."""
+        if capacity <= 0:
+            raise ValueError("The capacity must be positive.")
+        self.features = np.zeros((capacity, num_features), dtype=np.float32)
+        self.targets = np.zeros(capacity, dtype=np.float32)
+        self._size = 0
+        self._next = 0
+
+    @property
+    def capacity(self):
+        """Number of transitions the buffer holds at most."""
+        return len(self.targets)
+
+    def __len__(self):
+        """Number of transitions held."""
+        return self._size
+
+    def add(self, features, targets):
+        """Adds transitions, shape (n, num_features) and (n,)."""
+        features = np.asarray(features)
+        targets = np.asarray(targets)
+        capacity = self.capacity
+        if len(targets) > capacity:
+            # Only the newest transitions would survive
+            features = features[-capacity:]
+            targets = targets[-capacity:]
+        count = len(targets)
+        start = self._next
+        head = min(count, capacity - start)
+        self.features[start : start + head] = features[:head]
+        self.targets[start : start + head] = targets[:head]
+        self.features[: count - head] = features[head:]
+        self.targets[: count - head] = targets[head:]
+        self._next = (start + count) % capacity
+        self._size = min(self._size + count, capacity)
+
+    def sample(self, size, generator):
+        """Features and targets of ``size`` transitions drawn uniformly.
+
+        Raises:
+            ValueError: If the buffer is empty.
+        """
+        if not self._size:
+            raise ValueError("The replay buffer is empty.")
+        index = generator.integers(0, self._size, size)
+        return self.features[index], self.targets[index]
+
+
+class _Adam:
+    """Adam updates of a list of parameter arrays, in place."""
+
+    def __init__(self, params, learning_rate):
+        self.params = params
+        self.learning_rate = learning_rate
+        self.moments = [np.zeros_like(param) for param in params]
+        self.squares = [np.zeros_like(param) for param in params]
+        self.steps = 0
+
+    def step(self, grads, beta1=0.9, beta2=0.999, eps=1e-8):
+        self.steps += 1
+        scale = self.learning_rate * np.sqrt(1 - beta2**self.steps)
+        scale /= 1 - beta1**self.steps
+        for param, grad, moment, square in zip(
+            self.params, grads, self.moments, self.squares, strict=True
+        ):
+            moment *= beta1
+            moment += (1 - beta1) * grad
+            square *= beta2
+            square += (1 - beta2) * grad * grad
+            param -= scale * moment / (np.sqrt(square) + eps)
+
+
+class LinearValue:
+    """Value linear in the features, fitted by Adam on squared error."""
+
+    model = "linear"
+
+    def __init__(self, num_features=NUM_FEATURES, learning_rate=1e-2):
+        """Initializes zero weights."""
+        self.weights = np.zeros(num_features, dtype=np.float32)
+        self.bias = np.zeros(1, dtype=np.float32)
+        self._optimizer = _Adam([self.weights, self.bias], learning_rate)
+
+    def predict(self, features):
+        """Values of features of shape (..., num_features)."""
+        return features @ self.weights + self.bias[0]
+
+    def fit(self, features, targets):
+        """One update on a minibatch; returns its mean squared error."""
+        errors = self.predict(features) - targets
+        grad = 2 * errors / len(errors)
+        self._optimizer.step([features.T @ grad, np.array([grad.sum()])])
+        return float(np.mean(errors * errors))
+
+    def arrays(self):
+        """Parameters to save, by name."""
+        return {"weights": self.weights, "bias": self.bias}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Value with saved parameters."""
+        value = cls(len(arrays["weights"]))
+        value.weights[:] = arrays["weights"]
+        value.bias[:] = arrays["bias"]
+        return value
+
+
+class MLPValue:
+    """Value of a one-hidden-layer ReLU network, fitted by Adam."""
+
+    model = "mlp"
+
+    def __init__(
+        self,
+        num_features=NUM_FEATURES,
+        hidden=64,
+        learning_rate=1e-3,
+        generator=None,
+    ):
+        """Initializes He-scaled random weights."""
+        if generator is None:
+            generator = np.random.default_rng(0)
+        scale = np.sqrt(2 / num_features)
+        self.w1 = (
+            generator.standard_normal((num_features, hidden)) * scale
+        ).astype(np.float32)
+        self.b1 = np.zeros(hidden, dtype=np.float32)
+        self.w2 = np.zeros(hidden, dtype=np.float32)
+        self.b2 = np.zeros(1, dtype=np.float32)
+        self._optimizer = _Adam(
+            [self.w1, self.b1, self.w2, self.b2], learning_rate
+        )
+
+    def predict(self, features):
+        """Values of features of shape (..., num_features)."""
+        hidden = np.maximum(features @ self.w1 + self.b1, 0)
+        return hidden @ self.w2 + self.b2[0]
+
+    def fit(self, features, targets):
+        """One update on a minibatch; returns its mean squared error."""
+        hidden = np.maximum(features @ self.w1 + self.b1, 0)
+        errors = hidden @ self.w2 + self.b2[0] - targets
+        grad = 2 * errors / len(errors)
+        grad_hidden = np.outer(grad, self.w2) * (hidden > 0)
+        self._optimizer.step(
+            [
+                features.T @ grad_hidden,
+                grad_hidden.sum(axis=0),
+                hidden.T @ grad,
+                np.array([grad.sum()]),
+            ]
+        )
+        return float(np.mean(errors * errors))
+
+    def arrays(self):
+        """Parameters to save, by name."""
+        return {"w1": self.w1, "b1": self.b1, "w2": self.w2, "b2": self.b2}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Value with saved parameters."""
+        num_features, hidden = arrays["w1"].shape
+        value = cls(num_features, hidden)
+        for name, array in value.arrays().items():
+            array[:] = arrays[name]
+        return value
+
+
+MODELS = {model.model: model for model in (LinearValue, MLPValue)}
+
+
+def save_checkpoint(path, value):
+    """Saves a value function to an ``.npz`` file."""
+    np.savez(path, model=np.array(value.model), **value.arrays())
+
+
+def load_checkpoint(path):
+    """Loads a value function saved by ``save_checkpoint``.
+
+    Raises:
+        ValueError: If the file holds an unknown model.
+    """
+    with np.load(path) as data:
+        model = str(data["model"])
+        if model not in MODELS:
+            raise ValueError(f"Unknown model: {model}")
+        return MODELS[model].from_arrays(
+            {name: data[name] for name in data.files if name != "model"}
+        )
+
+
+class ValueStrategy(Strategy):
+    """Plays the card whose afterstate has the best learned value.
+
+    Ties go to the first card in hand order. The strategy keeps no
+    state, so one instance can be shared by every player.
+
+    Attributes:
+        value: Value function with ``predict``, such as ``MLPValue``.
+    """
+
+    name = "learned"
+
+    def __init__(self, value):
+        """Initializes the strategy."""
+        self.value = value
+
+    def choose(self, hand, table, first=False, cache=None):
+        """Chooses the card with the best afterstate value."""
+        if not hand:
+            return None
+        if table is None:
+            return MAX_SCORING.choose(hand, table, first)
+        seat = seat_of(hand, table)
+        tallies = table.tallies
+        hand_counts = [0] * NUM_KINDS
+        for card in hand:
+            hand_counts[card.kind] += 1
+        features = afterstate_features(
+            tallies[seat].counts,
+            tallies[(seat + 1) % len(tallies)].counts,
+            hand_counts,
+            len(hand) - 1,
+            tallies[seat].rules,
+        )
+        values = self.value.predict(features).tolist()
+        best_card = None
+        best_value = None
+        for card in hand:
+            value = values[card.kind]
+            if best_value is None or value > best_value:
+                best_card = card
+                best_value = value
+        return best_card
+
+
+class SelfPlayTrainer:
+    """Fits a value function to games it plays against itself.
+
+    Attributes:
+        value: The value function trained.
+        buffer: ``ReplayBuffer`` of the afterstates played.
+        transitions: Afterstates played so far.
+        rules: ``rules.Rules`` the games are played and scored with.
+    """
+
+    def __init__(
+        self,
+        value,
+        capacity=DEFAULT_CAPACITY,
+        batch_games=DEFAULT_BATCH_GAMES,
+        rounds=3,
+        epsilon=DEFAULT_EPSILON,
+        minibatch=DEFAULT_MINIBATCH,
+        updates=DEFAULT_UPDATES,
+        seed=0,
+        rules=DEFAULT_RULES,
+    ):
+        """Initializes the trainer.
+
+        Args:
+            value: Value function with ``predict`` and ``fit``.
+            capacity: Transitions the replay buffer holds.
+            batch_games: Games played in lock-step per batch.
+            rounds: Rounds of each game.
+            epsilon: Probability of a random card at each decision.
+            minibatch: Transitions per update.
+            updates: Updates after each batch of games.
+            seed: Seed of the games, exploration and sampling.
+            rules: ``rules.Rules`` the games are played and scored with.
+        """
+        self.value = value
+        self.buffer = ReplayBuffer(capacity)
+        self.batch_games = batch_games
+        self.rounds = rounds
+        self.epsilon = epsilon
+        self.minibatch = minibatch
+        self.updates = updates
+        self.rules = rules
+        self.generator = np.random.default_rng(seed)
+        self.transitions = 0
+        self._rows = np.arange(batch_games)
+        self._afterstates = np.empty(
+            (HAND_SIZE, NUM_PLAYERS, batch_games, NUM_FEATURES),
+            dtype=np.float32,
+        )
+
+    def _values(self, features):
+        """Learned values, replaced by noise for exploring decisions."""
+        values = self.value.predict(features)
+        explore = self.generator.random(len(values)) < self.epsilon
+        if explore.any():
+            values[explore] = self.generator.random(
+                (int(explore.sum()), NUM_KINDS)
+            )
+        return values
+
+    def play_batch(self):
+        """Plays a batch of games and stores their afterstates.
+
+        Returns:
+            The round scores of the games, shape (batch_games, rounds, 2).
+        """
+        game = BatchGame.from_generator(
+            self.batch_games, self.rounds, self.generator, rules=self.rules
+        )
+        afterstates = self._afterstates
+        rows = self._rows
+        for round_index in range(self.rounds):
+            for player in range(NUM_PLAYERS):
+                game.hands[:, player] = game.deal(HAND_SIZE)
+            for turn in range(HAND_SIZE):
+                for seat in range(NUM_PLAYERS):
+                    features = afterstate_features(
+                        game.tables[:, seat],
+                        game.tables[:, 1 - seat],
+                        game.hand_counts()[:, seat],
+                        HAND_SIZE - 1 - turn,
+                        self.rules,
+                    )
+                    kinds = game.play(self._values(features), seat)
+                    afterstates[turn, seat] = features[rows, kinds[:, 0]]
+                game.switch_hands()
+            scores = score_rounds(game.tables, self.rules)
+            game.round_scores[:, round_index] = scores
+            game.tables[:] = 0
+            margins = (scores - scores[:, ::-1]).T.astype(np.float32)
+            self.buffer.add(
+                afterstates.reshape(-1, NUM_FEATURES),
+                np.broadcast_to(margins, afterstates.shape[:3]).ravel(),
+            )
+            self.transitions += afterstates[..., 0].size
+        return game.round_scores
+
+    def train(self, batches, callback=None):
+        """Plays ``batches`` batches, fitting the value after each.
+
+        Args:
+            batches: Number of batches of games.
+            callback: Called as ``callback(batch, loss)`` after each
+                batch with the mean loss of its updates.
+
+        Returns:
+            The mean loss of each batch.
+        """
+        losses = []
+        for batch in range(batches):
+            self.play_batch()
+            loss = 0.0
+            for _ in range(self.updates):
+                loss += self.value.fit(
+                    *self.buffer.sample(self.minibatch, self.generator)
+                )
+            losses.append(loss / max(self.updates, 1))
+            if callback is not None:
+                callback(batch, losses[-1])
+        return losses
+
+
+def main(argv=None):
+    """Trains a value strategy from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--model", choices=sorted(MODELS), default="mlp")
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--batch-games", type=int, default=DEFAULT_BATCH_GAMES)
+    parser.add_argument("--epsilon", type=float, default=DEFAULT_EPSILON)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="learned.npz")
+    parser.add_argument(
+        "--evaluate",
+        type=int,
+        default=0,
+        metavar="DEALS",
+        help="compare against the default strategy afterwards",
+    )
+    args = parser.parse_args(argv)
+
+    trainer = SelfPlayTrainer(
+        MODELS[args.model](),
+        batch_games=args.batch_games,
+        epsilon=args.epsilon,
+        seed=args.seed,
+    )
+    start = time.perf_counter()
+
+    def report(batch, loss):
+        if (batch + 1) % 20 == 0:
+            print(f"batch {batch + 1}: loss {loss:.2f}")
+
+    trainer.train(args.batches, report)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{trainer.transitions} transitions in {elapsed:.1f} s "
+        f"({trainer.transitions / elapsed * 3600:,.0f} per hour)"
+    )
+    save_checkpoint(args.out, trainer.value)
+    print(f"Saved {args.out}")
+    if args.evaluate:
+        from strategy_compare import compare_strategies
+
+        print(
+            compare_strategies(
+                ValueStrategy(trainer.value), "default", args.evaluate
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""Scoring rules declared per card kind and compiled to lookup tables.
+
+Each card kind declares how it scores with one of the rule classes
+below: ``Maki`` icons, ``Nigiri`` that wasabi boosts, ``Sets`` such as a
+tempura pair, a ``Curve`` such as dumplings, and ``Wasabi`` itself.
+``Rules`` compiles one declaration per kind into tuples indexed by card
+count: the points of every count of a kind, the gain of one more card
+and the maximizer's value of a card. Scoring a table is then one lookup
+per kind present, plus the wasabi bonus and, when the variant has maki
+majority, a bonus per round.
+
+The declarations of the game live in ``cards.KIND_RULES`` and
+``cards.DEFAULT_RULES`` is their compiled form; a variant is another
+``Rules``, for example ``DEFAULT_RULES.variant(maki_majority=(6, 3))``,
+passed to ``Game``, ``RandomTable`` or ``TableTally``.
+"""
+
+# Roles of the kinds in the wasabi bonus
+PLAIN = 0
+NIGIRI = 1
+WASABI = 2
+
+
+class KindRule:
+    """How one card kind scores.
+
+    Attributes:
+        face: Points printed on the card, the value strategies rank a
+            card by when they ignore the table.
+    """
+
+    face = 0
+    role = PLAIN
+
+    def points(self, count):
+        """Points of ``count`` cards of the kind on a table."""
+        return 0
+
+    def best_score(self, count):
+        """Maximizer value of a card against ``count`` on the table."""
+        return self.face
+
+    def possible_scores(self, count):
+        """Maximizer values of a card against ``count`` on the table."""
+        return [self.face]
+
+    def __repr__(self) -> str:
+        """Generate a string view of this object."""
+        fields = ", ".join(repr(value) for value in vars(self).values())
+        return f"{type(self).__name__}({fields})"
+
+
+class Flat(KindRule):
+    """Every card scores ``value``."""
+
+    def __init__(self, value):
+        """Initializes the rule."""
+        self.face = value
+
+    def points(self, count):
+        """Points of ``count`` cards of the kind on a table."""
+        return self.face * count
+
+
+class Maki(Flat):
+    """Maki rolls with ``value`` icons, scored per icon.
+
+    Without maki majority every icon is a point; with it the icons only
+    count towards the round's majority bonus.
+    """
+
+
+class Nigiri(Flat):
+    """Nigiri worth ``value``; wasabi adds to the best one on a table."""
+
+    role = NIGIRI
+
+
+class Sets(KindRule):
+    """Every complete set of ``size`` cards scores ``value``."""
+
+    def __init__(self, size, value):
+        """Initializes the rule."""
+        self.size = size
+        self.face = value
+
+    def points(self, count):
+        """Points of ``count`` cards of the kind on a table."""
+        return count // self.size * self.face
+
+    def possible_scores(self, count):
+        """The face value, and the set's value if one more completes it."""
+        return [self.face, self.face if count >= self.size - 1 else 0]
+
+
+class Curve(KindRule):
+    """Points by the number of cards; the last value holds for more."""
+
+    def __init__(self, values):
+        """Initializes the rule; ``values[n]`` is the points of n cards."""
+        self.values = tuple(values)
+        self.face = self.values[1]
+
+    def points(self, count):
+        """Points of ``count`` cards of the kind on a table."""
+        if count <= 0:
+            return 0
+        return self.values[min(count, len(self.values) - 1)]
+
+    def best_score(self, count):
+        """The face value or the curve's points, whichever is higher."""
+        return max(self.face, self.points(count))
+
+    def possible_scores(self, count):
+        """The face value and the curve's points at ``count``."""
+        return [self.face, self.points(count)]
+
+
+class Wasabi(KindRule):
+    """Adds ``extra`` times the best nigiri on the table, once.
+
+    Any number of wasabi on a table give the bonus once, and the order
+    the cards were played in does not matter.
+    """
+
+    role = WASABI
+
+    def __init__(self, extra):
+        """Initializes the rule."""
+        self.extra = extra
+
+
+class Rules:
+    """Compiled scoring rules of a variant.
+
+    Attributes:
+        kinds: The rule of each kind, indexed by kind.
+        maki_majority: Points for the most and the second most maki
+            icons in a round, or None to score every icon as a point.
+        max_count: Largest count of one kind the tables cover.
+        faces: Face value of each kind.
+        points: ``points[kind][count]``, the points of ``count`` cards.
+        gains: ``gains[kind][count]``, the points one more card adds to
+            ``count`` cards, wasabi bonus aside.
+        best_scores: ``best_scores[kind][count]``, the maximizer value
+            of a kind other than nigiri and wasabi.
+        roles: ``NIGIRI``, ``WASABI`` or ``PLAIN`` for each kind.
+        nigiri_kinds: Nigiri kinds, the most valuable first.
+        wasabi_kinds: Wasabi kinds.
+        wasabi_extra: Multiple of the best nigiri that wasabi adds.
+        wasabi_bonus: ``wasabi_bonus[top]``, the bonus with ``top`` the
+            value of the best nigiri.
+        icons: Maki icons of each kind.
+        counted: Kinds whose points depend on how many there are, such
+            as sets and curves.
+    """
+
+    def __init__(self, kinds, maki_majority=None, max_count=94):
+        """Compiles the rules of every kind.
+
+        Raises:
+            ValueError: If wasabi kinds disagree on their bonus.
+        """
+        self.kinds = tuple(kinds)
+        self.maki_majority = maki_majority
+        self.max_count = max_count
+        counts = range(max_count + 1)
+        self.icons = tuple(
+            rule.face if isinstance(rule, Maki) else 0 for rule in self.kinds
+        )
+        self.points = tuple(
+            tuple(
+                0
+                if maki_majority is not None and self.icons[kind]
+                else rule.points(count)
+                for count in counts
+            )
+            for kind, rule in enumerate(self.kinds)
+        )
+        self.gains = tuple(
+            tuple(points[count + 1] - points[count] for count in counts[:-1])
+            for points in self.points
+        )
+        self.faces = tuple(rule.face for rule in self.kinds)
+        self.best_scores = tuple(
+            tuple(rule.best_score(count) for count in counts)
+            for rule in self.kinds
+        )
+        self.roles = tuple(rule.role for rule in self.kinds)
+        self.nigiri_kinds = tuple(
+            sorted(
+                (
+                    kind
+                    for kind, role in enumerate(self.roles)
+                    if role == NIGIRI
+                ),
+                key=lambda kind: -self.faces[kind],
+            )
+        )
+        self.wasabi_kinds = tuple(
+            kind for kind, role in enumerate(self.roles) if role == WASABI
+        )
+        extras = {self.kinds[kind].extra for kind in self.wasabi_kinds}
+        if len(extras) > 1:
+            raise ValueError("Wasabi kinds must add the same bonus.")
+        self.wasabi_extra = extras.pop() if extras else 0
+        top = max((self.faces[kind] for kind in self.nigiri_kinds), default=0)
+        self.wasabi_bonus = tuple(
+            self.wasabi_extra * value for value in range(top + 1)
+        )
+        self.counted = tuple(
+            kind
+            for kind, rule in enumerate(self.kinds)
+            if isinstance(rule, Sets | Curve)
+        )
+
+    def __repr__(self) -> str:
+        """Generate a string view of this object."""
+        return f"Rules({list(self.kinds)}, maki_majority={self.maki_majority})"
+
+    def variant(self, kinds=None, maki_majority=None):
+        """Rules with some declarations replaced.
+
+        Args:
+            kinds: Mapping of kind to its new rule.
+            maki_majority: New maki majority points; by default the
+                current ones.
+        """
+        rules = list(self.kinds)
+        for kind, rule in (kinds or {}).items():
+            rules[kind] = rule
+        if maki_majority is None:
+            maki_majority = self.maki_majority
+        return Rules(rules, maki_majority, self.max_count)
+
+    def top_nigiri(self, counts):
+        """Value of the best nigiri in a count vector, 0 if none."""
+        for kind in self.nigiri_kinds:
+            if counts[kind]:
+                return self.faces[kind]
+        return 0
+
+    def has_wasabi(self, counts):
+        """Whether a count vector holds wasabi."""
+        return any(counts[kind] for kind in self.wasabi_kinds)
+
+    def score(self, counts):
+        """Score of a table given as a count vector indexed by kind.
+
+        Maki majority is a bonus of the round; see ``score_round``.
+        """
+        points = self.points
+        total = 0
+        for kind, count in enumerate(counts):
+            if count:
+                total += points[kind][count]
+        if self.has_wasabi(counts):
+            total += self.wasabi_bonus[self.top_nigiri(counts)]
+        return total
+
+    def kind_points(self, counts):
+        """Points each kind contributes to ``score(counts)``.
+
+        The wasabi bonus is credited to the first wasabi kind.
+        """
+        points = [
+            self.points[kind][count] if count else 0
+            for kind, count in enumerate(counts)
+        ]
+        if self.has_wasabi(counts):
+            points[self.wasabi_kinds[0]] += self.wasabi_bonus[
+                self.top_nigiri(counts)
+            ]
+        return points
+
+    def gain(self, kind, count, top_nigiri, has_wasabi):
+        """Points one card of ``kind`` adds to a table.
+
+        Args:
+            kind: Kind of the card.
+            count: Cards of that kind already on the table.
+            top_nigiri: Value of the best nigiri on the table.
+            has_wasabi: Whether the table holds wasabi.
+        """
+        gain = self.gains[kind][count]
+        role = self.roles[kind]
+        if role == NIGIRI:
+            value = self.faces[kind]
+            if has_wasabi and value > top_nigiri:
+                bonus = self.wasabi_bonus
+                gain += bonus[value] - bonus[top_nigiri]
+        elif role == WASABI and not has_wasabi:
+            gain += self.wasabi_bonus[top_nigiri]
+        return gain
+
+    def best_score(self, kind, count, top_nigiri, has_wasabi):
+        """Maximizer value of a card of ``kind`` against a table.
+
+        A nigiri is worth its face times the wasabi multiple on a table
+        with wasabi, and wasabi that multiple of the best nigiri.
+        """
+        role = self.roles[kind]
+        if role == NIGIRI:
+            face = self.faces[kind]
+            return face * self.wasabi_extra if has_wasabi else face
+        if role == WASABI:
+            return self.wasabi_extra * top_nigiri
+        return self.best_scores[kind][count]
+
+    def possible_scores(self, kind, count, top_nigiri, has_wasabi):
+        """Maximizer values of a card of ``kind`` against a table."""
+        role = self.roles[kind]
+        face = self.faces[kind]
+        if role == NIGIRI:
+            if has_wasabi:
+                return [face, face * self.wasabi_extra]
+            return [face]
+        if role == WASABI:
+            if top_nigiri:
+                return [face, self.wasabi_extra * top_nigiri]
+            return [face]
+        return self.kinds[kind].possible_scores(count)
+
+    def round_bonuses(self, tables):
+        """Maki majority points of each table of a round.
+
+        The tables with the most icons share the first prize, rounded
+        down; when one table has the most alone, the tables with the
+        second most share the second prize. Tables without maki score
+        nothing.
+
+        Args:
+            tables: Count vector of each seat's table.
+        """
+        bonuses = [0] * len(tables)
+        if self.maki_majority is None:
+            return bonuses
+        icons = [
+            sum(self.icons[kind] * count for kind, count in enumerate(counts))
+            for counts in tables
+        ]
+        remaining = sorted({count for count in icons if count}, reverse=True)
+        for prize in self.maki_majority:
+            if not remaining:
+                break
+            winners = [
+                seat
+                for seat, count in enumerate(icons)
+                if count == remaining[0]
+            ]
+            for seat in winners:
+                bonuses[seat] += prize // len(winners)
+            if len(winners) > 1:
+                break
+            remaining.pop(0)
+        return bonuses
+
+    def round_kind_points(self, tables):
+        """Points each kind contributes to ``score_round(tables)``.
+
+        The maki majority bonus of a table is credited to the first maki
+        kind on it, as the wasabi bonus is to the first wasabi kind.
+
+        Args:
+            tables: Count vector of each seat's table.
+
+        Returns:
+            ``points[seat][kind]`` for every seat.
+        """
+        points = [self.kind_points(counts) for counts in tables]
+        bonuses = self.round_bonuses(tables)
+        for seat, bonus in enumerate(bonuses):
+            if bonus:
+                counts = tables[seat]
+                kind = next(
+                    kind
+                    for kind, icons in enumerate(self.icons)
+                    if icons and counts[kind]
+                )
+                points[seat][kind] += bonus
+        return points
+
+    def score_round(self, tables):
+        """Score of each table of a round, round bonuses included."""
+        return [
+            self.score(counts) + bonus
+            for counts, bonus in zip(
+                tables, self.round_bonuses(tables), strict=True
+            )
+        ]
@@ -2,6 +2,13 @@
 
 from random import shuffle
 
+from cards import (
+    BASE_SCORES,
+    DEFAULT_RULES,
+    KIND_BY_NAME,
+    NUM_KINDS,
+    dumpling_points,
+)
 
 # CARDS
 TEMPURA = "Tempura"
@@ -27,44 +34,33 @@ class Card:
         """Generate a string view of this object."""
         return self.card_type
 
+    @property
+    def kind(self):
+        """``cards.CardKind`` of the card."""
+        kind = KIND_BY_NAME.get(self.card_type)
+        if kind is None:
+            raise ValueError(f"Invalid card type: {self.card_type}")
+        return kind
+
     def score(self):
         """Assigns base scores to the cards."""
-        if self.card_type in MAKI_ROLLS:
-            return MAKI_ROLLS.index(self.card_type) + 1
-        elif self.card_type == TEMPURA:
-            return 5
-        elif self.card_type == SASHIMI:
-            return 10
-        elif self.card_type == DUMPLING:
-            return 1
-        elif self.card_type == NIGIRI_SQUID:
-            return 3
-        elif self.card_type == NIGIRI_SALMON:
-            return 2
-        elif self.card_type == NIGIRI_EGG:
-            return 1
-        elif self.card_type == WASABI:
-            return 0
-        else:
-            raise ValueError(f"Invalid card type: {self.card_type}")
+        return BASE_SCORES[self.kind]
 
     def dumpling_score(self, count):
         """Calculate the score for Dumpling based on the number of cards played."""
         if self.card_type == DUMPLING:
-            if count == 1:
-                return 1
-            elif count == 2:
-                return 3
-            elif count == 3:
-                return 6
-            elif count == 4:
-                return 10
-            elif count >= 5:
-                return 15
-        
+            return dumpling_points(count)
         return 0
 
 
+def count_kinds(cards):
+    """Count vector of cards, indexed by ``cards.CardKind``."""
+    counts = [0] * NUM_KINDS
+    for card in cards:
+        counts[card.kind] += 1
+    return counts
+
+
 class Deck:
     """A deck of Sushi Go cards."""
 
@@ -117,57 +113,7 @@ class Player:
 
     def calculate_final_score(self, table, best_card):
         """Calculates the final score of the player's table"""
-        table_cards = table.cards_on_table
-        maki_score = 0
-        nigiri_score = 0
-        tempura_pairs = 0
-        sashimi_count = 0
-        dumpling_count = 0
-
-        has_wasabi = False
-        highest_nigiri_score = 0
-
-        for card in table_cards + [best_card]:
-            if (
-                card.card_type == "Maki 1"
-                or card.card_type == "Maki 2"
-                or card.card_type == "Maki 3"
-            ):
-                maki_score += card.score()
-            elif (
-                card.card_type == NIGIRI_SQUID
-                or card.card_type == NIGIRI_SALMON
-                or card.card_type == NIGIRI_EGG
-            ):
-                nigiri_score += card.score()
-                if card.score() > highest_nigiri_score:
-                    highest_nigiri_score = card.score()
-            elif card.card_type == WASABI:
-                has_wasabi = True
-            elif card.card_type == TEMPURA:
-                tempura_pairs += 1
-            elif card.card_type == SASHIMI:
-                sashimi_count += 1
-            elif card.card_type == DUMPLING:
-                dumpling_count += 1
-
-        
-        if has_wasabi:
-            nigiri_score += highest_nigiri_score * 3
-
-        # Calculate score for tempura pairs
-        tempura_score = (tempura_pairs // 2) * 5
-
-        # Calculate score for sashimi sets
-        sashimi_score = (sashimi_count // 3) * 10
-
-        # Calculate score for dumplings
-        dumpling_score = Card(DUMPLING).dumpling_score(dumpling_count)
-
-        total_score = (
-            maki_score + nigiri_score + tempura_score + sashimi_score + dumpling_score
-        )
-        return total_score
+        return DEFAULT_RULES.score(count_kinds(table.cards_on_table + [best_card]))
 
 
 class RandomTable:
@@ -214,56 +160,15 @@ class SushiGoMaximizer:
 
     def calculate_possible_scores(self):
         """Calculate the possible scores for each card in the player's hand in relation to the table cards."""
+        counts = count_kinds(self.table.cards_on_table)
+        top_nigiri = DEFAULT_RULES.top_nigiri(counts)
+        has_wasabi = DEFAULT_RULES.has_wasabi(counts)
         possible_scores = {}
         for card in self.player.hand:
-            if card.card_type in MAKI_ROLLS:
-                possible_scores[card] = [card.score()]
-            elif card.card_type in [NIGIRI_SQUID, NIGIRI_SALMON, NIGIRI_EGG]:
-                if any(
-                    table_card.card_type == WASABI
-                    for table_card in self.table.cards_on_table
-                ):
-                    possible_scores[card] = [card.score() * 3]
-                else:
-                    possible_scores[card] = [card.score()]
-            elif card.card_type == WASABI:
-                possible_scores[card] = [0]
-                for table_card in self.table.cards_on_table:
-                    if table_card.card_type in [
-                        NIGIRI_SQUID,
-                        NIGIRI_SALMON,
-                        NIGIRI_EGG,
-                    ]:
-                        possible_scores[card].append(table_card.score() * 3)
-            elif card.card_type == TEMPURA:
-                if any(
-                    table_card.card_type == TEMPURA
-                    for table_card in self.table.cards_on_table
-                ):
-                    possible_scores[card] = [5]
-                else:
-                    possible_scores[card] = [0]
-            elif card.card_type == SASHIMI:
-                if (
-                    len(
-                        [
-                            table_card
-                            for table_card in self.table.cards_on_table
-                            if table_card.card_type == SASHIMI
-                        ]
-                    )
-                    >= 2
-                ):
-                    possible_scores[card] = [10]
-                else:
-                    possible_scores[card] = [0]
-            elif card.card_type == DUMPLING:
-                count_dumplings_on_table = sum(
-                    1
-                    for table_card in self.table.cards_on_table
-                    if table_card.card_type == DUMPLING
-                )
-                possible_scores[card] = [card.dumpling_score(count_dumplings_on_table)]
+            kind = card.kind
+            possible_scores[card] = DEFAULT_RULES.possible_scores(
+                kind, counts[kind], top_nigiri, has_wasabi
+            )
         return possible_scores
 
     def select_best_card(self):
@@ -0,0 +1,155 @@
+"""Fixed-layout count vectors of game positions, written in place.
+
+A position is encoded from one seat's point of view as ``STATE_SIZE``
+numbers::
+
+    [OWN_HAND]        count of each kind in the player's hand
+    [OWN_TABLE]       count of each kind on the player's table
+    [OPPONENT_TABLE]  count of each kind on the opponent's table
+    [OPPONENT_HAND]   the opponent's hand once it is known, else zeros
+    [ROUND]           index of the round, from 0
+    [TURN]            cards the player has played this round
+
+Each block of counts is ``NUM_KINDS`` long and indexed by
+``cards.CardKind``. In a two-player round the opponent's hand is known
+from the second turn on: it is the hand the player passed, minus the
+card the opponent has played from it.
+
+The encoders never build arrays: they write into a caller-provided
+buffer, a NumPy array, an ``array.array`` or a ``memoryview`` of any
+numeric type, at an offset, so one buffer allocated up front serves
+every position. The table counts are read from the ``TableTally`` of
+each seat, which ``RandomTable`` keeps up to date, rather than from the
+lists of cards. ``encode_positions`` fills one row per position of a
+sequence, and ``encode_batch`` encodes a whole ``batch_sim.BatchGame``
+with NumPy operations writing into slices of the output.
+"""
+
+import numpy as np
+
+from cards import NUM_KINDS
+
+OWN_HAND = 0
+OWN_TABLE = OWN_HAND + NUM_KINDS
+OPPONENT_TABLE = OWN_TABLE + NUM_KINDS
+OPPONENT_HAND = OPPONENT_TABLE + NUM_KINDS
+ROUND = OPPONENT_HAND + NUM_KINDS
+TURN = ROUND + 1
+STATE_SIZE = TURN + 1
+
+_KIND_INDEX = np.arange(NUM_KINDS)
+
+
+def flat_view(out):
+    """One-dimensional ``memoryview`` of a C-contiguous buffer.
+
+    Wrap a buffer once and pass the view to the encoders to skip the
+    wrapping on every position.
+    """
+    view = out if isinstance(out, memoryview) else memoryview(out)
+    if view.ndim != 1:
+        view = view.cast("B").cast(view.format)
+    return view
+
+
+def _write_hand(view, start, hand):
+    """Writes the counts of a list of cards at ``start``."""
+    for index in range(start, start + NUM_KINDS):
+        view[index] = 0
+    for card in hand:
+        view[start + card.kind] += 1
+
+
+def _write_counts(view, start, counts):
+    """Writes a count vector at ``start``."""
+    for kind, count in enumerate(counts):
+        view[start + kind] = count
+
+
+def encode_position(table, seat, round_index, out, offset=0):
+    """Encodes the position of ``seat`` in a ``RandomTable``.
+
+    The hands are those of the table's players, so the position is
+    the one a strategy sees when ``choose`` is called.
+
+    Args:
+        table: ``RandomTable`` of the round.
+        seat: Seat of the player whose view is encoded.
+        round_index: Index of the round, from 0.
+        out: Writable numeric buffer, or a view from ``flat_view``.
+        offset: Index in ``out`` of the first number written.
+
+    Returns:
+        ``offset + STATE_SIZE``, where the next position goes.
+    """
+    view = flat_view(out)
+    players = table.players
+    tallies = table.tallies
+    opponent = (seat + 1) % len(players)
+    own = tallies[seat]
+    turn = own.size
+    _write_hand(view, offset + OWN_HAND, players[seat].hand)
+    _write_counts(view, offset + OWN_TABLE, own.counts)
+    _write_counts(view, offset + OPPONENT_TABLE, tallies[opponent].counts)
+    if turn and len(players) == 2:
+        _write_hand(view, offset + OPPONENT_HAND, players[opponent].hand)
+    else:
+        _write_hand(view, offset + OPPONENT_HAND, ())
+    view[offset + ROUND] = round_index
+    view[offset + TURN] = turn
+    return offset + STATE_SIZE
+
+
+def encode_game(game, seat, out, offset=0):
+    """Encodes the current position of ``seat`` in a ``Game``."""
+    return encode_position(game.table, seat, game.round_index, out, offset)
+
+
+def encode_positions(positions, out):
+    """Encodes positions into consecutive rows of ``out``.
+
+    Args:
+        positions: ``(table, seat, round_index)`` of each position.
+        out: Writable buffer of at least ``len(positions) * STATE_SIZE``
+            numbers, such as a NumPy array of shape (N, STATE_SIZE).
+
+    Returns:
+        The number of positions written.
+    """
+    view = flat_view(out)
+    offset = 0
+    for table, seat, round_index in positions:
+        offset = encode_position(table, seat, round_index, view, offset)
+    return offset // STATE_SIZE
+
+
+def encode_batch(game, seat, round_index, turn, out):
+    """Encodes the position of ``seat`` in every game of a batch.
+
+    Args:
+        game: ``batch_sim.BatchGame`` in the middle of a round.
+        seat: Seat of the player whose view is encoded.
+        round_index: Index of the round being played.
+        turn: Cards each player of the seat has played this round.
+        out: NumPy array of shape (N, STATE_SIZE) written in place.
+
+    Returns:
+        ``out``.
+    """
+    opponent = 1 - seat
+    own_hand = out[:, OWN_HAND : OWN_HAND + NUM_KINDS]
+    own_hand[...] = (game.hands[:, seat, :, None] == _KIND_INDEX).sum(axis=1)
+    out[:, OWN_TABLE : OWN_TABLE + NUM_KINDS] = game.tables[:, seat]
+    out[:, OPPONENT_TABLE : OPPONENT_TABLE + NUM_KINDS] = game.tables[
+        :, opponent
+    ]
+    opponent_hand = out[:, OPPONENT_HAND : OPPONENT_HAND + NUM_KINDS]
+    if turn:
+        opponent_hand[...] = (
+            game.hands[:, opponent, :, None] == _KIND_INDEX
+        ).sum(axis=1)
+    else:
+        opponent_hand[...] = 0
+    out[:, ROUND] = round_index
+    out[:, TURN] = turn
+    return out
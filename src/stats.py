@@ -0,0 +1,304 @@
+"""Streaming statistics of many games.
+
+Every statistic keeps a fixed amount of state however many games it
+sees, and two partial results merge into exactly the result of seeing
+both streams, so chunks played in different processes or batches can be
+combined in any order.
+
+Scores are integers, so ``RunningStats`` keeps the count, sum and sum of
+squares as Python integers. That is as stable as Welford's update (no
+floating-point rounding happens at all) and, unlike it, merges exactly.
+"""
+
+import math
+
+from cards import DEFAULT_RULES, KIND_NAMES, NUM_KINDS
+from events import EventSink, leaders
+
+DEFAULT_SCORE_RANGE = (0, 100)
+DEFAULT_MARGIN_RANGE = (-50, 50)
+DEFAULT_BINS = 50
+
+
+class RunningStats:
+    """Count, mean, variance, minimum and maximum of integer values."""
+
+    def __init__(self):
+        """Initializes empty statistics."""
+        self.count = 0
+        self.total = 0
+        self.total_squares = 0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value):
+        """Adds one value."""
+        self.count += 1
+        self.total += value
+        self.total_squares += value * value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other):
+        """Adds the values seen by ``other``."""
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+        for value in (other.minimum, other.maximum):
+            if value is not None:
+                if self.minimum is None or value < self.minimum:
+                    self.minimum = value
+                if self.maximum is None or value > self.maximum:
+                    self.maximum = value
+        return self
+
+    @property
+    def mean(self):
+        """Mean of the values, or 0.0 without values."""
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self):
+        """Sample variance of the values, or 0.0 with fewer than two."""
+        if self.count < 2:
+            return 0.0
+        # Exact in integers, rounded once by the division
+        spread = self.count * self.total_squares - self.total * self.total
+        return spread / (self.count * (self.count - 1))
+
+    @property
+    def stdev(self):
+        """Sample standard deviation of the values."""
+        return math.sqrt(self.variance)
+
+    def __eq__(self, other):
+        """Compare statistics field by field."""
+        if not isinstance(other, RunningStats):
+            return NotImplemented
+        return vars(self) == vars(other)
+
+
+class Histogram:
+    """Counts of values in fixed-width bins between ``low`` and ``high``.
+
+    Values below ``low`` or at or above ``high`` are counted in
+    ``underflow`` and ``overflow``.
+    """
+
+    def __init__(self, low, high, bins=DEFAULT_BINS):
+        """Initializes empty bins.
+
+        Raises:
+            ValueError: If the range is empty or there are no bins.
+        """
+        if high <= low or bins < 1:
+            raise ValueError("A histogram needs low < high and bins >= 1.")
+        self.low = low
+        self.high = high
+        self.counts = [0] * bins
+        self.underflow = 0
+        self.overflow = 0
+        self._scale = bins / (high - low)
+
+    def add(self, value):
+        """Counts one value."""
+        if value < self.low:
+            self.underflow += 1
+        elif value >= self.high:
+            self.overflow += 1
+        else:
+            self.counts[int((value - self.low) * self._scale)] += 1
+
+    def merge(self, other):
+        """Adds the counts of a histogram with the same bins.
+
+        Raises:
+            ValueError: If the bins differ.
+        """
+        if (other.low, other.high, len(other.counts)) != (
+            self.low,
+            self.high,
+            len(self.counts),
+        ):
+            raise ValueError("Only histograms with the same bins merge.")
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def edges(self):
+        """Lower edge of every bin, then the upper edge of the last."""
+        width = (self.high - self.low) / len(self.counts)
+        return [self.low + i * width for i in range(len(self.counts) + 1)]
+
+    def __eq__(self, other):
+        """Compare histograms field by field."""
+        if not isinstance(other, Histogram):
+            return NotImplemented
+        return vars(self) == vars(other)
+
+
+class ResultsAggregator:
+    """Win counts, score statistics and card contributions of games.
+
+    Attributes:
+        num_players: Seats in every game.
+        games: Games added.
+        wins: Games each seat won outright.
+        losses: Games each seat did not share the top score in.
+        ties: Games whose top score was shared.
+        scores: ``RunningStats`` of each seat's game total.
+        round_scores: ``RunningStats`` of each seat's round score.
+        margins: ``RunningStats`` of seat 1's total minus seat 2's.
+        score_histograms: ``Histogram`` of each seat's game total.
+        margin_histogram: ``Histogram`` of the margins.
+        kind_points: Points each card kind scored for each seat, as
+            ``kind_points[seat][kind]``, round bonuses included.
+        rules: ``rules.Rules`` the games are scored with.
+    """
+
+    def __init__(
+        self,
+        num_players=2,
+        score_range=DEFAULT_SCORE_RANGE,
+        margin_range=DEFAULT_MARGIN_RANGE,
+        bins=DEFAULT_BINS,
+        rules=DEFAULT_RULES,
+    ):
+        """Initializes empty results."""
+        self.num_players = num_players
+        self.rules = rules
+        self.games = 0
+        self.wins = [0] * num_players
+        self.losses = [0] * num_players
+        self.ties = 0
+        self.scores = [RunningStats() for _ in range(num_players)]
+        self.round_scores = [RunningStats() for _ in range(num_players)]
+        self.margins = RunningStats()
+        self.score_histograms = [
+            Histogram(*score_range, bins) for _ in range(num_players)
+        ]
+        self.margin_histogram = Histogram(*margin_range, bins)
+        self.kind_points = [[0] * NUM_KINDS for _ in range(num_players)]
+
+    @property
+    def total_scores(self):
+        """Sum of each seat's game totals."""
+        return [stats.total for stats in self.scores]
+
+    def add_round(self, scores, tables=None):
+        """Adds the scores, and the tables if given, of one round."""
+        for seat, score in enumerate(scores):
+            self.round_scores[seat].add(score)
+        if tables is not None:
+            counts = []
+            for table in tables:
+                table_counts = [0] * NUM_KINDS
+                for card in table:
+                    table_counts[card.kind] += 1
+                counts.append(table_counts)
+            round_points = self.rules.round_kind_points(counts)
+            for points, values in zip(
+                self.kind_points, round_points, strict=True
+            ):
+                for kind, value in enumerate(values):
+                    points[kind] += value
+
+    def add_totals(self, totals):
+        """Adds the outcome of one game from its total scores."""
+        self.games += 1
+        top = leaders(totals)
+        if len(top) == 1:
+            self.wins[top[0]] += 1
+        else:
+            self.ties += 1
+        for seat, total in enumerate(totals):
+            if seat not in top:
+                self.losses[seat] += 1
+            self.scores[seat].add(total)
+            self.score_histograms[seat].add(total)
+        margin = totals[0] - totals[1]
+        self.margins.add(margin)
+        self.margin_histogram.add(margin)
+
+    def add_game(self, game):
+        """Adds a finished game from its ``round_scores``.
+
+        Card contributions are only counted through a ``StatsSink``.
+        """
+        totals = [0] * self.num_players
+        for scores in game.round_scores:
+            self.add_round(scores)
+            for seat, score in enumerate(scores):
+                totals[seat] += score
+        self.add_totals(totals)
+
+    def merge(self, other):
+        """Adds the results of ``other`` to these results."""
+        self.games += other.games
+        self.ties += other.ties
+        for seat in range(self.num_players):
+            self.wins[seat] += other.wins[seat]
+            self.losses[seat] += other.losses[seat]
+            self.scores[seat].merge(other.scores[seat])
+            self.round_scores[seat].merge(other.round_scores[seat])
+            self.score_histograms[seat].merge(other.score_histograms[seat])
+            for kind in range(NUM_KINDS):
+                self.kind_points[seat][kind] += other.kind_points[seat][kind]
+        self.margins.merge(other.margins)
+        self.margin_histogram.merge(other.margin_histogram)
+        return self
+
+    def mean_scores(self):
+        """Average total score of each seat per game."""
+        return [stats.mean for stats in self.scores]
+
+    def mean_kind_points(self, seat):
+        """Average points per game of each card kind for a seat."""
+        if not self.games:
+            return [0.0] * NUM_KINDS
+        return [points / self.games for points in self.kind_points[seat]]
+
+    def __eq__(self, other):
+        """Compare results field by field."""
+        if not isinstance(other, ResultsAggregator):
+            return NotImplemented
+        return vars(self) == vars(other)
+
+    def __str__(self) -> str:
+        """Generate a string view of this object."""
+        lines = [f"Games: {self.games}"]
+        for seat, stats in enumerate(self.scores):
+            lines.append(
+                f"Player {seat + 1} wins: {self.wins[seat]}, "
+                f"mean score {stats.mean:.3f} (sd {stats.stdev:.3f})"
+            )
+        lines.append(f"Ties: {self.ties}")
+        if any(any(points) for points in self.kind_points):
+            lines.append("Mean points per game by card:")
+            for kind, name in enumerate(KIND_NAMES):
+                means = ", ".join(
+                    f"{self.mean_kind_points(seat)[kind]:.3f}"
+                    for seat in range(self.num_players)
+                )
+                lines.append(f"  {name}: {means}")
+        return "\n".join(lines)
+
+
+class StatsSink(EventSink):
+    """Event sink that adds every game to a ``ResultsAggregator``."""
+
+    def __init__(self, results):
+        """Initializes the sink."""
+        self.results = results
+
+    def round_score(self, round_number, tables, scores):
+        """Adds the round scores and card contributions."""
+        self.results.add_round(scores, tables)
+
+    def game_end(self, totals):
+        """Adds the outcome of the game."""
+        self.results.add_totals(totals)
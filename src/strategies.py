@@ -0,0 +1,290 @@
+"""Strategies that choose the card a player plays.
+
+A ``Strategy`` decides for one player with ``choose``, or for many game
+states at once with ``choose_batch``, which lets a strategy share work
+across the batch (a table's values are computed once for every hand
+played against it). Strategies that rank cards by a value per kind also
+provide ``values_batch``, the NumPy form ``batch_sim.BatchGame`` plays
+with.
+
+Strategies are registered by name; ``get_strategy("maximizer")`` builds
+one, and ``Player(name, strategy="maximizer")`` plays with it. The
+built-in ones are:
+
+- ``"max_scoring"``: the card with the highest base score, the rule
+  ``Player.play_max_scoring_card`` used for the first card of a round.
+- ``"maximizer"``: the ``SushiGoMaximizer`` rule against the shared
+  table, optionally answered from a ``DecisionCache``.
+- ``"default"``: ``"max_scoring"`` for the first card of a round, then
+  ``"maximizer"``, which is how every ``Player`` has always played.
+- ``"card_counting"``: the expected value of each card for the player's
+  own table, from the cards not seen yet (``card_counting``).
+- ``"learned"``: the best afterstate of a value function trained by
+  self-play, loaded from ``path`` (``rl_trainer``).
+
+The first three keep no state, so one instance is shared by every
+player instead of a new object being built on every turn. Strategies
+that remember a game are built per player and forget it in ``reset``.
+"""
+
+from cards import BASE_SCORES, NUM_KINDS
+
+STRATEGIES: dict = {}
+
+
+def register(name):
+    """Decorator that registers a strategy factory under ``name``.
+
+    A registered ``Strategy`` class takes ``name`` as its ``name``.
+
+    Raises:
+        ValueError: If another strategy already has that name.
+    """
+
+    def decorator(factory):
+        if name in STRATEGIES:
+            raise ValueError(f"Strategy already registered: {name}")
+        STRATEGIES[name] = factory
+        if isinstance(factory, type):
+            factory.name = name
+        return factory
+
+    return decorator
+
+
+def get_strategy(name, **options):
+    """Builds the strategy registered under ``name`` with ``options``.
+
+    Raises:
+        ValueError: If no strategy has that name.
+    """
+    factory = STRATEGIES.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown strategy: {name}")
+    return factory(**options)
+
+
+def strategy_names():
+    """Names of the registered strategies, sorted."""
+    return sorted(STRATEGIES)
+
+
+def seat_of(hand, table):
+    """Seat of the player holding ``hand``; seat 0 if none does.
+
+    ``choose`` is not told whose turn it is; the player is the one whose
+    hand is the very list passed in.
+    """
+    for seat, player in enumerate(table.players):
+        if getattr(player, "hand", None) is hand:
+            return seat
+    return 0
+
+
+class Strategy:
+    """Chooses the card a player plays.
+
+    Attributes:
+        name: Name the strategy is registered under, or None.
+    """
+
+    name: str | None = None
+
+    def choose(self, hand, table, first=False, cache=None):
+        """Chooses a card of ``hand``; the caller removes it.
+
+        Args:
+            hand: Cards in the player's hand, in hand order.
+            table: ``RandomTable`` of the round, or None.
+            first: Whether this is the first card of a round.
+            cache: Optional ``DecisionCache`` the strategy may use.
+
+        Returns:
+            The chosen card, or None if the hand is empty.
+        """
+        raise NotImplementedError
+
+    def reset(self):
+        """Forgets the game played so far; called before each game."""
+
+    def choose_batch(self, hands, tables, first=False, cache=None):
+        """Chooses a card for each ``(hand, table)`` pair.
+
+        Returns:
+            A list with the card chosen from each hand.
+        """
+        choose = self.choose
+        return [
+            choose(hand, table, first, cache)
+            for hand, table in zip(hands, tables, strict=True)
+        ]
+
+    def values_batch(self, common, first=False, rules=None):
+        """Value of every kind against many shared tables.
+
+        Args:
+            common: Shared table counts, a NumPy array of shape
+                (N, NUM_KINDS).
+            first: Whether this is the first card of a round.
+            rules: ``rules.Rules`` of the games; the game's by default.
+
+        Returns:
+            Values of shape (NUM_KINDS,) or (N, NUM_KINDS); the first
+            card in hand order with the highest value is played.
+
+        Raises:
+            NotImplementedError: If the strategy does not rank cards by a
+                value per kind.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} has no values per kind."
+        )
+
+
+def _first_best(hand, values):
+    """First card of ``hand`` with the highest value of its kind."""
+    best_card = None
+    best_value = None
+    for card in hand:
+        value = values[card.kind]
+        if best_value is None or value > best_value:
+            best_card = card
+            best_value = value
+    return best_card
+
+
+def _faces(table):
+    """Face value of every kind under the rules of ``table``."""
+    return BASE_SCORES if table is None else table.rules.faces
+
+
+@register("max_scoring")
+class MaxScoringStrategy(Strategy):
+    """Plays the card with the highest base score."""
+
+    def choose(self, hand, table, first=False, cache=None):
+        """Chooses the first card with the highest base score."""
+        if not hand:
+            return None
+        faces = _faces(table)
+        return max(hand, key=lambda card: faces[card.kind])
+
+    def choose_batch(self, hands, tables, first=False, cache=None):
+        """Chooses the card with the highest base score of each hand."""
+        return [
+            _first_best(hand, _faces(table))
+            for hand, table in zip(hands, tables, strict=True)
+        ]
+
+    def values_batch(self, common, first=False, rules=None):
+        """Base score of every kind."""
+        return BASE_SCORES if rules is None else rules.faces
+
+
+@register("maximizer")
+class MaximizerStrategy(Strategy):
+    """Plays the card with the best maximizer score on the shared table.
+
+    This is the rule of ``SushiGoMaximizer``: each card is scored by
+    ``TableTally.best_score`` against the tally of the shared cards, and
+    the first card in hand order with the best score is played.
+    """
+
+    def choose(self, hand, table, first=False, cache=None):
+        """Chooses the card with the best maximizer score."""
+        tally = table.common_tally
+        if cache is not None:
+            return cache.select_best_card(hand, tally)
+        best_score = tally.best_score
+        best_card = None
+        best = None
+        for card in hand:
+            score = best_score(card.kind)
+            if best is None or score > best:
+                best_card = card
+                best = score
+        return best_card
+
+    def choose_batch(self, hands, tables, first=False, cache=None):
+        """Chooses for each hand, scoring each distinct table once."""
+        if cache is not None:
+            return [
+                cache.select_best_card(hand, table.common_tally)
+                for hand, table in zip(hands, tables, strict=True)
+            ]
+        values_by_table = {}
+        cards = []
+        for hand, table in zip(hands, tables, strict=True):
+            tally = table.common_tally
+            values = values_by_table.get(id(tally))
+            if values is None:
+                values = [tally.best_score(kind) for kind in range(NUM_KINDS)]
+                # Keyed by id: the tallies stay alive in ``tables``
+                values_by_table[id(tally)] = values
+            cards.append(_first_best(hand, values))
+        return cards
+
+    def values_batch(self, common, first=False, rules=None):
+        """Maximizer score of every kind against each shared table."""
+        from batch_sim import maximizer_values
+
+        if rules is None:
+            return maximizer_values(common)
+        return maximizer_values(common, rules)
+
+
+class TwoPhaseStrategy(Strategy):
+    """Plays the first card of a round with one strategy, then another.
+
+    Attributes:
+        first: Strategy for the first card of each round.
+        rest: Strategy for every other card.
+    """
+
+    def __init__(self, first, rest):
+        """Initializes the strategy."""
+        self.first = first
+        self.rest = rest
+
+    def choose(self, hand, table, first=False, cache=None):
+        """Chooses with the strategy of the phase."""
+        strategy = self.first if first else self.rest
+        return strategy.choose(hand, table, first, cache)
+
+    def choose_batch(self, hands, tables, first=False, cache=None):
+        """Chooses with the strategy of the phase."""
+        strategy = self.first if first else self.rest
+        return strategy.choose_batch(hands, tables, first, cache)
+
+    def values_batch(self, common, first=False, rules=None):
+        """Values of the strategy of the phase."""
+        strategy = self.first if first else self.rest
+        return strategy.values_batch(common, first, rules)
+
+
+MAX_SCORING = MaxScoringStrategy()
+MAXIMIZER = MaximizerStrategy()
+DEFAULT_STRATEGY = TwoPhaseStrategy(MAX_SCORING, MAXIMIZER)
+DEFAULT_STRATEGY.name = "default"
+
+
+@register("default")
+def _default_strategy():
+    """The shared default strategy."""
+    return DEFAULT_STRATEGY
+
+
+@register("card_counting")
+def _card_counting_strategy(**options):
+    """A new ``card_counting.CardCountingStrategy``."""
+    from card_counting import CardCountingStrategy
+
+    return CardCountingStrategy(**options)
+
+
+@register("learned")
+def _learned_strategy(path):
+    """A ``rl_trainer.ValueStrategy`` playing the checkpoint at ``path``."""
+    from rl_trainer import ValueStrategy, load_checkpoint
+
+    return ValueStrategy(load_checkpoint(path))
@@ -0,0 +1,258 @@
+"""Duplicate-deal A/B comparison of two strategies.
+
+Every deal is played twice: once with strategy A in seat 1 and B in
+seat 2, then with the seats swapped. Both games use the same shuffled
+deck, and each side's own random stream depends only on the deal and
+the side, not on the seat, so the luck of the deal cancels in the
+paired difference
+
+    (A's score - B's score in game 1) + (A's score - B's score in game 2)
+
+and what is left is mostly the difference between the strategies.
+
+``compare_strategies`` plays deals in chunks and looks at the running
+confidence interval of the mean paired difference after each chunk,
+stopping as soon as it excludes zero. Each look uses a Bonferroni share
+of ``1 - confidence`` over the planned looks, so stopping early does not
+inflate the false-positive rate.
+"""
+
+import argparse
+import copy
+import math
+import random
+from multiprocessing import Pool
+from statistics import NormalDist
+
+from events import NullSink
+from stats import RunningStats
+from strategies import Strategy, get_strategy
+from sushi_go_game import Deck, Game, Player
+from tournament import game_seed
+
+DEFAULT_MAX_DEALS = 10_000
+DEFAULT_CHECK_EVERY = 200
+DEFAULT_CONFIDENCE = 0.95
+
+
+def _player(spec, name, rng):
+    """Player of a strategy spec with a strategy of its own.
+
+    ``spec`` is a ``Strategy``, the name of a registered one, or a player
+    factory called as ``spec(name, rng=rng)``, such as ``ISMCTSPlayer``.
+    A ``Strategy`` is copied and a name is built anew from the registry,
+    so no state carries over from another game or seat and the deals
+    stay independent.
+    """
+    if isinstance(spec, str):
+        return Player(name, strategy=get_strategy(spec))
+    if isinstance(spec, Strategy):
+        return Player(name, strategy=copy.deepcopy(spec))
+    return spec(name, rng=rng)
+
+
+def play_deal(strategy_a, strategy_b, master_seed, deal_index, rounds=3):
+    """Plays one deal in both seatings.
+
+    Returns:
+        A's score minus B's in each of the two games, A in seat 1 first.
+    """
+    seed = game_seed(master_seed, deal_index)
+    differences = []
+    for a_seat in (0, 1):
+        # Each side's stream depends on the deal and the side only
+        a = _player(strategy_a, "A", random.Random(f"{seed}:A"))
+        b = _player(strategy_b, "B", random.Random(f"{seed}:B"))
+        players = (a, b) if a_seat == 0 else (b, a)
+        game = Game(*players, rounds, Deck(random.Random(seed)), NullSink())
+        game.conduct_round()
+        totals = [
+            sum(scores[seat] for scores in game.round_scores)
+            for seat in (0, 1)
+        ]
+        differences.append(totals[a_seat] - totals[1 - a_seat])
+    return differences
+
+
+def _play_chunk(task):
+    """Paired and per-game differences of deals ``start`` to ``stop``."""
+    strategy_a, strategy_b, master_seed, start, stop, rounds = task
+    paired = RunningStats()
+    games = RunningStats()
+    for deal_index in range(start, stop):
+        first, second = play_deal(
+            strategy_a, strategy_b, master_seed, deal_index, rounds
+        )
+        paired.add(first + second)
+        games.add(first)
+        games.add(second)
+    return paired, games
+
+
+class ComparisonResult:
+    """Outcome of a duplicate-deal comparison.
+
+    Attributes:
+        paired: ``RunningStats`` of the paired difference of each deal,
+            A's score minus B's summed over both seatings.
+        games: ``RunningStats`` of A's score minus B's in each game.
+        confidence: Confidence level of the intervals.
+        looks: Number of planned looks the level is shared by.
+        stopped_early: Whether the comparison stopped before the
+            largest number of deals.
+    """
+
+    def __init__(self, confidence=DEFAULT_CONFIDENCE, looks=1):
+        """Initializes empty results."""
+        self.paired = RunningStats()
+        self.games = RunningStats()
+        self.confidence = confidence
+        self.looks = looks
+        self.stopped_early = False
+
+    @property
+    def deals(self):
+        """Deals played, each as two games."""
+        return self.paired.count
+
+    @property
+    def mean(self):
+        """Mean edge of A over B per game."""
+        return self.paired.mean / 2
+
+    def interval(self, confidence=None):
+        """Normal confidence interval of ``mean``.
+
+        By default the level is ``confidence`` shared over the planned
+        looks, the interval the stopping rule uses.
+        """
+        if confidence is None:
+            confidence = 1 - (1 - self.confidence) / self.looks
+        if self.deals < 2:
+            return (-math.inf, math.inf)
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        half_width = z * self.paired.stdev / math.sqrt(self.deals) / 2
+        return (self.mean - half_width, self.mean + half_width)
+
+    def significant(self):
+        """Whether the interval of the stopping rule excludes zero."""
+        low, high = self.interval()
+        return low > 0 or high < 0
+
+    def variance_ratio(self):
+        """How many unpaired games one deal is worth.
+
+        Variance of a single game's difference over the variance of a
+        deal's per-game mean difference; how much pairing saves. Is
+        ``math.inf`` when the paired difference never varies.
+        """
+        per_game = self.paired.variance / 4
+        if per_game == 0:
+            return math.inf
+        return self.games.variance / per_game / 2
+
+    def __str__(self) -> str:
+        """Generate a string view of this object."""
+        low, high = self.interval()
+        return (
+            f"Deals: {self.deals} ({2 * self.deals} games)"
+            f"{', stopped early' if self.stopped_early else ''}\n"
+            f"Edge of A per game: {self.mean:+.3f} "
+            f"[{low:+.3f}, {high:+.3f}]\n"
+            f"Significant: {'yes' if self.significant() else 'no'}; "
+            f"one deal is worth {self.variance_ratio():.1f} unpaired games"
+        )
+
+
+def compare_strategies(
+    strategy_a,
+    strategy_b,
+    max_deals=DEFAULT_MAX_DEALS,
+    master_seed=0,
+    rounds=3,
+    confidence=DEFAULT_CONFIDENCE,
+    check_every=DEFAULT_CHECK_EVERY,
+    early_stop=True,
+    workers=1,
+):
+    """Compares two strategies over duplicate deals.
+
+    Args:
+        strategy_a: ``Strategy``, registered strategy name or player
+            factory called as ``factory(name, rng=rng)``.
+        strategy_b: The same for the other side.
+        max_deals: Most deals to play.
+        master_seed: Seed every deal is derived from, as in
+            ``tournament.game_seed``; the same seed gives the same deals
+            to any pair of strategies.
+        rounds: Rounds per game.
+        confidence: Overall confidence level of the stopping rule.
+        check_every: Deals between looks at the interval.
+        early_stop: Whether to stop once the interval excludes zero.
+        workers: Worker processes; 1 plays in this process and None uses
+            every CPU. Strategies must then be picklable.
+
+    Returns:
+        A ``ComparisonResult``; with the same arguments it does not
+        depend on ``workers``.
+    """
+    tasks = [
+        (
+            strategy_a,
+            strategy_b,
+            master_seed,
+            start,
+            min(start + check_every, max_deals),
+            rounds,
+        )
+        for start in range(0, max_deals, check_every)
+    ]
+    result = ComparisonResult(
+        confidence, looks=len(tasks) if early_stop else 1
+    )
+
+    def add(chunks):
+        for paired, games in chunks:
+            result.paired.merge(paired)
+            result.games.merge(games)
+            if early_stop and result.significant():
+                result.stopped_early = result.deals < max_deals
+                return
+
+    if workers == 1:
+        add(map(_play_chunk, tasks))
+        return result
+    with Pool(workers) as pool:
+        # imap keeps the chunks in order, so the stop does not depend on
+        # which worker finishes first
+        add(pool.imap(_play_chunk, tasks))
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare two registered strategies over duplicate deals."
+    )
+    parser.add_argument("strategy_a")
+    parser.add_argument("strategy_b")
+    parser.add_argument("--deals", type=int, default=DEFAULT_MAX_DEALS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE)
+    parser.add_argument("--check-every", type=int, default=DEFAULT_CHECK_EVERY)
+    parser.add_argument("--no-early-stop", action="store_true")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    print(
+        compare_strategies(
+            args.strategy_a,
+            args.strategy_b,
+            max_deals=args.deals,
+            master_seed=args.seed,
+            rounds=args.rounds,
+            confidence=args.confidence,
+            check_every=args.check_every,
+            early_stop=not args.no_early_stop,
+            workers=args.workers,
+        )
+    )
@@ -11,7 +11,23 @@ On each round the players are given 9 cards:
 - After the three rounds the points are added.
 """
 
-from random import shuffle
+import random
+
+from cards import (
+    BASE_SCORES,
+    DECK_COUNTS,
+    DEFAULT_RULES,
+    KIND_BY_NAME,
+    KIND_NAMES,
+    NUM_KINDS,
+    CardKind,
+    dumpling_points,
+)
+from events import ConsoleSink
+from instrumentation import NullTimer
+from rules import NIGIRI
+from rules import WASABI as WASABI_ROLE
+from strategies import DEFAULT_STRATEGY, MAXIMIZER, get_strategy
 
 # CARDS
 TEMPURA = "Tempura"
@@ -25,99 +41,184 @@ MAKI_ROLLS = ["Maki 1", "Maki 2", "Maki 3"]
 
 
 class Card:
-    """Playing cards for Sushi Go."""
-
-    """This class assigns values to the different cards and has methods to sum 
-    the scores of special cards"""
-
-    def __init__(self, card_type: str):
-        """Initialize."""
-        self.card_type = card_type
+    """Playing cards for Sushi Go.
+
+    Cards are flyweights: ``Card(card_type)`` returns the one shared
+    instance of that kind, which carries its integer ``kind`` code so
+    scoring is a table lookup. Unknown card types get a private instance
+    whose ``score`` raises ``ValueError``.
+    """
+
+    __slots__ = ("card_type", "kind")
+
+    card_type: str
+    kind: CardKind | None
+    _instances: dict = {}
+
+    def __new__(cls, card_type: str):
+        """Return the shared card for ``card_type``."""
+        card = cls._instances.get(card_type)
+        if card is None:
+            card = super().__new__(cls)
+            card.card_type = card_type
+            card.kind = KIND_BY_NAME.get(card_type)
+            if card.kind is not None:
+                cls._instances[card_type] = card
+        return card
+
+    def __reduce__(self):
+        """Unpickle to the shared instance."""
+        return (Card, (self.card_type,))
 
     def __str__(self) -> str:
         """Generate a string view of this object."""
         return self.card_type
 
+    @staticmethod
+    def of(kind):
+        """Return the shared card of an integer kind."""
+        return CARDS[kind]
+
     def score(self):
         """Assigns base scores to the cards."""
-        if self.card_type in MAKI_ROLLS:
-            return MAKI_ROLLS.index(self.card_type) + 1
-        elif self.card_type == TEMPURA:
-            return 5
-        elif self.card_type == SASHIMI:
-            return 10
-        elif self.card_type == DUMPLING:
-            return 1
-        elif self.card_type == NIGIRI_SQUID:
-            return 3
-        elif self.card_type == NIGIRI_SALMON:
-            return 2
-        elif self.card_type == NIGIRI_EGG:
-            return 1
-        elif self.card_type == WASABI:
-            return 0
-        else:
+        if self.kind is None:
             raise ValueError(f"Invalid card type: {self.card_type}")
+        return BASE_SCORES[self.kind]
 
     def dumpling_score(self, count):
         """Calculate the score for Dumpling based on the number of cards."""
-        if self.card_type == DUMPLING:
-            if count == 1:
-                return 1
-            elif count == 2:
-                return 3
-            elif count == 3:
-                return 6
-            elif count == 4:
-                return 10
-            elif count >= 5:
-                return 15
-
+        if self.kind == CardKind.DUMPLING:
+            return dumpling_points(count)
         return 0
 
 
+# One shared card per kind, indexed by CardKind
+CARDS = tuple(Card(name) for name in KIND_NAMES)
+
+
 class Deck:
-    """A deck of Sushi Go cards."""
+    """A deck of Sushi Go cards.
+
+    The deck is an array of card kinds plus a dealing cursor. Cards are
+    shuffled lazily with a partial Fisher-Yates shuffle, so dealing k
+    cards only costs O(k) and never copies the rest of the deck.
+    ``counts`` holds the number of cards of each kind still in the deck.
+    """
 
-    def __init__(self):
-        """Initialize."""
-        self.cards = self._create_deck()
+    def __init__(self, rng=None):
+        """Initialize.
+
+        Args:
+            rng: ``random.Random``-like source used to shuffle; defaults
+                to the global ``random`` module.
+        """
+        self.rng = random if rng is None else rng
+        self._kinds = self._create_deck()
+        self._cursor = 0
+        self._shuffled = 0  # positions below this are in dealing order
+        self.counts = list(DECK_COUNTS)
 
     def _create_deck(self):
-        """Creates a deck of cards with distribution of Sushi Go."""
-        cards = []
-        cards += [Card(MAKI_ROLLS[0]) for _ in range(6)]
-        cards += [Card(MAKI_ROLLS[1]) for _ in range(12)]
-        cards += [Card(MAKI_ROLLS[2]) for _ in range(8)]
-        cards += [Card(TEMPURA) for _ in range(14)]
-        cards += [Card(SASHIMI) for _ in range(14)]
-        cards += [Card(DUMPLING) for _ in range(14)]
-        cards += [Card(NIGIRI_SQUID) for _ in range(10)]
-        cards += [Card(NIGIRI_SALMON) for _ in range(5)]
-        cards += [Card(NIGIRI_EGG) for _ in range(5)]
-        cards += [Card(WASABI) for _ in range(6)]
-        shuffle(cards)
-        return cards
+        """Creates the card kinds with distribution of Sushi Go."""
+        kinds = []
+        for kind, count in enumerate(DECK_COUNTS):
+            kinds += [kind] * count
+        return kinds
+
+    def __len__(self):
+        """Number of cards left in the deck."""
+        return len(self._kinds) - self._cursor
+
+    def _shuffle_to(self, stop):
+        """Shuffles positions up to ``stop`` into their final order."""
+        kinds = self._kinds
+        rand = self.rng.random
+        remaining = len(kinds)
+        for i in range(self._shuffled, stop):
+            j = i + int(rand() * (remaining - i))
+            kinds[i], kinds[j] = kinds[j], kinds[i]
+        self._shuffled = max(self._shuffled, stop)
+
+    def draw_kinds(self, num_cards):
+        """Deals ``num_cards`` cards as a list of card kinds."""
+        start = self._cursor
+        stop = start + num_cards
+        if stop > len(self._kinds):
+            raise ValueError("Not enough cards in the deck.")
+        if stop > self._shuffled:
+            self._shuffle_to(stop)
+        self._cursor = stop
+        drawn = self._kinds[start:stop]
+        counts = self.counts
+        for kind in drawn:
+            counts[kind] -= 1
+        return drawn
+
+    def deal(self, num_cards):
+        """Deals ``num_cards`` cards."""
+        return [CARDS[kind] for kind in self.draw_kinds(num_cards)]
+
+    def deal_counts(self, num_cards, out=None):
+        """Deals ``num_cards`` cards into a count vector indexed by kind.
+
+        The cards are added to ``out`` when given, else to a new vector.
+        """
+        if out is None:
+            out = [0] * NUM_KINDS
+        for kind in self.draw_kinds(num_cards):
+            out[kind] += 1
+        return out
+
+    @property
+    def cards(self):
+        """Cards left in the deck, in dealing order."""
+        self._shuffle_to(len(self._kinds))
+        return [CARDS[kind] for kind in self._kinds[self._cursor :]]
+
+    @cards.setter
+    def cards(self, cards):
+        """Stacks the deck so that ``cards`` are dealt in order."""
+        self._kinds = [card.kind for card in cards]
+        self._cursor = 0
+        self._shuffled = len(self._kinds)
+        self.counts = [0] * NUM_KINDS
+        for kind in self._kinds:
+            self.counts[kind] += 1
 
 
 class Player:
-    """Represents a player in the Sushi Go game."""
+    """Represents a player in the Sushi Go game.
+
+    ``strategy`` is the ``strategies.Strategy`` that chooses the cards;
+    by default the shared one every player has always played with.
+    ``timer`` is the enabled ``PhaseTimer`` of the game the player is in,
+    or None when the game is not timed.
+    """
 
-    def __init__(self, name):
-        """Initializes name and hand"""
+    timer = None
+
+    def __init__(self, name, strategy=None):
+        """Initializes name, hand and strategy.
+
+        ``strategy`` is a ``Strategy`` or the name of a registered one.
+        """
         self.name = name
         self.hand = []
+        if strategy is None:
+            strategy = DEFAULT_STRATEGY
+        elif isinstance(strategy, str):
+            strategy = get_strategy(strategy)
+        self.strategy = strategy
 
     def assign_cards(self, deck, num_cards):
         """Assings cards."""
-        if num_cards > len(deck.cards):
+        if num_cards > len(deck):
             print("Error: Not enough cards in the deck.")
             return
         if num_cards == 0:
             print("Error: Number of cards in hand cannot be 0.")
             return
-        self.hand = deck.cards[:num_cards]
-        deck.cards = deck.cards[num_cards:]
+        self.hand = deck.deal(num_cards)
 
     def show_hand(self):
         """Prints hand."""
@@ -127,20 +228,31 @@ class Player:
         # for card in self.hand:
         #     print(card)
 
-    def play_max_scoring_card(self):
-        "Plays the best card for the first turn."
+    def play_max_scoring_card(self, table=None):
+        """Plays the first card of a round with the player's strategy.
+
+        With the default strategy this is the card with the highest base
+        score.
+        """
         if not self.hand:
             print(f"{self.name} has no cards to play.")
             return None
 
-        max_scoring_card = max(self.hand, key=lambda card: card.score())
-        self.hand.remove(max_scoring_card)
-        return max_scoring_card
+        first_card = self.strategy.choose(self.hand, table, first=True)
+        self.hand.remove(first_card)
+        return first_card
+
+    def play_best_card(self, table, cache=None):
+        """Plays the card the player's strategy chooses.
 
-    def play_best_card(self, table):
-        """Plays best card with the maximizer strategy."""
-        maximizer = SushiGoMaximizer(self, table)
-        best_card = maximizer.select_best_card()
+        ``cache`` is an optional ``DecisionCache`` of maximizer decisions.
+        """
+        timer = self.timer
+        if timer is not None:
+            start = timer.clock()
+        best_card = self.strategy.choose(self.hand, table, cache=cache)
+        if timer is not None:
+            timer.add("select", timer.clock() - start)
         if best_card:
             self.hand.remove(best_card)
             return best_card
@@ -149,275 +261,375 @@ class Player:
             return None
 
 
-class RandomTable:
-    """Builds table for players with the cards drawn."""
+class TableTally:
+    """Running score of the cards on one table.
+
+    Per-kind counts, the top nigiri value, the wasabi state and the score
+    are updated as each card is added, so reading the score or the value
+    of a candidate card is O(1) instead of a scan of the table. The
+    points come from the tables of ``rules``, by default the game's.
+    """
+
+    __slots__ = (
+        "counts",
+        "size",
+        "top_nigiri",
+        "has_wasabi",
+        "score",
+        "rules",
+    )
+
+    def __init__(self, cards=(), rules=None):
+        """Initializes the tally with the given cards."""
+        self.counts = [0] * NUM_KINDS
+        self.size = 0
+        self.top_nigiri = 0
+        self.has_wasabi = False
+        self.score = 0
+        self.rules = DEFAULT_RULES if rules is None else rules
+        for card in cards:
+            self.add(card.kind)
+
+    def gain(self, kind):
+        """Points the table would gain from one more card of ``kind``."""
+        return self.rules.gain(
+            kind, self.counts[kind], self.top_nigiri, self.has_wasabi
+        )
+
+    def add(self, kind):
+        """Adds a card of ``kind`` to the table."""
+        rules = self.rules
+        self.score += rules.gain(
+            kind, self.counts[kind], self.top_nigiri, self.has_wasabi
+        )
+        self.counts[kind] += 1
+        self.size += 1
+        role = rules.roles[kind]
+        if role == NIGIRI:
+            self.top_nigiri = max(self.top_nigiri, rules.faces[kind])
+        elif role == WASABI_ROLE:
+            self.has_wasabi = True
+
+    def possible_scores(self, kind):
+        """Maximizer scores of a card of ``kind`` against this table."""
+        return self.rules.possible_scores(
+            kind, self.counts[kind], self.top_nigiri, self.has_wasabi
+        )
 
-    def __init__(self, cards_on_table, player1, player2):
-        """Initializes."""
+    def best_score(self, kind):
+        """Best maximizer score of a card of ``kind`` against this table."""
+        return self.rules.best_score(
+            kind, self.counts[kind], self.top_nigiri, self.has_wasabi
+        )
+
+
+class RandomTable:
+    """Builds table for players with the cards drawn.
+
+    Tables are kept per seat: ``tables[seat]`` holds the cards the player
+    in that seat played and ``tallies[seat]`` its ``TableTally``, so
+    scores are read in O(1). ``player1_table``, ``player2_table`` and
+    their tallies name the first two seats. ``cards_on_table`` should be
+    replaced, not mutated in place, for its tally to stay current.
+    """
+
+    def __init__(self, cards_on_table, *players, rules=None):
+        """Initializes.
+
+        Args:
+            cards_on_table: Cards shared on the table, or None.
+            *players: Player in each seat, two or more.
+            rules: ``rules.Rules`` the tables are scored by; the game's
+                by default.
+        """
+        self.rules = DEFAULT_RULES if rules is None else rules
         self.cards_on_table = (
             cards_on_table if cards_on_table is not None else []
         )
-        self.player1 = player1
-        self.player2 = player2
-        self.player1_table = []
-        self.player2_table = []
-        # self.card_type=card_type
+        self.players = players
+        self.tables = [[] for _ in players]
+        self.tallies = [TableTally(rules=self.rules) for _ in players]
+        # The first seat wins if a player sits twice
+        self._seats = {}
+        for seat, player in enumerate(players):
+            self._seats.setdefault(player, seat)
+
+    @property
+    def player1(self):
+        """Player in the first seat."""
+        return self.players[0]
+
+    @property
+    def player2(self):
+        """Player in the second seat."""
+        return self.players[1]
+
+    @property
+    def player1_table(self):
+        """Cards played by the first seat."""
+        return self.tables[0]
+
+    @property
+    def player2_table(self):
+        """Cards played by the second seat."""
+        return self.tables[1]
+
+    @property
+    def player1_tally(self):
+        """Tally of the first seat's table."""
+        return self.tallies[0]
+
+    @property
+    def player2_tally(self):
+        """Tally of the second seat's table."""
+        return self.tallies[1]
+
+    @property
+    def cards_on_table(self):
+        """Cards shared on the table."""
+        return self._cards_on_table
+
+    @cards_on_table.setter
+    def cards_on_table(self, cards):
+        self._cards_on_table = cards
+        self._common_tally = None
+
+    @property
+    def common_tally(self):
+        """Tally of the cards shared on the table."""
+        tally = self._common_tally
+        if tally is None or tally.size != len(self._cards_on_table):
+            tally = self._common_tally = TableTally(
+                self._cards_on_table, self.rules
+            )
+        return tally
+
+    def seat(self, player):
+        """Returns the seat of a player."""
+        seat = self._seats.get(player)
+        if seat is None:
+            raise ValueError("Invalid player")
+        return seat
+
+    def tally(self, player):
+        """Returns the running tally of the player's table."""
+        return self.tallies[self.seat(player)]
+
+    def score(self, player):
+        """Returns the current score of the player's table."""
+        return self.tally(player).score
+
+    def round_scores(self):
+        """Score of each seat, with the round bonuses of the rules."""
+        scores = [tally.score for tally in self.tallies]
+        if self.rules.maki_majority is not None:
+            bonuses = self.rules.round_bonuses(
+                [tally.counts for tally in self.tallies]
+            )
+            scores = [
+                score + bonus
+                for score, bonus in zip(scores, bonuses, strict=True)
+            ]
+        return scores
+
+    def marginal_score(self, player, card):
+        """Returns the points ``card`` would add to the player's table."""
+        return self.tally(player).gain(card.kind)
 
     def show_table(self, player):
         """Prints table."""
-        if player == self.player1:
-            print([str(card) for card in self.player1_table])
-        elif player == self.player2:
-            print([str(card) for card in self.player2_table])
-        else:
-            raise ValueError("Invalid player")
+        print([str(card) for card in self.tables[self.seat(player)]])
 
     def update_table_with_card(self, player, card):
         """Adds a card to the player's table."""
-        if player == self.player1:
-            self.player1_table.append(card)
-        elif player == self.player2:
-            self.player2_table.append(card)
-        else:
-            raise ValueError("Invalid player")
+        return self.add_card(self.seat(player), card)
 
+    def add_card(self, seat, card):
+        """Adds a card to the table of a seat."""
+        self.tables[seat].append(card)
+        self.tallies[seat].add(card.kind)
         return self
 
 
 class SushiGoMaximizer:
-    """Naive Maximizer strategy."""
+    """Naive Maximizer strategy.
+
+    Players use the shared ``strategies.MAXIMIZER`` directly; this class
+    wraps it for a single decision.
+    """
 
-    def __init__(self, player, table):
+    def __init__(self, player, table, cache=None):
         self.player = player
         self.table = table
+        self.cache = cache
 
     def calculate_possible_scores(self):
         """Calcualtes the possible score of each card on hand.
 
-        It calculates the p.s. of each card on hand by matching it with each
-        card on table and applying the combination rules from the game.
+        It calculates the p.s. of each card on hand against the tally of
+        the cards on table, applying the combination rules from the game.
         """
-        possible_scores = {}
-        for card in self.player.hand:
-            possible_scores[card] = [card.score()]
-            if card.card_type in [NIGIRI_SQUID, NIGIRI_SALMON, NIGIRI_EGG]:
-                if any(
-                    c.card_type == WASABI for c in self.table.cards_on_table
-                ):
-                    possible_scores[card].append(card.score() * 3)
-            elif card.card_type == WASABI:
-                for table_card in self.table.cards_on_table:
-                    if table_card.card_type in [
-                        NIGIRI_SQUID,
-                        NIGIRI_SALMON,
-                        NIGIRI_EGG,
-                    ]:
-                        possible_scores[card].append(table_card.score() * 3)
-            elif card.card_type == TEMPURA:
-                possible_scores[card].append(
-                    5
-                    if any(
-                        c.card_type == TEMPURA
-                        for c in self.table.cards_on_table
-                    )
-                    else 0
-                )
-            elif card.card_type == SASHIMI:
-                possible_scores[card].append(
-                    10
-                    if sum(
-                        1
-                        for c in self.table.cards_on_table
-                        if c.card_type == SASHIMI
-                    )
-                    >= 2
-                    else 0
-                )
-            elif card.card_type == DUMPLING:
-                dumplings = sum(
-                    1
-                    for c in self.table.cards_on_table
-                    if c.card_type == DUMPLING
-                )
-                possible_scores[card].append(card.dumpling_score(dumplings))
-        return possible_scores
+        tally = self.table.common_tally
+        return {
+            card: tally.possible_scores(card.kind) for card in self.player.hand
+        }
 
     def select_best_card(self):
         """Selects the card with the max score from the possible scores."""
-        possible_scores = self.calculate_possible_scores()
-        best_card = max(
-            possible_scores, key=lambda x: max(possible_scores[x], default=0)
-        )
-        return best_card
+        return MAXIMIZER.choose(self.player.hand, self.table, cache=self.cache)
 
 
 class Game:
-    def __init__(self, player1_name, player2_name, rounds, deck):
-        """Initalizes Game."""
-        self.player1 = Player(player1_name)
-        self.player2 = Player(player2_name)
+    def __init__(
+        self,
+        player1_name,
+        player2_name,
+        rounds,
+        deck,
+        sink=None,
+        cache=None,
+        timer=None,
+        rules=None,
+    ):
+        """Initalizes Game.
+
+        Args:
+            player1_name: Name of the first player, or a ``Player``.
+            player2_name: Name of the second player, or a ``Player``.
+            rounds: Number of rounds to play.
+            deck: Deck to deal from.
+            sink: ``EventSink`` that receives the game events; defaults to
+                a ``ConsoleSink`` that prints the game.
+            cache: Optional ``DecisionCache`` shared by both players.
+            timer: Optional ``PhaseTimer`` that records the time spent in
+                each phase of the game; off by default.
+            rules: ``rules.Rules`` of the variant to play; the game's by
+                default.
+        """
+        self.player1 = (
+            player1_name
+            if isinstance(player1_name, Player)
+            else Player(player1_name)
+        )
+        self.player2 = (
+            player2_name
+            if isinstance(player2_name, Player)
+            else Player(player2_name)
+        )
         self.rounds = rounds
         self.deck = deck
+        self.sink = ConsoleSink() if sink is None else sink
+        self.cache = cache
+        self.timer = NullTimer() if timer is None else timer
+        self.rules = DEFAULT_RULES if rules is None else rules
+        for player in (self.player1, self.player2):
+            player.timer = self.timer if self.timer.enabled else None
         self.table = RandomTable(
-            [], self.player1, self.player2
+            [], self.player1, self.player2, rules=self.rules
         )  # Initialize an empty table for cards played during the game
+        self.round_scores = []  # (player 1, player 2) score of each round
+        self.round_index = 0  # index of the round being played
 
     def switch_hands(self):
         """Switches hands of players."""
-        print("Switch Hands - Sushi Go!")
+        timer = self.timer
+        if timer.enabled:
+            start = timer.clock()
         self.player1.hand, self.player2.hand = (
             self.player2.hand,
             self.player1.hand,
         )
+        if self.sink.enabled:
+            self.sink.swap((self.player1, self.player2))
+        if timer.enabled:
+            timer.add("swap", timer.clock() - start)
 
     def conduct_round(self):
         """Plays a round of Sushi go."""
-        overall_scores1 = []
-        overall_scores2 = []
-
-        for _ in range(self.rounds):
-            round_winners = []
-            final_scores1 = []
-            final_scores2 = []
+        sink = self.sink
+        timer = self.timer
+        timing = timer.enabled
+        clock = timer.clock
+        players = (self.player1, self.player2)
+        self.round_scores = []
+        for player in players:
+            player.strategy.reset()
+
+        for round_index in range(self.rounds):
+            self.round_index = round_index
             # Assign cards and show hands
+            if timing:
+                start = clock()
             self.player1.assign_cards(self.deck, 3)
             self.player2.assign_cards(self.deck, 3)
-
-            print()
-            print(f"Round {_ + 1}")
-            print()
-            self.player1.show_hand()
-            self.player2.show_hand()
-            print()
-
-            # Player 1 plays first card and table is updated
-            first_card_1 = self.player1.play_max_scoring_card()
-            self.table.update_table_with_card(self.player1, first_card_1)
-            print("Player 1 plays:", first_card_1)
-
-            # Player 2 plays first card and table is updated
-            first_card_2 = self.player2.play_max_scoring_card()
-            self.table.update_table_with_card(self.player2, first_card_2)
-            print("Player 2 plays:", first_card_2)
-            print()
+            if sink.enabled:
+                sink.deal(round_index + 1, players)
+            if timing:
+                timer.add("deal", clock() - start)
+
+            # Players play their first card and table is updated
+            for seat, player in enumerate(players):
+                if timing:
+                    start = clock()
+                first_card = player.play_max_scoring_card(self.table)
+                if timing:
+                    timer.add("first_play", clock() - start)
+                    start = clock()
+                self.table.update_table_with_card(player, first_card)
+                if sink.enabled:
+                    sink.play(seat, player, first_card)
+                if timing:
+                    timer.add("table", clock() - start)
 
             # Switch hands
             self.switch_hands()
-            print()
-            self.player1.show_hand()
-            self.player2.show_hand()
-            print()
 
             # Players continue to play cards until they have no cards left
             while self.player1.hand:
-                best_card1 = self.player1.play_best_card(self.table)
-                print("Player 1 plays:", best_card1)
-                self.table.update_table_with_card(self.player1, best_card1)
-
-                best_card2 = self.player2.play_best_card(self.table)
-                print("Player 2 plays:", best_card2)
-                print()
-                self.table.update_table_with_card(self.player2, best_card2)
+                for seat, player in enumerate(players):
+                    if timing:
+                        start = clock()
+                    best_card = player.play_best_card(self.table, self.cache)
+                    if timing:
+                        timer.add("play", clock() - start)
+                        start = clock()
+                    if sink.enabled:
+                        sink.play(seat, player, best_card)
+                    self.table.update_table_with_card(player, best_card)
+                    if timing:
+                        timer.add("table", clock() - start)
 
                 # Switch hands again for next turn
                 self.switch_hands()
-                print()
-                self.player1.show_hand()
-                self.player2.show_hand()
-                print()
-
-            # Calculate final scores using the method below
-            final_score1 = self.calculate_final_score(self.table.player1_table)
-            final_score2 = self.calculate_final_score(self.table.player2_table)
 
-            print(
-                f"Player 1's table: {', '.join(str(card) for card in self.table.player1_table)}"
-            )
-            print(
-                f"Player 2's table: {', '.join(str(card) for card in self.table.player2_table)}"
-            )
-            print()
-
-            print(f"Player 1's final score: {final_score1}")
-
-            print(f"Player 2's final score: {final_score2}")
-            print()
-
-            final_scores1.append(final_score1)
-            final_scores2.append(final_score2)
+            # Read the final scores from the table tallies
+            if timing:
+                start = clock()
+            final_score1, final_score2 = self.table.round_scores()
+            self.round_scores.append((final_score1, final_score2))
+            if timing:
+                timer.add("score", clock() - start)
+            if sink.enabled:
+                sink.round_score(
+                    round_index + 1,
+                    (self.table.player1_table, self.table.player2_table),
+                    (final_score1, final_score2),
+                )
 
             # Reset the table for the next round
-            self.table = RandomTable([], self.player1, self.player2)
-
-            # Store the scores of the round
-            overall_scores1.append(final_score1)
-            overall_scores2.append(final_score2)
-
-            # Determine the winner of the round
-            if final_score1 > final_score2:
-                print("Player 1 wins the round!")
-                round_winners.append(self.player1.name)
-            elif final_score2 > final_score1:
-                print("Player 2 wins the round!")
-                round_winners.append(self.player2.name)
-            else:
-                print("The round is a tie!")
-                round_winners.append("Tie")
+            self.table = RandomTable(
+                [], self.player1, self.player2, rules=self.rules
+            )
 
         # Determine the overall game winner
-        total_score1 = sum(overall_scores1)
-        total_score2 = sum(overall_scores2)
-        if total_score1 > total_score2:
-            print("\nOverall game winner: Player 1\n")
-        elif total_score2 > total_score1:
-            print("\nOverall game winner: Player 2\n")
-        else:
-            print("\nOverall game is a tie!\n")
+        total_score1 = sum(score1 for score1, _ in self.round_scores)
+        total_score2 = sum(score2 for _, score2 in self.round_scores)
+        if sink.enabled:
+            sink.game_end((total_score1, total_score2))
 
     def calculate_final_score(self, table_cards):
         """Calculates the final score of the player's table."""
-        maki_score = 0
-        nigiri_score = 0
-        tempura_pairs = 0
-        sashimi_count = 0
-        dumpling_count = 0
-
-        has_wasabi = False
-        highest_nigiri_score = 0
-
-        for card in table_cards:
-            if card.card_type in ["Maki 1", "Maki 2", "Maki 3"]:
-                maki_score += card.score()
-            elif card.card_type in [NIGIRI_SQUID, NIGIRI_SALMON, NIGIRI_EGG]:
-                nigiri_score += card.score()
-                highest_nigiri_score = max(highest_nigiri_score, card.score())
-            elif card.card_type == WASABI:
-                has_wasabi = True
-            elif card.card_type == TEMPURA:
-                tempura_pairs += 1
-            elif card.card_type == SASHIMI:
-                sashimi_count += 1
-            elif card.card_type == DUMPLING:
-                dumpling_count += 1
-
-        if has_wasabi:
-            nigiri_score += (
-                highest_nigiri_score * 3
-            )  # Assuming there is a nigiri card to apply wasabi
-
-        # Calculate scores for card sets
-        tempura_score = (tempura_pairs // 2) * 5
-        sashimi_score = (sashimi_count // 3) * 10
-        dumpling_score = Card(DUMPLING).dumpling_score(dumpling_count)
-
-        total_score = (
-            maki_score
-            + nigiri_score
-            + tempura_score
-            + sashimi_score
-            + dumpling_score
-        )
-        return total_score
+        return TableTally(table_cards, self.rules).score
 
 
 if __name__ == "__main__":
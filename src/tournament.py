@@ -0,0 +1,147 @@
+"""Tournament runner that plays many Sushi Go games across processes.
+
+Every game gets its own random stream, derived from the master seed and
+the game index, so a tournament gives the same results for any number
+of workers and any game can be replayed on its own.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+from multiprocessing import Pool
+
+from events import MultiSink, NullSink
+from game_log import GameLogWriter, LogSink
+from stats import ResultsAggregator, StatsSink
+from sushi_go_game import Deck, Game
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def game_seed(master_seed, game_index):
+    """Seed of one game, derived from the master seed and its index."""
+    digest = hashlib.blake2b(
+        f"{master_seed}:{game_index}".encode(), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "little")
+
+
+def play_game(master_seed, game_index, rounds=3, sink=None):
+    """Plays the game at ``game_index`` of a tournament.
+
+    Calling this again with the same arguments replays the same game.
+    ``sink`` receives the game events; by default nothing does.
+    """
+    deck = Deck(random.Random(game_seed(master_seed, game_index)))
+    sink = NullSink() if sink is None else sink
+    game = Game("Player 1", "Player 2", rounds, deck, sink=sink)
+    game.conduct_round()
+    return game
+
+
+# Kept for callers that predate the streaming aggregator
+TournamentResult = ResultsAggregator
+
+
+def log_path(log_dir, start, log_format):
+    """Log file of the chunk of games starting at ``start``."""
+    extension = "jsonl" if log_format == "jsonl" else "bin"
+    return os.path.join(log_dir, f"games-{start:010d}.{extension}")
+
+
+def _play_chunk(task):
+    """Plays games ``start`` to ``stop`` of a tournament."""
+    master_seed, start, stop, rounds, log_dir, log_format = task
+    result = ResultsAggregator()
+    stats_sink = StatsSink(result)
+    if log_dir is None:
+        for game_index in range(start, stop):
+            play_game(master_seed, game_index, rounds, stats_sink)
+        return result
+
+    path = log_path(log_dir, start, log_format)
+    # Room for every game of the chunk, so the games never wait on it
+    with GameLogWriter(
+        path, log_format, queue_size=max(stop - start, 1)
+    ) as writer:
+        log_sink = LogSink(writer)
+        sink = MultiSink(stats_sink, log_sink)
+        for game_index in range(start, stop):
+            log_sink.game_id = game_index
+            play_game(master_seed, game_index, rounds, sink)
+    return result
+
+
+def run_tournament(
+    num_games,
+    master_seed=0,
+    rounds=3,
+    workers=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    log_dir=None,
+    log_format="jsonl",
+):
+    """Plays ``num_games`` games split across a process pool.
+
+    Args:
+        num_games: Number of games to play.
+        master_seed: Seed every game's random stream is derived from.
+        rounds: Rounds per game.
+        workers: Number of worker processes; defaults to the CPU count.
+            With 1 the games are played in this process.
+        chunk_size: Number of games each task plays.
+        log_dir: Directory to write game logs to, one file per task, as
+            named by ``log_path``; no logs are written by default.
+        log_format: Format of the game logs, ``"jsonl"`` or ``"binary"``.
+
+    Returns:
+        A ``stats.ResultsAggregator``, which does not depend on
+        ``workers``.
+    """
+    if log_dir is not None:
+        os.makedirs(log_dir, exist_ok=True)
+    tasks = [
+        (
+            master_seed,
+            start,
+            min(start + chunk_size, num_games),
+            rounds,
+            log_dir,
+            log_format,
+        )
+        for start in range(0, num_games, chunk_size)
+    ]
+    result = ResultsAggregator()
+    if workers == 1:
+        for task in tasks:
+            result.merge(_play_chunk(task))
+        return result
+
+    with Pool(workers) as pool:
+        for chunk_result in pool.imap_unordered(_play_chunk, tasks):
+            result.merge(chunk_result)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--log-dir", default=None)
+    parser.add_argument(
+        "--log-format", choices=("jsonl", "binary"), default="jsonl"
+    )
+    args = parser.parse_args()
+    print(
+        run_tournament(
+            args.games,
+            master_seed=args.seed,
+            rounds=args.rounds,
+            workers=args.workers,
+            log_dir=args.log_dir,
+            log_format=args.log_format,
+        )
+    )
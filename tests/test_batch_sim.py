@@ -0,0 +1,60 @@
+"""Tests for the batched simulator."""
+
+import os
+import random
+import sys
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+import numpy as np
+
+from batch_sim import BatchGame, score_tables
+from cards import score_counts
+from sushi_go_game import Deck, Game
+
+
+def test_batch_matches_game() -> None:
+    """Test that seeded batch games replay the scalar games exactly."""
+    seeds = list(range(40))
+    batch = BatchGame.from_seeds(seeds, 3)
+    round_scores = batch.conduct_round()
+    for seed in seeds:
+        game = Game("Player 1", "Player 2", 3, Deck(random.Random(seed)))
+        game.conduct_round()
+        assert [tuple(scores) for scores in round_scores[seed].tolist()] == (
+            game.round_scores
+        ), f"Game {seed} should have the same round scores"
+
+
+def test_score_tables() -> None:
+    """Test vectorized scoring against the scalar scorer."""
+    counts = np.random.default_rng(0).integers(0, 5, (200, 10))
+    scores = score_tables(counts)
+    for row, score in zip(counts.tolist(), scores.tolist(), strict=True):
+        assert score == score_counts(row)
+
+
+def test_batch_shapes() -> None:
+    """Test the state arrays of a batch."""
+    batch = BatchGame.from_generator(16, 2, np.random.default_rng(3))
+    batch.conduct_round()
+    assert batch.round_scores.shape == (16, 2, 2)
+    assert (batch.hand_counts().sum(axis=2) == 0).all(), "Hands are empty"
+    assert set(batch.winners().tolist()) <= {-1, 0, 1}
+
+
+def test_play_one_seat() -> None:
+    """Test per-seat values, negative values and playing one seat."""
+    batch = BatchGame.from_generator(8, 1, np.random.default_rng(4))
+    for player in range(2):
+        batch.hands[:, player] = batch.deal(3)
+    hands = batch.hands.copy()
+    values = np.full((8, 2, 10), -5.0)
+    kinds = batch.play(values, seat=1)
+    assert kinds.shape == (8, 1)
+    assert (kinds[:, 0] == hands[:, 1, 0]).all(), "Ties go to the first"
+    assert (batch.tables[:, 0] == 0).all(), "Seat 0 did not play"
+    kinds = batch.play(-values)
+    assert (kinds[:, 1] == hands[:, 1, 1]).all(), "Played slots are skipped"
@@ -0,0 +1,66 @@
+"""Tests for the benchmark suite."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from benchmark import (
+    BENCHMARKS,
+    compare,
+    load_results,
+    regressions,
+    run_benchmarks,
+    save_results,
+)
+
+
+def test_every_benchmark_runs() -> None:
+    """Test that every benchmark can be set up and run once."""
+    for factory in BENCHMARKS.values():
+        run, ops = factory()
+        run()
+        assert ops > 0
+
+
+def test_results_round_trip(tmp_path) -> None:
+    """Test that results are saved and loaded as JSON."""
+    results = run_benchmarks(["card_score", "deck"], repeat=1, min_time=0)
+    assert set(results["benchmarks"]) == {"card_score", "deck"}
+    assert results["benchmarks"]["deck"]["ns_per_op"] > 0
+    path = tmp_path / "results.json"
+    save_results(results, path)
+    assert load_results(path) == results
+
+
+def test_unknown_benchmark() -> None:
+    """Test that unknown benchmark names are rejected."""
+    with pytest.raises(ValueError):
+        run_benchmarks(["no_such_benchmark"])
+
+
+def test_regressions_against_baseline() -> None:
+    """Test that only slowdowns beyond the threshold are regressions."""
+    baseline = {
+        "benchmarks": {
+            "deck": {"ns_per_op": 100.0},
+            "game": {"ns_per_op": 100.0},
+            "card_score": {"ns_per_op": 100.0},
+        }
+    }
+    results = {
+        "benchmarks": {
+            "deck": {"ns_per_op": 105.0},
+            "game": {"ns_per_op": 150.0},
+            "card_score": {"ns_per_op": 50.0},
+            "batch_game": {"ns_per_op": 10.0},
+        }
+    }
+    rows = compare(results, baseline)
+    assert [name for name, *_ in rows] == ["deck", "game", "card_score"]
+    assert regressions(rows, threshold=0.10) == ["game"]
+    assert regressions(rows, threshold=0.01) == ["deck", "game"]
@@ -0,0 +1,161 @@
+"""Tests for the bot server."""
+
+import asyncio
+import json
+import os
+import random
+import sys
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from bot_server import BotServer, LatencyRecorder, encode, run_bot, selfplay
+from tournament import run_tournament
+
+
+def test_latency_percentiles() -> None:
+    """Test nearest-rank percentiles and the bounded reservoir."""
+    recorder = LatencyRecorder()
+    assert recorder.percentile(50) == 0
+    for latency in range(1, 101):
+        recorder.add(latency)
+    assert recorder.percentile(50) == 50
+    assert recorder.percentile(99) == 99
+    assert recorder.percentile(100) == 100
+    bounded = LatencyRecorder(max_samples=10, rng=random.Random(0))
+    for latency in range(1000):
+        bounded.add(latency)
+    assert bounded.count == 1000
+    assert len(bounded.samples) == 10
+
+
+def test_selfplay_plays_tournament_games(tmp_path) -> None:
+    """Test that matches over a Unix socket deal the tournament's games."""
+    server = asyncio.run(
+        selfplay(2, 4, path=str(tmp_path / "server.sock"), seed=3)
+    )
+    assert server.matches == 4
+    assert server.results == run_tournament(4, master_seed=3, workers=1)
+    assert server.latency.count == 2 * 4 * 9
+    assert server.timeouts == server.invalid_moves == 0
+    assert 0 < server.latency.percentile(50) <= server.latency.percentile(99)
+
+
+def test_slow_bot_is_played_by_fallback() -> None:
+    """Test that moves missing the timeout are played by the fallback."""
+
+    async def play():
+        server = BotServer(rounds=1, move_timeout=0.02, seed=5)
+        listener = await server.start_tcp()
+        host, port = listener.sockets[0].getsockname()[:2]
+        async with listener:
+            ends = await asyncio.gather(
+                run_bot(host, port, name="slow", delay=0.1),
+                run_bot(host, port, name="fast"),
+            )
+            await server.wait_idle()
+        return server, ends
+
+    server, ends = asyncio.run(play())
+    assert server.timeouts == 3
+    assert server.results == run_tournament(
+        1, master_seed=5, rounds=1, workers=1
+    )
+    results = {end["result"] for bot_ends in ends for end in bot_ends}
+    assert len(ends[0]) == len(ends[1]) == 1
+    assert results <= {"win", "loss", "tie"}
+
+
+def test_invalid_moves_are_replaced() -> None:
+    """Test that a card not in the hand is counted and replaced."""
+
+    async def cheater(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(encode({"type": "hello", "name": "cheater"}))
+        while True:
+            message = json.loads(await reader.readline())
+            if message["type"] == "move":
+                writer.write(
+                    encode(
+                        {"type": "play", "move": message["move"], "kind": 99}
+                    )
+                )
+            elif message["type"] == "end":
+                break
+        writer.close()
+        await writer.wait_closed()
+
+    async def play():
+        server = BotServer(rounds=2, seed=1)
+        listener = await server.start_tcp()
+        host, port = listener.sockets[0].getsockname()[:2]
+        async with listener:
+            await asyncio.gather(cheater(host, port), run_bot(host, port))
+            await server.wait_idle()
+        return server
+
+    server = asyncio.run(play())
+    assert server.invalid_moves == 6
+    assert server.latency.count == 12
+    assert server.results == run_tournament(
+        1, master_seed=1, rounds=2, workers=1
+    )
+
+
+def test_departed_bot_is_not_paired() -> None:
+    """Test that a bot that left while waiting gets no match."""
+
+    async def leaver(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(encode({"type": "hello", "name": "leaver"}))
+        await writer.drain()
+        await asyncio.sleep(0.05)
+        writer.close()
+        await writer.wait_closed()
+
+    async def play():
+        server = BotServer(rounds=1, seed=2)
+        listener = await server.start_tcp()
+        host, port = listener.sockets[0].getsockname()[:2]
+        async with listener:
+            await leaver(host, port)
+            await asyncio.sleep(0.05)
+            ends = await asyncio.wait_for(
+                asyncio.gather(
+                    run_bot(host, port, name="a"),
+                    run_bot(host, port, name="b"),
+                ),
+                10,
+            )
+            await server.wait_idle()
+        return server, ends
+
+    server, ends = asyncio.run(play())
+    assert server.matches == 1
+    assert len(ends[0]) == len(ends[1]) == 1
+    assert server.timeouts == 0
+
+
+def test_waiting_slot_is_cleared() -> None:
+    """Test that a bot that leaves while waiting frees its slot."""
+
+    async def play():
+        server = BotServer(rounds=1, seed=2)
+        listener = await server.start_tcp()
+        host, port = listener.sockets[0].getsockname()[:2]
+        async with listener:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(encode({"type": "hello", "name": "leaver"}))
+            await writer.drain()
+            await asyncio.sleep(0.05)
+            assert server._waiting is not None
+            writer.close()
+            await writer.wait_closed()
+            await asyncio.wait_for(server.wait_idle(), 1)
+        return server
+
+    server = asyncio.run(play())
+    assert server._waiting is None
+    assert not server._connections
+    assert server.matches == 0
@@ -0,0 +1,71 @@
+"""Tests for the card-counting strategy."""
+
+import os
+import random
+import sys
+from math import comb
+
+import pytest
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from card_counting import CardCountingStrategy, tail_table
+from cards import DECK_COUNTS, CardKind
+from events import NullSink
+from strategies import get_strategy
+from strategy_compare import compare_strategies
+from sushi_go_game import CARDS, Deck, Game, Player, RandomTable
+
+
+def test_tail_table() -> None:
+    """Test the hypergeometric tails against a direct sum."""
+    tails = tail_table(3)
+    for population, successes in ((94, 14), (20, 0), (7, 7), (30, 5)):
+        for at_least in range(4):
+            expected = sum(
+                comb(successes, marked)
+                * comb(population - successes, 3 - marked)
+                for marked in range(at_least, 4)
+            ) / comb(population, 3)
+            row = tails[population][successes]
+            assert row[at_least] == pytest.approx(expected)
+    assert tail_table(3) is tails
+
+
+def test_counts_the_round() -> None:
+    """Test that after the first swap every card of the round is known."""
+    strategy = CardCountingStrategy()
+    me, opponent = Player("me", strategy), Player("opponent")
+    hand = [CardKind.TEMPURA, CardKind.SASHIMI, CardKind.SASHIMI]
+    other = [CardKind.SASHIMI, CardKind.WASABI, CardKind.DUMPLING]
+    me.hand = [CARDS[kind] for kind in hand]
+    opponent.hand = [CARDS[kind] for kind in other]
+    table = RandomTable([], me, opponent)
+    first = strategy.choose(me.hand, table, first=True)
+    assert first.kind == CardKind.SASHIMI, "A third sashimi may still come"
+    me.hand.remove(first)
+    table.add_card(0, first)
+    table.add_card(1, opponent.hand.pop(1))
+    me.hand, opponent.hand = opponent.hand, me.hand
+    assert strategy.choose(me.hand, table).kind == CardKind.SASHIMI
+    expected = [0] * len(DECK_COUNTS)
+    for kind in hand + other:
+        expected[kind] += 1
+    assert strategy._round == expected
+
+
+def test_games() -> None:
+    """Test that games reset the count and that counting pays off."""
+    strategy = get_strategy("card_counting")
+    assert strategy is not get_strategy("card_counting")
+    players = (Player("A", strategy), Player("B"))
+    for seed in range(3):
+        Game(
+            *players, 3, Deck(random.Random(seed)), NullSink()
+        ).conduct_round()
+        assert sum(strategy._seen) == 12, "Two finished rounds of 6 cards"
+    result = compare_strategies("card_counting", "default", max_deals=200)
+    assert result.mean > 0
+    assert result.significant()
@@ -0,0 +1,94 @@
+"""Tests for the card images."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from card_images import (
+    CARD_IMAGE_MAP,
+    GAP,
+    ImageCache,
+    SpriteAtlas,
+    get_atlas,
+    image_path,
+)
+from cards import KIND_NAMES, CardKind
+from sushi_go_game import CARDS
+
+# card_images itself imports without Pillow
+pytest.importorskip("PIL")
+
+
+def test_pil_is_imported_lazily() -> None:
+    """Test that importing the image modules does not import PIL."""
+    code = "import sys, ignore; print('PIL' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.join(os.path.dirname(__file__), "..", "src"),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert output.strip() == "False"
+
+
+def test_image_cache_decodes_once() -> None:
+    """Test that each file is decoded once and the cache is bounded."""
+    cache = ImageCache(maxsize=2)
+    paths = [image_path(name) for name in ("Maki 1", "Tempura", "Wasabi")]
+    first = cache.load(paths[0])
+    assert cache.load(paths[0]) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert first.mode == "RGB"
+    cache.load(paths[1])
+    cache.load(paths[2])
+    assert len(cache) == 2
+    cache.load(paths[0])
+    assert cache.misses == 4, "The oldest image should have been evicted"
+
+
+def test_atlas_sprites() -> None:
+    """Test that the atlas holds one resized sprite per kind."""
+    assert set(CARD_IMAGE_MAP) == set(KIND_NAMES)
+    cache = ImageCache()
+    atlas = SpriteAtlas((20, 30), image_cache=cache)
+    assert atlas.image.size == (20 * len(KIND_NAMES), 30)
+    assert cache.misses == len(KIND_NAMES)
+    for kind, sprite in enumerate(atlas.sprites):
+        assert sprite.size == (20, 30)
+        assert sprite.tobytes() == atlas.image.crop(atlas.box(kind)).tobytes()
+    assert get_atlas() is get_atlas()
+
+
+def test_render_tables() -> None:
+    """Test that tables are drawn from the sprites, one row per table."""
+    atlas = SpriteAtlas((20, 30))
+    tables = [
+        [CARDS[CardKind.TEMPURA], CARDS[CardKind.WASABI]],
+        [CardKind.MAKI_1, "Squid Nigiri", CardKind.DUMPLING],
+    ]
+    image = atlas.render_tables(tables)
+    assert image.size == (3 * (20 + GAP) + GAP, 2 * (30 + GAP) + GAP)
+    left = GAP + 20 + GAP
+    top = GAP + 30 + GAP
+    drawn = image.crop((left, top, left + 20, top + 30))
+    squid = atlas.sprites[CardKind.NIGIRI_SQUID]
+    assert drawn.tobytes() == squid.tobytes()
+    assert atlas.render_cards([]).size == (20 + 2 * GAP, 30 + 2 * GAP)
+
+
+def test_palette_atlas() -> None:
+    """Test that the palette atlas draws palette canvases on white."""
+    atlas = SpriteAtlas((20, 30)).to_palette()
+    assert atlas.image.mode == "P"
+    assert len(atlas.sprites) == len(KIND_NAMES)
+    canvas = atlas.render_cards([CardKind.SASHIMI])
+    assert canvas.mode == "P"
+    assert canvas.convert("RGB").getpixel((0, 0)) == (255, 255, 255)
+    assert get_atlas(palette=True) is get_atlas(palette=True)
@@ -0,0 +1,48 @@
+"""Tests for the integer card model."""
+
+import os
+import sys
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from cards import (
+    BASE_SCORES,
+    DECK_COUNTS,
+    KIND_NAMES,
+    CardKind,
+    score_counts,
+)
+from sushi_go_game import CARDS, Card, Deck
+
+
+def test_card_flyweights() -> None:
+    """Test that each card kind has exactly one shared instance."""
+    assert Card("Tempura") is Card("Tempura"), "Cards should be shared"
+    assert Card.of(CardKind.SASHIMI) is Card("Sashimi")
+    assert len({id(card) for card in Deck().cards}) == len(KIND_NAMES), (
+        "A deck should only hold one object per card kind"
+    )
+    assert Card("Pizza") is not Card("Pizza"), "Invalid cards are not shared"
+
+
+def test_lookup_tables() -> None:
+    """Test that the lookup tables line up with the card kinds."""
+    for kind, card in enumerate(CARDS):
+        assert card.kind == kind
+        assert card.card_type == KIND_NAMES[kind]
+        assert card.score() == BASE_SCORES[kind]
+    assert sum(DECK_COUNTS) == 94, "Deck should contain 94 cards"
+
+
+def test_score_counts() -> None:
+    """Test scoring a table from its count vector."""
+    counts = [0] * len(KIND_NAMES)
+    counts[CardKind.MAKI_3] = 1
+    counts[CardKind.NIGIRI_SALMON] = 1
+    counts[CardKind.WASABI] = 1
+    counts[CardKind.TEMPURA] = 3
+    counts[CardKind.DUMPLING] = 2
+    # 3 maki + 2 salmon + 6 wasabi + 5 tempura + 3 dumplings
+    assert score_counts(counts) == 19
@@ -0,0 +1,93 @@
+"""Tests for the maximizer decision cache."""
+
+import os
+import random
+import sys
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from cards import DEFAULT_RULES, KIND_NAMES, NUM_KINDS, CardKind
+from decision_cache import DecisionCache
+from events import NullSink
+from rules import Flat, Sets
+from strategies import MAXIMIZER
+from sushi_go_game import (
+    Card,
+    Deck,
+    Game,
+    Player,
+    RandomTable,
+    SushiGoMaximizer,
+    TableTally,
+)
+
+
+def test_cache_matches_maximizer() -> None:
+    """Test that cached decisions match the maximizer."""
+    rng = random.Random(0)
+    cache = DecisionCache()
+    player = Player("Tester")
+    for _ in range(2000):
+        player.hand = [Card(rng.choice(KIND_NAMES)) for _ in range(4)]
+        table_cards = [Card(rng.choice(KIND_NAMES)) for _ in range(3)]
+        table = RandomTable(table_cards, player, None)
+        expected = SushiGoMaximizer(player, table).select_best_card()
+        cached = SushiGoMaximizer(player, table, cache).select_best_card()
+        assert cached is expected, "Cache should not change the decision"
+    assert cache.hits > 0, "Repeated states should hit the cache"
+    assert cache.hits + cache.misses == 2000
+
+
+def test_cache_eviction() -> None:
+    """Test that the cache stays within its bound."""
+    cache = DecisionCache(maxsize=2)
+    table = RandomTable([], None, None)
+    for name in ["Tempura", "Sashimi", "Wasabi", "Tempura"]:
+        cache.select_best_card([Card(name)], table.common_tally)
+    assert len(cache) == 2
+    assert cache.info()["evictions"] == 2
+    assert cache.misses == 4, "Tempura was evicted before it was reused"
+
+
+def test_prewarm() -> None:
+    """Test that a pre-warmed cache answers every lookup."""
+    cache = DecisionCache(maxsize=None)
+    assert cache.prewarm(1) == 10 * 48, "10 hands against 48 table states"
+    cache.prewarm(3)
+    game = Game(
+        "Player 1", "Player 2", 3, Deck(), sink=NullSink(), cache=cache
+    )
+    game.conduct_round()
+    assert cache.misses == 0, "Every state should be pre-warmed"
+    assert cache.hits == 12, "Each player makes 2 cached decisions per round"
+    try:
+        DecisionCache(maxsize=10).prewarm(2)
+        raise AssertionError("Should have raised ValueError")
+    except ValueError:
+        pass
+
+
+def test_variant_tallies_bypass_the_cache() -> None:
+    """Test that a shared cache answers a variant with its own rules."""
+    cache = DecisionCache()
+    variant = DEFAULT_RULES.variant({CardKind.TEMPURA: Sets(2, 20)})
+    hand = [Card("Tempura"), Card("Sashimi")]
+    assert cache.select_best_card(hand, TableTally()) is hand[1]
+    chosen = cache.select_best_card(hand, TableTally(rules=variant))
+    assert chosen is hand[0], "A tempura is worth 20 in the variant"
+    assert cache.select_best_card(hand, TableTally()) is hand[1]
+    assert len(cache) == 1
+
+
+def test_negative_values_match_maximizer() -> None:
+    """Test that cached decisions match when every value is below -1."""
+    variant = DEFAULT_RULES.variant(
+        {kind: Flat(-3 - kind) for kind in range(NUM_KINDS)}
+    )
+    hand = [Card("Tempura"), Card("Maki 1"), Card("Sashimi")]
+    table = RandomTable([], None, None, rules=variant)
+    expected = MAXIMIZER.choose(hand, table)
+    assert expected is hand[1], "Maki 1 loses the fewest points"
+    assert MAXIMIZER.choose(hand, table, cache=DecisionCache()) is expected
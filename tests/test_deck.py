@@ -0,0 +1,54 @@
+"""Tests for the cursor-based deck."""
+
+import os
+import random
+import sys
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from cards import DECK_COUNTS, CardKind
+from sushi_go_game import Card, Deck, Player
+
+
+def test_deal_updates_counts() -> None:
+    """Test that dealing moves the cursor and updates the counts."""
+    deck = Deck(random.Random(1))
+    hand = deck.deal(9)
+    assert len(hand) == 9, "Should deal 9 cards"
+    assert len(deck) == 85, "Deck should have 85 cards left"
+    for kind, count in enumerate(DECK_COUNTS):
+        dealt = sum(1 for card in hand if card.kind == kind)
+        assert deck.counts[kind] == count - dealt
+    assert sorted(deck.cards + hand, key=lambda card: card.kind) == [
+        Card.of(kind)
+        for kind, count in enumerate(DECK_COUNTS)
+        for _ in range(count)
+    ], "Dealt and remaining cards should make up the full deck"
+
+
+def test_seeded_decks_match() -> None:
+    """Test that two decks with the same seed deal the same cards."""
+    deck1 = Deck(random.Random(7))
+    deck2 = Deck(random.Random(7))
+    assert deck1.deal(3) + deck1.deal(3) == deck2.deal(6)
+    counts = deck1.deal_counts(4)
+    assert counts == deck2.deal_counts(4), "Count deals should match"
+    assert sum(counts) == 4
+
+
+def test_stacked_deck() -> None:
+    """Test that assigning cards stacks the deck in order."""
+    deck = Deck()
+    deck.cards = [Card("Wasabi"), Card("Tempura"), Card("Sashimi")]
+    assert deck.counts[CardKind.WASABI] == 1
+    player = Player("Tester")
+    player.assign_cards(deck, 2)
+    assert [str(card) for card in player.hand] == ["Wasabi", "Tempura"]
+    assert len(deck) == 1, "One card should be left"
+    try:
+        deck.deal(2)
+        raise AssertionError("Should have raised ValueError")
+    except ValueError:
+        pass
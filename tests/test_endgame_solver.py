@@ -0,0 +1,164 @@
+"""Tests for the exact endgame solver."""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from cards import (
+    DECK_COUNTS,
+    MAKI_MAJORITY_RULES,
+    NUM_KINDS,
+    pack,
+    score_counts,
+    unpack,
+)
+from endgame_solver import SEAT1, SEAT2, EndgamePlayer, EndgameSolver
+from events import NullSink
+from sushi_go_game import Deck, Game
+
+
+def _score(kinds):
+    return score_counts(unpack(pack(kinds)))
+
+
+def _minimax(hand1, hand2, table1, table2, to_move):
+    """Brute-force final score difference of a position."""
+    if not (hand1 if to_move == SEAT1 else hand2):
+        return _score(table1) - _score(table2)
+    values = []
+    if to_move == SEAT1:
+        for kind in set(hand1):
+            rest = list(hand1)
+            rest.remove(kind)
+            values.append(
+                _minimax(rest, hand2, [*table1, kind], table2, SEAT2)
+            )
+        return max(values)
+    for kind in set(hand2):
+        rest = list(hand2)
+        rest.remove(kind)
+        values.append(_minimax(rest, hand1, table1, [*table2, kind], SEAT1))
+    return min(values)
+
+
+def _random_position(rng, size):
+    pool = [
+        kind for kind in range(NUM_KINDS) for _ in range(DECK_COUNTS[kind])
+    ]
+    cards = rng.sample(pool, 2 * size + 8)
+    return (
+        cards[:size],
+        cards[size : 2 * size],
+        cards[2 * size : 2 * size + 4],
+        cards[2 * size + 4 :],
+    )
+
+
+def test_solver_matches_brute_force() -> None:
+    """Test exact values against plain minimax on random positions."""
+    rng = random.Random(0)
+    solver = EndgameSolver()
+    for _ in range(100):
+        hand1, hand2, table1, table2 = _random_position(rng, rng.randint(1, 4))
+        value, kind = solver.solve(hand1, hand2, table1, table2)
+        assert value == _minimax(hand1, hand2, table1, table2, SEAT1)
+        values = solver.move_values(hand1, hand2, table1, table2)
+        assert values[kind] == max(values.values())
+        assert max(values.values()) == value
+
+
+def test_solver_seat2_to_move() -> None:
+    """Test positions where seat 1 already played this turn."""
+    rng = random.Random(1)
+    solver = EndgameSolver()
+    for _ in range(50):
+        size = rng.randint(1, 4)
+        hand1, hand2, table1, table2 = _random_position(rng, size)
+        hand1 = hand1[1:]
+        value, kind = solver.solve(hand1, hand2, table1, table2, SEAT2)
+        assert value == _minimax(hand1, hand2, table1, table2, SEAT2)
+        values = solver.move_values(hand1, hand2, table1, table2, SEAT2)
+        assert values[kind] == min(values.values()) == value
+
+
+def test_store_reuse_and_persistence(tmp_path) -> None:
+    """Test that solved positions are reused and survive a save."""
+    position: tuple[list[int], list[int], list[int], list[int]] = (
+        [3, 4, 4, 5, 9],
+        [4, 6, 3, 3, 8],
+        [],
+        [],
+    )
+    solver = EndgameSolver()
+    expected = solver.solve(*position)
+    solved_nodes = solver.nodes
+    assert solver.solve(*position) == expected
+    assert solver.nodes == solved_nodes + 1, "Root should be a store hit"
+
+    path = tmp_path / "store.pkl"
+    solver.save(path)
+    loaded = EndgameSolver.load(path)
+    assert len(loaded) == len(solver)
+    assert loaded.solve(*position) == expected
+    assert loaded.nodes == 1
+
+
+def test_endgame_player_in_game() -> None:
+    """Test that the solver's player never does worse than predicted."""
+    for seed in range(20):
+        solver = EndgameSolver()
+        game = Game(
+            EndgamePlayer("Solver", solver),
+            "Player 2",
+            1,
+            Deck(random.Random(seed)),
+            sink=NullSink(),
+        )
+        # Play the first card of the round and switch, then solve
+        game.player1.assign_cards(game.deck, 3)
+        game.player2.assign_cards(game.deck, 3)
+        for player in (game.player1, game.player2):
+            card = player.play_max_scoring_card()
+            game.table.update_table_with_card(player, card)
+        game.switch_hands()
+        predicted, _ = solver.solve_game(game)
+
+        while game.player1.hand:
+            for player in (game.player1, game.player2):
+                card = player.play_best_card(game.table)
+                game.table.update_table_with_card(player, card)
+            game.switch_hands()
+        final = game.table.score(game.player1) - game.table.score(game.player2)
+        assert final >= predicted
+
+
+def test_tables_with_finished_sets() -> None:
+    """Test that completed sets on the tables keep their points."""
+    solver = EndgameSolver()
+    table1 = [3, 3, 4, 4, 4, 5, 5, 5, 5, 5, 5]
+    value, _ = solver.solve([], [], table1, [6, 9])
+    # Squid nigiri on wasabi is worth 12
+    assert value == _score(table1) - 12 == 18
+
+
+def test_other_rules_are_rejected() -> None:
+    """Test that the solver refuses a game it cannot score."""
+    game = Game(
+        EndgamePlayer("Solver", EndgameSolver()),
+        "Player 2",
+        1,
+        Deck(random.Random(0)),
+        sink=NullSink(),
+        rules=MAKI_MAJORITY_RULES,
+    )
+    game.player1.assign_cards(game.deck, 2)
+    with pytest.raises(ValueError):
+        EndgameSolver().solve_game(game)
+    with pytest.raises(ValueError):
+        game.player1.play_best_card(game.table)
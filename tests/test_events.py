@@ -0,0 +1,59 @@
+"""Tests for the game event sinks."""
+
+import os
+import random
+import sys
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from events import EventSink, NullSink, StructuredSink
+from sushi_go_game import Deck, Game
+
+
+def test_null_sink_is_silent(capsys) -> None:
+    """Test that a headless game prints nothing."""
+    game = Game("Player 1", "Player 2", 2, Deck(), sink=NullSink())
+    game.conduct_round()
+    assert capsys.readouterr().out == "", "Headless games should not print"
+    assert len(game.round_scores) == 2
+
+
+def test_console_sink_output(capsys) -> None:
+    """Test the printed output of a game."""
+    game = Game("Player 1", "Player 2", 1, Deck(random.Random(0)))
+    game.conduct_round()
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1] == "Round 1"
+    assert lines[3].startswith("Player 1's hand: ")
+    assert lines.count("Switch Hands - Sushi Go!") == 3
+    score1, score2 = game.round_scores[0]
+    assert f"Player 1's final score: {score1}" in lines
+    assert f"Player 2's final score: {score2}" in lines
+
+
+def test_structured_sink_events() -> None:
+    """Test the events recorded for a game."""
+    sink = StructuredSink()
+    game = Game("Player 1", "Player 2", 2, Deck(random.Random(1)), sink=sink)
+    game.conduct_round()
+    kinds = [event["event"] for event in sink.events]
+    assert kinds.count("deal") == 2
+    assert kinds.count("play") == 12, "Each player plays 3 cards per round"
+    assert kinds.count("swap") == 6
+    assert kinds[-1] == "game_end"
+    scores = [e["scores"] for e in sink.events if e["event"] == "round_score"]
+    assert scores == [list(round_scores) for round_scores in game.round_scores]
+
+
+def test_disabled_sink_is_not_called() -> None:
+    """Test that the engine skips a disabled sink."""
+
+    class FailingSink(EventSink):
+        enabled = False
+
+        def play(self, seat, player, card):
+            raise AssertionError("Disabled sinks should not be called")
+
+    Game("Player 1", "Player 2", 1, Deck(), sink=FailingSink()).conduct_round()
@@ -0,0 +1,124 @@
+"""Tests for the game logs."""
+
+import os
+import random
+import struct
+import sys
+import time
+
+import pytest
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from game_log import (
+    DEAL,
+    GAME_END,
+    PLAY,
+    ROUND_SCORE,
+    SWAP,
+    GameLogWriter,
+    LogSink,
+    read_log,
+)
+from sushi_go_game import Deck, Game
+from tournament import log_path, run_tournament
+
+
+def _write_games(path, log_format, num_games=50):
+    games = []
+    with GameLogWriter(path, log_format, queue_size=8) as writer:
+        sink = LogSink(writer)
+        for seed in range(num_games):
+            game = Game(
+                "Player 1", "Player 2", 3, Deck(random.Random(seed)), sink=sink
+            )
+            game.conduct_round()
+            games.append(game)
+    assert writer.games == num_games
+    return games
+
+
+@pytest.mark.parametrize("log_format", ["jsonl", "binary"])
+def test_log_round_trip(tmp_path, log_format) -> None:
+    """Test that every event of every game is read back."""
+    path = tmp_path / f"games.{log_format}"
+    games = _write_games(path, log_format)
+    logged = list(read_log(path, log_format))
+    assert [game_id for game_id, _ in logged] == list(range(len(games)))
+    for game, (_, events) in zip(games, logged, strict=True):
+        codes = [event[0] for event in events]
+        assert codes.count(DEAL) == 3
+        assert codes.count(PLAY) == 18
+        assert codes.count(SWAP) == 9
+        scores = [event[2] for event in events if event[0] == ROUND_SCORE]
+        assert scores == game.round_scores
+        assert events[-1][0] == GAME_END
+        assert all(len(hand) == 3 for hand in events[0][2])
+
+
+def test_formats_agree(tmp_path) -> None:
+    """Test that both formats hold the same events."""
+    _write_games(tmp_path / "games.jsonl", "jsonl", 10)
+    _write_games(tmp_path / "games.bin", "binary", 10)
+    assert list(read_log(tmp_path / "games.jsonl", "jsonl")) == list(
+        read_log(tmp_path / "games.bin", "binary")
+    )
+
+
+def test_closed_writer(tmp_path) -> None:
+    """Test that a closed writer rejects games and bad formats fail."""
+    writer = GameLogWriter(tmp_path / "games.jsonl")
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.submit(0, [])
+    with pytest.raises(ValueError):
+        GameLogWriter(tmp_path / "games.xml", "xml")
+
+
+def test_tournament_logs(tmp_path) -> None:
+    """Test that a tournament logs each game under its index."""
+    run_tournament(
+        25, workers=1, chunk_size=10, log_dir=tmp_path, log_format="binary"
+    )
+    game_ids = []
+    for start in (0, 10, 20):
+        path = log_path(tmp_path, start, "binary")
+        game_ids += [game_id for game_id, _ in read_log(path, "binary")]
+    assert game_ids == list(range(25))
+
+
+def test_encode_error_is_raised(tmp_path) -> None:
+    """Test that an encoding error reaches the caller without a hang."""
+    writer = GameLogWriter(tmp_path / "games.bin", "binary", queue_size=1)
+    writer.submit(0, [(PLAY, 0, 999)])  # no such kind: struct.error
+    for game_id in range(1, 200):
+        try:
+            writer.submit(game_id, [(SWAP,)])
+        except struct.error:
+            break
+        time.sleep(0.01)
+    else:
+        pytest.fail("submit should raise the writer's error")
+    with pytest.raises(struct.error):
+        writer.close()
+
+
+def test_full_queue_drops(tmp_path) -> None:
+    """Test that a non-blocking writer drops games instead of waiting."""
+    writer = GameLogWriter(tmp_path / "games.jsonl", queue_size=1, block=False)
+    for game_id in range(2000):
+        writer.submit(game_id, [(SWAP,)] * 50)
+    writer.close()
+    assert writer.games + writer.dropped == 2000
+    assert len(list(read_log(tmp_path / "games.jsonl"))) == writer.games
+
+
+def test_default_writer_keeps_every_game(tmp_path) -> None:
+    """Test that by default a full queue waits instead of dropping."""
+    writer = GameLogWriter(tmp_path / "games.jsonl", queue_size=1)
+    for game_id in range(500):
+        writer.submit(game_id, [(SWAP,)] * 50)
+    writer.close()
+    assert (writer.games, writer.dropped) == (500, 0)
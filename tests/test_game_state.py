@@ -0,0 +1,91 @@
+"""Tests for immutable round positions."""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from cards import CardKind, score_counts
+from events import NullSink
+from game_state import SEAT1, SEAT2, GameState
+from strategies import DEFAULT_STRATEGY, Strategy, seat_of
+from sushi_go_game import Deck, Game, Player
+
+
+class _Follower(Strategy):
+    """Plays the default strategy and checks a ``GameState`` follows."""
+
+    def __init__(self):
+        self.game = None
+        self.states = []
+
+    def choose(self, hand, table, first=False, cache=None):
+        state = GameState.from_game(self.game)
+        assert state.to_move == seat_of(hand, table)
+        if self.states and not first:
+            assert state == self.states[-1][0].apply(self.states[-1][1])
+        card = DEFAULT_STRATEGY.choose(hand, table, first, cache)
+        self.states.append((state, card.kind))
+        return card
+
+
+def test_follows_game() -> None:
+    """Test that applying each move replays a ``Game``."""
+    follower = _Follower()
+    players = (Player("A", follower), Player("B", follower))
+    game = Game(*players, 3, Deck(random.Random(8)), NullSink())
+    follower.game = game
+    game.conduct_round()
+    assert len(follower.states) == 18
+    last, kind = follower.states[-1]
+    final = last.apply(kind)
+    assert final.is_over
+    assert final.round_index == 2
+    assert final.scores() == game.round_scores[-1]
+
+
+def test_apply_branches_and_transposes() -> None:
+    """Test that states are values and transpositions are equal."""
+    sashimi, tempura, egg = (
+        CardKind.SASHIMI,
+        CardKind.TEMPURA,
+        CardKind.NIGIRI_EGG,
+    )
+    root = GameState.from_kinds(
+        [sashimi, sashimi, tempura], [tempura, sashimi, egg]
+    )
+    assert root.moves() == (tempura, sashimi)
+    assert root == GameState.from_kinds(
+        [tempura, sashimi, sashimi], [egg, sashimi, tempura]
+    ), "Hands are counts, not lists"
+    left = root.apply(sashimi).apply(sashimi)
+    assert left.to_move == SEAT1, "Hands were switched"
+    hand = left.hand(SEAT1)
+    assert (hand[tempura], hand[egg], sum(hand)) == (1, 1, 2)
+    right = root.apply(tempura).apply(tempura)
+    assert left != right
+    assert root == GameState.from_kinds(
+        [sashimi, sashimi, tempura], [tempura, sashimi, egg]
+    ), "Applying leaves the state as it was"
+    # Both seats play the same two cards in the other order
+    left = left.apply(tempura).apply(tempura)
+    right = right.apply(sashimi).apply(sashimi)
+    assert left == right
+    assert hash(left) == hash(right)
+    assert left.key == right.key
+    assert left.key != root.key
+    after = left.apply(left.moves()[0])
+    final = after.apply(after.moves()[0])
+    assert final.is_over
+    assert final.scores() == (
+        score_counts(final.table(SEAT1)),
+        score_counts(final.table(SEAT2)),
+    )
+    with pytest.raises(ValueError):
+        root.apply(egg)
+    assert root.apply(sashimi).to_move == SEAT2
@@ -0,0 +1,104 @@
+"""Tests for the phase timers."""
+
+import os
+import random
+import sys
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from events import NullSink
+from instrumentation import NullTimer, PhaseTimer, profile_game
+from sushi_go_game import Deck, Game
+
+
+def _game(seed, timer=None):
+    return Game(
+        "Player 1",
+        "Player 2",
+        3,
+        Deck(random.Random(seed)),
+        sink=NullSink(),
+        timer=timer,
+    )
+
+
+def test_phase_counts() -> None:
+    """Test that every phase is counted once per occurrence."""
+    timer = PhaseTimer()
+    game = _game(0, timer)
+    game.conduct_round()
+    # 3 rounds of 3-card hands: 1 first play and 2 more turns per round
+    assert timer.counts == {
+        "deal": 3,
+        "first_play": 6,
+        "table": 18,
+        "swap": 9,
+        "play": 12,
+        "select": 12,
+        "score": 3,
+    }
+    assert all(total >= 0 for total in timer.totals.values())
+    assert "first_play" in timer.report()
+
+
+def test_timing_does_not_change_games() -> None:
+    """Test that timed and untimed games play the same."""
+    for seed in range(20):
+        timed = _game(seed, PhaseTimer())
+        untimed = _game(seed)
+        timed.conduct_round()
+        untimed.conduct_round()
+        assert timed.round_scores == untimed.round_scores
+
+
+def test_null_timer_never_reads_clock() -> None:
+    """Test that a game with instrumentation off reads no clock."""
+
+    class Tripwire(NullTimer):
+        @staticmethod
+        def clock():
+            raise AssertionError("Clock read while timing is off")
+
+    game = _game(0, Tripwire())
+    game.conduct_round()
+    assert game.player1.timer is None
+
+
+def test_merge() -> None:
+    """Test that merged timers add their counters."""
+    first, second = PhaseTimer(), PhaseTimer()
+    first.add("deal", 10)
+    second.add("deal", 5)
+    second.add("score", 1)
+    first.merge(second)
+    assert first.as_dict() == {
+        "deal": {"ns": 15, "calls": 2},
+        "score": {"ns": 1, "calls": 1},
+    }
+
+
+def test_profile_game() -> None:
+    """Test that a profiled game is played and reported."""
+    game = _game(0)
+    stats = profile_game(game)
+    assert len(game.round_scores) == 3
+    assert stats.total_calls > 0
+
+
+def test_nested_phase_is_not_counted_twice() -> None:
+    """Test that the time of a nested phase is shared out once."""
+    timer = PhaseTimer()
+    timer.add("play", 600)
+    timer.add("select", 500)
+    timer.add("table", 400)
+    lines = timer.report().splitlines()
+    assert [line.split()[0] for line in lines[1:]] == [
+        "play",
+        "select",
+        "table",
+    ]
+    assert lines[2].startswith("  select"), "Listed under its parent"
+    shares = [line.split()[-1] for line in lines[1:]]
+    assert shares == ["60.0%", "50.0%", "40.0%"]
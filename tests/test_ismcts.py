@@ -0,0 +1,89 @@
+"""Tests for the ISMCTS player."""
+
+import os
+import random
+import sys
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from cards import DEFAULT_RULES, CardKind, pack, unpack
+from events import NullSink
+from ismcts import ISMCTSPlayer
+from rules import Sets
+from sushi_go_game import Card, Deck, Game, Player, RandomTable
+
+
+def test_pack_unpack() -> None:
+    """Test packing card kinds into a count integer."""
+    packed = pack([3, 3, 9, 0])
+    counts = unpack(packed)
+    assert counts[3] == 2 and counts[9] == 1 and counts[0] == 1
+    assert sum(counts) == 4
+
+
+def test_iteration_budget() -> None:
+    """Test that a move runs the configured number of simulations."""
+    bot = ISMCTSPlayer("Bot", iterations=300, rng=random.Random(0))
+    bot.hand = [Card("Tempura"), Card("Sashimi"), Card("Wasabi")]
+    bot.choose(0, 0, None, 2)
+    assert bot.last_iterations == 300
+    assert bot.transpositions, "Search should fill the transposition table"
+
+    bot.time_budget = 0.01
+    bot.choose(0, 0, None, 2)
+    assert bot.last_iterations > 0, "Time budget should allow some search"
+
+
+def test_known_endgame() -> None:
+    """Test that the bot completes a sashimi set when it can."""
+    bot = ISMCTSPlayer("Bot", iterations=400, rng=random.Random(0))
+    bot.hand = [Card("Sashimi"), Card("Maki 3")]
+    table = pack([Card("Sashimi").kind, Card("Sashimi").kind])
+    assert bot.choose(table, 0, [Card("Egg Nigiri").kind] * 2, 2) == (
+        Card("Sashimi").kind
+    ), "Third sashimi is worth 10 points"
+
+
+def test_first_card_in_seat_two() -> None:
+    """Test that the first search of seat 2 sees the opponent's card."""
+    bot = ISMCTSPlayer("Bot", iterations=100, rng=random.Random(0))
+    bot.transpositions[("stale",)] = [0, {}]
+    opponent = Player("Greedy")
+    bot.hand = [Card("Tempura"), Card("Sashimi"), Card("Wasabi")]
+    table = RandomTable([], opponent, bot)
+    squid = Card("Squid Nigiri")
+    table.add_card(0, squid)
+    bot.play_max_scoring_card(table)
+    assert len(bot.hand) == 2
+    assert ("stale",) not in bot.transpositions, "Cleared each round"
+    # Keys are (mover, pending, my hand, their hand, my table, theirs)
+    assert bot.transpositions
+    assert {key[5] for key in bot.transpositions} >= {pack([squid.kind])}
+
+
+def test_beats_maximizer() -> None:
+    """Test that the bot plays legal games and beats the maximizer."""
+    wins = 0
+    for seed in range(20):
+        bot = ISMCTSPlayer("Bot", iterations=200, rng=random.Random(seed))
+        deck = Deck(random.Random(seed))
+        game = Game(bot, "Greedy", 3, deck, sink=NullSink())
+        game.conduct_round()
+        assert len(game.round_scores) == 3
+        assert not bot.hand, "All cards should be played"
+        bot_total = sum(score for score, _ in game.round_scores)
+        greedy_total = sum(score for _, score in game.round_scores)
+        wins += bot_total > greedy_total
+    assert wins >= 14, f"Bot should win most games, won {wins} of 20"
+
+
+def test_follows_table_rules() -> None:
+    """Test that the search scores with the rules of the table."""
+    variant = DEFAULT_RULES.variant({CardKind.SASHIMI: Sets(1, 20)})
+    bot = ISMCTSPlayer("Bot", iterations=200, rng=random.Random(0))
+    bot.hand = [Card("Tempura"), Card("Sashimi")]
+    table = RandomTable([], bot, Player("Greedy"), rules=variant)
+    assert bot.play_max_scoring_card(table).kind == CardKind.SASHIMI
+    assert bot.rules is variant
@@ -0,0 +1,81 @@
+"""Tests for the multi-player engine."""
+
+import contextlib
+import io
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from events import NullSink, StructuredSink
+from multiplayer import MultiplayerGame
+from sushi_go_game import Card, Deck, Game
+
+
+def test_two_players_match_game() -> None:
+    """Test that a two-player game plays exactly like ``Game``."""
+    for seed in range(20):
+        outputs = []
+        for engine in ("game", "multiplayer"):
+            deck = Deck(random.Random(seed))
+            buffer = io.StringIO()
+            with contextlib.redirect_stdout(buffer):
+                game = (
+                    Game("Player 1", "Player 2", 3, deck)
+                    if engine == "game"
+                    else MultiplayerGame(["Player 1", "Player 2"], 3, deck)
+                )
+                game.conduct_round()
+            outputs.append((buffer.getvalue(), game.round_scores))
+        assert outputs[0] == outputs[1]
+
+
+def test_hands_pass_to_next_seat() -> None:
+    """Test that each seat receives the hand of the seat before it."""
+    sink = StructuredSink()
+    deck = Deck()
+    deck.cards = (
+        [Card("Tempura")] * 3 + [Card("Sashimi")] * 3 + [Card("Dumpling")] * 3
+    )
+    game = MultiplayerGame(["A", "B", "C"], 1, deck, sink=sink)
+    game.conduct_round()
+    swaps = [event for event in sink.events if event["event"] == "swap"]
+    assert swaps[0]["hands"] == [
+        ["Dumpling", "Dumpling"],
+        ["Tempura", "Tempura"],
+        ["Sashimi", "Sashimi"],
+    ]
+    # Every hand visits every seat, so each table gets one of each kind
+    assert game.round_scores == [(1, 1, 1)]
+
+
+def test_five_players() -> None:
+    """Test that five players each play every card dealt to them."""
+    for seed in range(20):
+        game = MultiplayerGame(
+            [f"Player {seat + 1}" for seat in range(5)],
+            3,
+            Deck(random.Random(seed)),
+            hand_size=6,
+            sink=NullSink(),
+        )
+        game.conduct_round()
+        assert len(game.round_scores) == 3
+        assert all(len(scores) == 5 for scores in game.round_scores)
+        assert len(game.deck) == 94 - 5 * 6 * 3
+        assert game.winners()
+
+
+def test_invalid_games() -> None:
+    """Test that tables of the wrong size are rejected."""
+    with pytest.raises(ValueError):
+        MultiplayerGame(["Solo"], 3, Deck())
+    with pytest.raises(ValueError):
+        MultiplayerGame([f"P{seat}" for seat in range(6)], 3, Deck())
+    with pytest.raises(ValueError):
+        MultiplayerGame(["A", "B", "C", "D", "E"], 3, Deck(), hand_size=7)
@@ -0,0 +1,146 @@
+"""Tests for the replay renderer."""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from card_images import GAP, get_atlas
+from cards import MAKI_MAJORITY_RULES
+from game_log import LogSink
+from replay_render import (
+    extreme_games,
+    game_totals,
+    margin,
+    render_games,
+    render_strip,
+)
+from replay_store import ReplayStore, ReplayWriter
+from sushi_go_game import Deck, Game
+from tournament import play_game
+
+pytest.importorskip("PIL")
+
+CARD_SIZE = (16, 24)
+
+
+@pytest.fixture
+def replay_path(tmp_path):
+    """Replay file of 12 tournament games."""
+    path = tmp_path / "games.sgr"
+    with ReplayWriter(path) as writer:
+        sink = LogSink(writer)
+        for game_index in range(12):
+            sink.game_id = game_index
+            play_game(7, game_index, sink=sink)
+    return str(path)
+
+
+def test_strip_draws_every_round(replay_path) -> None:
+    """Test that the strip holds each round's tables, one row per seat."""
+    atlas = get_atlas(CARD_SIZE, palette=True)
+    with ReplayStore(replay_path) as store:
+        turns = list(store.turns(0))
+    strip = render_strip(turns, card_size=CARD_SIZE)
+    width, height = CARD_SIZE
+    assert strip.size == (3 * (width + GAP) + GAP, 6 * (height + GAP) + GAP)
+    for turn in turns:
+        for seat, kind in enumerate(turn.played):
+            left = GAP + turn.turn * (width + GAP)
+            top = GAP + (2 * (turn.round - 1) + seat) * (height + GAP)
+            drawn = strip.crop((left, top, left + width, top + height))
+            assert drawn.tobytes() == atlas.sprites[kind].tobytes()
+
+
+def test_totals_and_extremes(replay_path) -> None:
+    """Test scores from the records and the choice of extreme games."""
+    with ReplayStore(replay_path) as store:
+        totals = [game_totals(store.turns(i)) for i in range(len(store))]
+        lowest, highest = extreme_games(store, 2)
+    for game_index, totals_of_game in enumerate(totals):
+        round_scores = play_game(7, game_index).round_scores
+        assert totals_of_game == [
+            sum(scores[seat] for scores in round_scores) for seat in (0, 1)
+        ]
+    margins = sorted(margin(game) for game in totals)
+    assert [margin(totals[i]) for i in lowest] == margins[:2]
+    assert [margin(totals[i]) for i in highest] == margins[::-1][:2]
+
+
+def test_totals_with_rules(tmp_path) -> None:
+    """Test that totals are scored with the rules the game was played by."""
+    path = tmp_path / "games.sgr"
+    rules = MAKI_MAJORITY_RULES
+    games = []
+    with ReplayWriter(path) as writer:
+        for seed in range(10):
+            game = Game(
+                "A",
+                "B",
+                3,
+                Deck(random.Random(seed)),
+                sink=LogSink(writer, game_id=seed),
+                rules=rules,
+            )
+            game.conduct_round()
+            games.append(game)
+    with ReplayStore(path) as store:
+        for index, game in enumerate(games):
+            assert game_totals(store.turns(index), rules=rules) == [
+                sum(scores[seat] for scores in game.round_scores)
+                for seat in (0, 1)
+            ]
+
+
+def test_render_games(replay_path, tmp_path) -> None:
+    """Test rendering PNGs and GIFs in this process and in a pool."""
+    from PIL import Image
+
+    out_dir = tmp_path / "renders"
+    pngs = render_games(
+        replay_path, [3, 1], out_dir, card_size=CARD_SIZE, workers=1
+    )
+    assert [os.path.basename(path) for path in pngs] == [
+        "game-0000000003.png",
+        "game-0000000001.png",
+    ]
+    gifs = render_games(
+        replay_path,
+        range(4),
+        out_dir,
+        "gif",
+        card_size=CARD_SIZE,
+        workers=2,
+        chunk_size=2,
+    )
+    assert len(gifs) == 4
+    with Image.open(gifs[3]) as gif:
+        frames = getattr(gif, "n_frames", 1)
+        assert frames == 1 + 9, "One empty frame, then one per turn"
+        gif.seek(frames - 1)
+        last = gif.convert("RGB")
+    with Image.open(pngs[0]) as png:
+        assert png.size == last.size
+    with pytest.raises(ValueError):
+        render_games(replay_path, [0], out_dir, "bmp")
+
+
+def test_overlapping_extremes_render_once(replay_path, tmp_path) -> None:
+    """Test that a game picked at both ends is rendered once."""
+    with ReplayStore(replay_path) as store:
+        lowest, highest = extreme_games(store, 8)
+    assert set(lowest) & set(highest)
+    paths = render_games(
+        replay_path,
+        lowest + highest,
+        tmp_path / "renders",
+        card_size=CARD_SIZE,
+        workers=1,
+    )
+    assert len(paths) == len(set(paths)) == 12
+    assert len(os.listdir(tmp_path / "renders")) == 12
@@ -0,0 +1,126 @@
+"""Tests for the memory-mapped replay store."""
+
+import mmap
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from cards import MAKI_MAJORITY_RULES
+from game_log import GameLogWriter, LogSink
+from replay_store import ReplayStore, ReplayWriter, convert_log, replay_game
+from sushi_go_game import Deck, Game
+
+
+def _play(seeds, sink, rules=None):
+    games = []
+    for seed in seeds:
+        game = Game(
+            "Player 1",
+            "Player 2",
+            3,
+            Deck(random.Random(seed)),
+            sink=sink,
+            rules=rules,
+        )
+        game.conduct_round()
+        games.append(game)
+    return games
+
+
+def test_random_access(tmp_path) -> None:
+    """Test that games are found by id and read without copies."""
+    path = tmp_path / "games.sgr"
+    with ReplayWriter(path) as writer:
+        sink = LogSink(writer, game_id=100)
+        _play(range(30), sink)
+    with ReplayStore(path) as store:
+        assert len(store) == 30
+        index = store.find(123)
+        assert index == 23 and store.game_id(index) == 123
+        assert store.num_turns(index) == 9
+        records = store.game_records(index)
+        assert isinstance(records.obj, mmap.mmap), "Views should be zero-copy"
+        assert len(records) == 9 * store.record.size
+        records.release()
+        with pytest.raises(KeyError):
+            store.find(5)
+        assert [game_id for game_id, _ in store] == list(range(100, 130))
+
+
+def test_ids_must_increase(tmp_path) -> None:
+    """Test that a game id out of order is refused before it is written."""
+    path = tmp_path / "games.sgr"
+    with ReplayWriter(path) as writer:
+        _play(range(2), LogSink(writer, game_id=5))
+        with pytest.raises(ValueError):
+            _play([2], LogSink(writer, game_id=6))
+        assert writer.games == 2
+    with ReplayStore(path) as store:
+        assert store.find(6) == 1
+
+
+def test_replay_matches_game(tmp_path) -> None:
+    """Test that rebuilt games continue exactly as they were played."""
+    path = tmp_path / "games.sgr"
+    with ReplayWriter(path) as writer:
+        games = _play(range(20), LogSink(writer))
+    with ReplayStore(path) as store:
+        for index, original in enumerate(games):
+            turns = list(store.turns(index))
+            final = replay_game(store, index, len(turns))
+            assert final.round_scores == original.round_scores
+            for turn, record in enumerate(turns):
+                game = replay_game(store, index, turn)
+                assert len(game.round_scores) == record.round - 1
+                # Replaying the turn from the rebuilt state plays the
+                # same cards the log recorded
+                played = []
+                for player in (game.player1, game.player2):
+                    card = (
+                        player.play_max_scoring_card()
+                        if record.turn == 0
+                        else player.play_best_card(game.table)
+                    )
+                    game.table.update_table_with_card(player, card)
+                    played.append(card.kind)
+                assert played == record.played
+
+
+def test_replay_with_rules(tmp_path) -> None:
+    """Test that games of other rules are rebuilt with their scores."""
+    path = tmp_path / "games.sgr"
+    with ReplayWriter(path) as writer:
+        games = _play(range(10), LogSink(writer), MAKI_MAJORITY_RULES)
+    with ReplayStore(path) as store:
+        for index, original in enumerate(games):
+            turns = store.num_turns(index)
+            final = replay_game(store, index, turns, MAKI_MAJORITY_RULES)
+            assert final.round_scores == original.round_scores
+            assert final.rules is MAKI_MAJORITY_RULES
+
+
+def test_convert_log(tmp_path) -> None:
+    """Test that a game log converts to the same replays."""
+    log_path = tmp_path / "games.bin"
+    with GameLogWriter(log_path, "binary") as writer:
+        _play(range(10), LogSink(writer))
+    direct_path = tmp_path / "direct.sgr"
+    with ReplayWriter(direct_path) as writer:
+        _play(range(10), LogSink(writer))
+    assert convert_log(log_path, tmp_path / "converted.sgr", "binary") == 10
+    converted = (tmp_path / "converted.sgr").read_bytes()
+    assert converted == direct_path.read_bytes()
+
+
+def test_not_a_replay_file(tmp_path) -> None:
+    """Test that other files are rejected."""
+    path = tmp_path / "games.jsonl"
+    path.write_bytes(b"{}\n" * 20)
+    with pytest.raises(ValueError):
+        ReplayStore(path)
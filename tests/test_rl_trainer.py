@@ -0,0 +1,90 @@
+"""Tests for the self-play value trainer."""
+
+import os
+import sys
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+import numpy as np
+import pytest
+
+from cards import NUM_KINDS, CardKind, score_counts
+from rl_trainer import (
+    NUM_FEATURES,
+    SCORE_SCALE,
+    LinearValue,
+    MLPValue,
+    ReplayBuffer,
+    SelfPlayTrainer,
+    afterstate_features,
+    load_checkpoint,
+    save_checkpoint,
+)
+from strategies import get_strategy
+from strategy_compare import compare_strategies
+
+
+def test_replay_buffer_wraps() -> None:
+    """Test that the ring buffer keeps the newest transitions."""
+    buffer = ReplayBuffer(5, num_features=2)
+    buffer.add(np.arange(6).reshape(3, 2), [0, 1, 2])
+    buffer.add(np.arange(8).reshape(4, 2) + 6, [3, 4, 5, 6])
+    assert len(buffer) == 5
+    assert sorted(buffer.targets.tolist()) == [2, 3, 4, 5, 6]
+    for features, target in zip(
+        buffer.features.tolist(), buffer.targets.tolist(), strict=True
+    ):
+        assert features == [2 * target, 2 * target + 1]
+    buffer.add(np.zeros((7, 2)), np.full(7, 9))
+    assert buffer.targets.tolist() == [9] * 5
+    features, targets = buffer.sample(3, np.random.default_rng(0))
+    assert features.shape == (3, 2)
+    assert targets.shape == (3,)
+
+
+def test_afterstate_features() -> None:
+    """Test the features of each card against the scalar scorer."""
+    own = [0] * NUM_KINDS
+    own[CardKind.WASABI] = 1
+    opponent = [0] * NUM_KINDS
+    opponent[CardKind.TEMPURA] = 2
+    hand = [0] * NUM_KINDS
+    hand[CardKind.NIGIRI_SQUID] = 2
+    features = afterstate_features(own, opponent, hand, 1)
+    assert features.shape == (NUM_KINDS, NUM_FEATURES)
+    squid = features[CardKind.NIGIRI_SQUID]
+    played = own[:]
+    played[CardKind.NIGIRI_SQUID] += 1
+    assert squid[:NUM_KINDS].tolist() == played
+    assert squid[2 * NUM_KINDS + CardKind.NIGIRI_SQUID] == 1
+    assert squid[-3] * SCORE_SCALE == score_counts(played)
+    assert squid[-2] * SCORE_SCALE == score_counts(opponent)
+    assert squid[-1] == 1
+
+
+def test_training_and_checkpoint(tmp_path) -> None:
+    """Test that a short self-play run beats the default strategy."""
+    trainer = SelfPlayTrainer(MLPValue(), batch_games=256, seed=1)
+    losses = trainer.train(40)
+    assert trainer.transitions == 40 * 256 * 3 * 6
+    assert losses[-1] < losses[0]
+    path = tmp_path / "learned.npz"
+    save_checkpoint(path, trainer.value)
+    loaded = load_checkpoint(path)
+    features = trainer.buffer.features[:100]
+    assert np.allclose(
+        loaded.predict(features), trainer.value.predict(features)
+    )
+    result = compare_strategies(
+        get_strategy("learned", path=path), "default", max_deals=400
+    )
+    assert result.mean > 0
+    assert result.significant()
+
+    linear = LinearValue()
+    save_checkpoint(path, linear)
+    assert isinstance(load_checkpoint(path), LinearValue)
+    with pytest.raises(TypeError):
+        get_strategy("learned", path=path, epsilon=0.1)
@@ -0,0 +1,147 @@
+"""Tests for the table-driven scoring rules."""
+
+import os
+import random
+import sys
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from batch_sim import (
+    BatchGame,
+    maximizer_values,
+    round_bonuses,
+    score_tables,
+)
+from cards import (
+    DEFAULT_RULES,
+    MAKI_MAJORITY_RULES,
+    NUM_KINDS,
+    CardKind,
+    dumpling_points,
+)
+from events import NullSink
+from game_state import GameState
+from rules import Sets, Wasabi
+from sushi_go_game import CARDS, Deck, Game, TableTally
+
+
+def reference_score(counts):
+    """The scoring formula the game has always used."""
+    nigiri = 3 * counts[6] + 2 * counts[7] + counts[8]
+    if counts[CardKind.WASABI]:
+        nigiri += 9 if counts[6] else 6 if counts[7] else 3 if counts[8] else 0
+    return (
+        counts[0]
+        + 2 * counts[1]
+        + 3 * counts[2]
+        + nigiri
+        + counts[CardKind.TEMPURA] // 2 * 5
+        + counts[CardKind.SASHIMI] // 3 * 10
+        + dumpling_points(counts[CardKind.DUMPLING])
+    )
+
+
+def random_tables(rng, count, size=8):
+    """Random tables as lists of card kinds."""
+    return [
+        [rng.randrange(NUM_KINDS) for _ in range(rng.randrange(size))]
+        for _ in range(count)
+    ]
+
+
+def counts_of(kinds):
+    """Count vector of card kinds."""
+    counts = [0] * NUM_KINDS
+    for kind in kinds:
+        counts[kind] += 1
+    return counts
+
+
+def test_default_rules_keep_the_scores() -> None:
+    """Test the compiled tables against the hand-written formula."""
+    rng = random.Random(3)
+    for kinds in random_tables(rng, 2000):
+        counts = counts_of(kinds)
+        assert DEFAULT_RULES.score(counts) == reference_score(counts)
+        assert sum(DEFAULT_RULES.kind_points(counts)) == reference_score(
+            counts
+        )
+        tally = TableTally(CARDS[kind] for kind in kinds)
+        assert tally.score == reference_score(counts)
+
+
+def test_variant_is_swapped_in() -> None:
+    """Test that a variant changes the tallies and the batch scorers."""
+    variant = DEFAULT_RULES.variant(
+        {CardKind.WASABI: Wasabi(2), CardKind.TEMPURA: Sets(3, 8)}
+    )
+    counts = counts_of(
+        [CardKind.WASABI, CardKind.NIGIRI_SALMON] + [CardKind.TEMPURA] * 3
+    )
+    assert variant.score(counts) == 2 + 4 + 8
+    assert DEFAULT_RULES.score(counts) == 2 + 6 + 5
+    rng = random.Random(5)
+    tables = random_tables(rng, 500)
+    for kinds in tables:
+        tally = TableTally(rules=variant)
+        for kind in kinds:
+            tally.add(kind)
+        assert tally.score == variant.score(counts_of(kinds))
+    batch = [counts_of(kinds) for kinds in tables]
+    assert list(score_tables(batch, variant)) == [
+        variant.score(counts) for counts in batch
+    ]
+    values_batch = maximizer_values(batch, variant)
+    for counts, values in zip(batch, values_batch, strict=True):
+        tally = TableTally(rules=variant)
+        for kind, count in enumerate(counts):
+            for _ in range(count):
+                tally.add(kind)
+        assert list(values) == [tally.best_score(k) for k in range(NUM_KINDS)]
+
+
+def test_maki_majority() -> None:
+    """Test the majority bonuses and games played with them."""
+    rules = MAKI_MAJORITY_RULES
+    maki = [counts_of([CardKind.MAKI_3]), counts_of([CardKind.MAKI_1] * 2)]
+    empty = [0] * NUM_KINDS
+    assert rules.score(maki[0]) == 0, "Maki only score for majority"
+    assert rules.round_bonuses(maki + [empty]) == [6, 3, 0]
+    assert rules.round_bonuses([maki[0], maki[0], maki[1]]) == [3, 3, 0]
+    assert rules.round_bonuses([empty, empty]) == [0, 0]
+    assert DEFAULT_RULES.round_bonuses(maki) == [0, 0]
+    game = Game("A", "B", 3, Deck(random.Random(1)), NullSink(), rules=rules)
+    game.conduct_round()
+    classic = Game("A", "B", 3, Deck(random.Random(1)), NullSink())
+    classic.conduct_round()
+    assert game.round_scores != classic.round_scores
+
+
+def test_maki_majority_everywhere() -> None:
+    """Test that batches and round positions score the majority bonuses."""
+    rules = MAKI_MAJORITY_RULES
+    rng = random.Random(6)
+    pairs = [
+        [counts_of(kinds) for kinds in random_tables(rng, 2)]
+        for _ in range(300)
+    ]
+    assert round_bonuses(pairs, rules).tolist() == [
+        rules.round_bonuses(tables) for tables in pairs
+    ]
+    seeds = list(range(10))
+    round_scores = BatchGame.from_seeds(seeds, 3, rules=rules).conduct_round()
+    for seed in seeds:
+        game = Game(
+            "A", "B", 3, Deck(random.Random(seed)), NullSink(), rules=rules
+        )
+        game.conduct_round()
+        assert [tuple(scores) for scores in round_scores[seed].tolist()] == (
+            game.round_scores
+        ), f"Game {seed} should have the same round scores"
+    state = GameState.from_kinds(
+        [], [], [CardKind.MAKI_3], [CardKind.MAKI_1, CardKind.MAKI_1]
+    )
+    assert state.scores() == (3, 2), "Maki icons are points by default"
+    assert state.scores(rules) == (6, 3)
@@ -0,0 +1,113 @@
+"""Tests for the in-place state encoder."""
+
+import array
+import os
+import random
+import sys
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+import numpy as np
+
+from batch_sim import BatchGame
+from cards import NUM_KINDS
+from events import NullSink
+from state_encoder import (
+    OPPONENT_HAND,
+    OWN_HAND,
+    ROUND,
+    STATE_SIZE,
+    TURN,
+    encode_batch,
+    encode_game,
+    encode_positions,
+    flat_view,
+)
+from strategies import DEFAULT_STRATEGY, Strategy, seat_of
+from sushi_go_game import Deck, Game, Player
+
+
+def _counts(cards):
+    counts = [0] * NUM_KINDS
+    for card in cards:
+        counts[card.kind] += 1
+    return counts
+
+
+def _expected(game, seat):
+    """Position of ``seat`` by walking the lists of cards."""
+    players = (game.player1, game.player2)
+    tables = (game.table.player1_table, game.table.player2_table)
+    turn = len(tables[seat])
+    opponent_hand = players[1 - seat].hand if turn else []
+    return (
+        _counts(players[seat].hand)
+        + _counts(tables[seat])
+        + _counts(tables[1 - seat])
+        + _counts(opponent_hand)
+        + [game.round_index, turn]
+    )
+
+
+class _Recorder(Strategy):
+    """Plays the default strategy, encoding each position it sees."""
+
+    def __init__(self, out):
+        self.view = flat_view(out)
+        self.game = None
+        self.offset = 0
+        self.expected = []
+
+    def choose(self, hand, table, first=False, cache=None):
+        seat = seat_of(hand, table)
+        self.expected.append(_expected(self.game, seat))
+        self.offset = encode_game(self.game, seat, self.view, self.offset)
+        return DEFAULT_STRATEGY.choose(hand, table, first, cache)
+
+
+def test_encode_game() -> None:
+    """Test every position of a game against the lists of cards."""
+    out = np.full((18, STATE_SIZE), -1, dtype=np.float32)
+    recorder = _Recorder(out)
+    players = (Player("A", recorder), Player("B", recorder))
+    recorder.game = Game(*players, 3, Deck(random.Random(5)), NullSink())
+    recorder.game.conduct_round()
+    assert out.tolist() == recorder.expected
+    assert out[:, TURN].tolist() == [0, 0, 1, 1, 2, 2] * 3
+    assert out[:, ROUND].tolist() == [0] * 6 + [1] * 6 + [2] * 6
+    assert not out[0, OPPONENT_HAND:ROUND].any(), "Not known on turn 0"
+    assert out[2, OPPONENT_HAND:ROUND].sum() == 2
+
+
+def test_encode_positions_any_buffer() -> None:
+    """Test writing rows of integer buffers."""
+    game = Game("A", "B", 1, Deck(random.Random(2)), NullSink())
+    game.player1.assign_cards(game.deck, 3)
+    game.player2.assign_cards(game.deck, 3)
+    positions = [(game.table, 0, 0), (game.table, 1, 0)]
+    out = array.array("b", [9] * (2 * STATE_SIZE))
+    assert encode_positions(positions, out) == 2
+    assert list(out[:STATE_SIZE]) == _expected(game, 0)
+    assert list(out[STATE_SIZE:]) == _expected(game, 1)
+
+
+def test_encode_batch() -> None:
+    """Test the bulk encoder against counting each game's hands."""
+    batch = BatchGame.from_generator(6, 1, np.random.default_rng(0))
+    for player in range(2):
+        batch.hands[:, player] = batch.deal(3)
+    out = np.empty((6, STATE_SIZE), dtype=np.int16)
+    encode_batch(batch, 1, 0, 0, out)
+    hands = batch.hand_counts()
+    assert (out[:, OWN_HAND:NUM_KINDS] == hands[:, 1]).all()
+    assert not out[:, NUM_KINDS:].any()
+    batch.play([1] * NUM_KINDS)
+    batch.switch_hands()
+    assert encode_batch(batch, 1, 2, 1, out) is out
+    hands = batch.hand_counts()
+    assert (out[:, OWN_HAND:NUM_KINDS] == hands[:, 1]).all()
+    assert (out[:, NUM_KINDS : 2 * NUM_KINDS] == batch.tables[:, 1]).all()
+    assert (out[:, OPPONENT_HAND:ROUND] == hands[:, 0]).all()
+    assert (out[:, ROUND:] == [2, 1]).all()
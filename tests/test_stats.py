@@ -0,0 +1,145 @@
+"""Tests for the streaming statistics."""
+
+import os
+import random
+import statistics
+import sys
+
+import pytest
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from cards import MAKI_MAJORITY_RULES, NUM_KINDS, kind_points, score_counts
+from events import MultiSink, NullSink, StructuredSink
+from stats import Histogram, ResultsAggregator, RunningStats, StatsSink
+from sushi_go_game import Deck, Game
+from tournament import play_game
+
+
+def test_running_stats_match_statistics() -> None:
+    """Test the mean, variance and extremes against ``statistics``."""
+    rng = random.Random(0)
+    values = [rng.randint(-20, 80) for _ in range(500)]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.variance == pytest.approx(statistics.variance(values))
+    assert stats.stdev == pytest.approx(statistics.stdev(values))
+    assert (stats.minimum, stats.maximum) == (min(values), max(values))
+
+
+def test_running_stats_merge_is_exact() -> None:
+    """Test that merging chunks in any order equals a single pass."""
+    values = list(range(-5, 40))
+    single = RunningStats()
+    for value in values:
+        single.add(value)
+    for split in (0, 7, 30):
+        low, high = RunningStats(), RunningStats()
+        for value in values[:split]:
+            low.add(value)
+        for value in values[split:]:
+            high.add(value)
+        assert RunningStats().merge(high).merge(low) == single
+
+
+def test_histogram() -> None:
+    """Test binning, overflow and merging of histograms."""
+    histogram = Histogram(0, 10, 5)
+    for value in (-1, 0, 1, 2, 9, 10, 25):
+        histogram.add(value)
+    assert histogram.counts == [2, 1, 0, 0, 1]
+    assert (histogram.underflow, histogram.overflow) == (1, 2)
+    assert histogram.edges() == [0, 2, 4, 6, 8, 10]
+    other = Histogram(0, 10, 5)
+    other.add(5)
+    assert histogram.merge(other).counts == [2, 1, 1, 0, 1]
+    with pytest.raises(ValueError):
+        histogram.merge(Histogram(0, 10, 4))
+
+
+def test_kind_points_add_up_to_score() -> None:
+    """Test that the points by kind add up to the score of the table."""
+    rng = random.Random(1)
+    for _ in range(2000):
+        counts = [rng.randint(0, 6) for _ in range(NUM_KINDS)]
+        assert sum(kind_points(counts)) == score_counts(counts)
+
+
+def test_aggregator_merge_matches_single_pass() -> None:
+    """Test that merged chunks give the results of one pass."""
+    single = ResultsAggregator()
+    sink = StatsSink(single)
+    for game_index in range(30):
+        play_game(5, game_index, sink=sink)
+    merged = ResultsAggregator()
+    for start in (20, 0, 10):
+        chunk = ResultsAggregator()
+        sink = StatsSink(chunk)
+        for game_index in range(start, start + 10):
+            play_game(5, game_index, sink=sink)
+        merged.merge(chunk)
+    assert merged == single
+    assert single.games == 30
+    assert sum(single.wins) + single.ties == 30
+    assert [
+        w + single.ties + loss
+        for w, loss in zip(single.wins, single.losses, strict=True)
+    ] == [30, 30]
+    assert sum(sum(points) for points in single.kind_points) == sum(
+        single.total_scores
+    )
+
+
+def test_kind_points_follow_the_rules() -> None:
+    """Test that the points by kind add up under maki majority."""
+    rules = MAKI_MAJORITY_RULES
+    results = ResultsAggregator(rules=rules)
+    sink = StatsSink(results)
+    for seed in range(20):
+        game = Game(
+            "A", "B", 3, Deck(random.Random(seed)), sink=sink, rules=rules
+        )
+        game.conduct_round()
+    assert [sum(points) for points in results.kind_points] == (
+        results.total_scores
+    )
+    maki = sum(
+        points[kind]
+        for points in results.kind_points
+        for kind in range(NUM_KINDS)
+        if rules.icons[kind]
+    )
+    assert maki > 0, "Majority bonuses are credited to maki"
+
+
+def test_add_game_matches_sink() -> None:
+    """Test that ``add_game`` counts the outcome like ``StatsSink``."""
+    from_games = ResultsAggregator()
+    from_sink = ResultsAggregator()
+    sink = StatsSink(from_sink)
+    for game_index in range(10):
+        from_games.add_game(play_game(2, game_index, sink=sink))
+    assert from_games.scores == from_sink.scores
+    assert from_games.round_scores == from_sink.round_scores
+    assert from_games.margins == from_sink.margins
+    assert (from_games.wins, from_games.ties) == (
+        from_sink.wins,
+        from_sink.ties,
+    )
+
+
+def test_multi_sink() -> None:
+    """Test that a multi sink feeds every enabled sink."""
+    first, second = StructuredSink(), StructuredSink()
+    sink = MultiSink(first, NullSink(), second)
+    assert sink.enabled
+    assert len(sink.sinks) == 2
+    play_game(0, 0, sink=sink)
+    assert first.events == second.events
+    assert first.events[-1]["event"] == "game_end"
+    assert not MultiSink(NullSink()).enabled
@@ -0,0 +1,126 @@
+"""Tests for the strategy plugin API."""
+
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from batch_sim import BatchGame
+from cards import DEFAULT_RULES, CardKind
+from decision_cache import DecisionCache
+from events import NullSink
+from rules import Flat
+from strategies import (
+    DEFAULT_STRATEGY,
+    MAX_SCORING,
+    MAXIMIZER,
+    MaxScoringStrategy,
+    Strategy,
+    get_strategy,
+    register,
+    strategy_names,
+)
+from sushi_go_game import CARDS, Card, Deck, Game, Player, RandomTable
+
+
+def _states(seed, count):
+    """Random hands against random shared tables."""
+    rng = random.Random(seed)
+    hands = []
+    tables = []
+    for _ in range(count):
+        hands.append([rng.choice(CARDS) for _ in range(rng.randint(1, 4))])
+        cards = [rng.choice(CARDS) for _ in range(rng.randint(0, 5))]
+        tables.append(RandomTable(cards, None, None))
+    return hands, tables
+
+
+def test_registry() -> None:
+    """Test building strategies by name and rejecting unknown names."""
+    assert {"default", "max_scoring", "maximizer"} <= set(strategy_names())
+    assert isinstance(get_strategy("max_scoring"), MaxScoringStrategy)
+    assert get_strategy("default") is DEFAULT_STRATEGY
+    assert get_strategy("maximizer").name == "maximizer"
+    with pytest.raises(ValueError):
+        get_strategy("no such strategy")
+    with pytest.raises(ValueError):
+        register("maximizer")(Strategy)
+
+
+def test_adapters_match_legacy_rules() -> None:
+    """Test that the adapters choose what the old code paths chose."""
+    hands, tables = _states(0, 500)
+    cache = DecisionCache()
+    for hand, table in zip(hands, tables, strict=True):
+        best_score = table.common_tally.best_score
+        expected = max(hand, key=lambda card: best_score(card.kind))
+        assert MAXIMIZER.choose(hand, table) is expected
+        assert MAXIMIZER.choose(hand, table, cache=cache) is expected
+        expected = max(hand, key=lambda card: card.score())
+        assert MAX_SCORING.choose(hand, table, first=True) is expected
+
+
+def test_batch_matches_single_decisions() -> None:
+    """Test that batch decisions equal one decision per state."""
+    hands, tables = _states(1, 300)
+    # Hands sharing a table exercise the per-table values
+    tables = tables[:30] * 10
+    for strategy in (MAX_SCORING, MAXIMIZER, DEFAULT_STRATEGY):
+        for first in (True, False):
+            expected = [
+                strategy.choose(hand, table, first)
+                for hand, table in zip(hands, tables, strict=True)
+            ]
+            assert strategy.choose_batch(hands, tables, first) == expected
+    cache = DecisionCache()
+    assert MAXIMIZER.choose_batch(hands, tables, cache=cache) == (
+        MAXIMIZER.choose_batch(hands, tables)
+    )
+
+
+def test_players_share_default_strategy() -> None:
+    """Test that players get the shared strategy or a named one."""
+    assert Player("A").strategy is Player("B").strategy is DEFAULT_STRATEGY
+    player = Player("A", strategy="max_scoring")
+    player.hand = [CARDS[0], CARDS[6], CARDS[4]]
+    table = RandomTable([CARDS[8]], player, None)
+    assert player.play_best_card(table) is CARDS[4]
+
+
+def test_named_strategies_in_game() -> None:
+    """Test a game between players with different strategies."""
+    player1 = Player("Player 1", strategy="max_scoring")
+    player2 = Player("Player 2", strategy="maximizer")
+    game = Game(player1, player2, 3, Deck(random.Random(2)), sink=NullSink())
+    game.conduct_round()
+    assert len(game.round_scores) == 3
+
+
+def test_batch_game_with_strategy() -> None:
+    """Test that the default strategy plays the batch like before."""
+    seeds = range(200)
+    default = BatchGame.from_seeds(seeds, 3).conduct_round()
+    with_strategy = BatchGame.from_seeds(seeds, 3).conduct_round(
+        DEFAULT_STRATEGY
+    )
+    assert np.array_equal(default, with_strategy)
+    with pytest.raises(NotImplementedError):
+        BatchGame.from_seeds(seeds, 1).conduct_round(Strategy())
+
+
+def test_negative_values_still_choose() -> None:
+    """Test that a card is chosen when every value is below -1."""
+    variant = DEFAULT_RULES.variant(
+        {CardKind.TEMPURA: Flat(-3), CardKind.SASHIMI: Flat(-2)}
+    )
+    hand = [Card("Tempura"), Card("Sashimi"), Card("Tempura")]
+    table = RandomTable([], None, None, rules=variant)
+    for strategy in (MAX_SCORING, MAXIMIZER):
+        assert strategy.choose(hand, table) is hand[1]
+        assert strategy.choose_batch([hand], [table]) == [hand[1]]
@@ -0,0 +1,83 @@
+"""Tests for the duplicate-deal strategy comparison."""
+
+import math
+import os
+import sys
+from functools import partial
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from ismcts import ISMCTSPlayer
+from strategies import MAX_SCORING, Strategy
+from strategy_compare import compare_strategies, play_deal
+
+SEARCH = partial(ISMCTSPlayer, iterations=30)
+
+
+def test_identical_strategies_cancel() -> None:
+    """Test that a strategy against itself has no paired difference."""
+    result = compare_strategies("default", "default", max_deals=60)
+    assert result.deals == 60
+    assert result.paired.total == 0
+    assert result.paired.variance == 0
+    assert not result.significant()
+    assert not result.stopped_early
+    assert result.variance_ratio() == math.inf
+
+
+def test_deals_are_common_random_numbers() -> None:
+    """Test that a deal replays the same way for the same sides."""
+    assert play_deal(SEARCH, "default", 3, 5) == play_deal(
+        SEARCH, "default", 3, 5
+    )
+    first, second = play_deal("max_scoring", "maximizer", 3, 5)
+    swapped = play_deal("maximizer", "max_scoring", 3, 5)
+    assert swapped == [-second, -first]
+
+
+class _OneGame(Strategy):
+    """Max scoring strategy that fails if it sees a second game."""
+
+    def __init__(self):
+        self.first_plays = 0
+
+    def choose(self, hand, table, first=False, cache=None):
+        self.first_plays += first
+        assert self.first_plays <= 3, "Strategy state leaked between games"
+        return MAX_SCORING.choose(hand, table, first)
+
+
+def test_each_player_gets_a_fresh_strategy() -> None:
+    """Test that a stateful strategy starts every game and seat anew."""
+    strategy = _OneGame()
+    result = compare_strategies(strategy, "card_counting", max_deals=10)
+    assert result.deals == 10
+    assert strategy.first_plays == 0, "The given instance is only copied"
+
+
+def test_stops_once_significant() -> None:
+    """Test early stopping and that workers do not change the result."""
+    result = compare_strategies(
+        SEARCH, "default", max_deals=400, check_every=20, master_seed=1
+    )
+    assert result.stopped_early
+    assert result.deals < 400
+    assert result.significant()
+    low, high = result.interval()
+    assert 0 < low < result.mean < high
+    wide_low, wide_high = result.interval()
+    narrow_low, narrow_high = result.interval(confidence=0.5)
+    assert wide_low < narrow_low < narrow_high < wide_high
+    pooled = compare_strategies(
+        SEARCH,
+        "default",
+        max_deals=400,
+        check_every=20,
+        master_seed=1,
+        workers=2,
+    )
+    assert pooled.paired == result.paired
+    assert pooled.games == result.games
+    assert "stopped early" in str(pooled)
@@ -0,0 +1,56 @@
+"""Tests for the running table tallies."""
+
+import os
+import sys
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from cards import CardKind
+from sushi_go_game import (
+    Card,
+    Deck,
+    Game,
+    Player,
+    RandomTable,
+    TableTally,
+)
+
+
+def test_tally_matches_final_score() -> None:
+    """Test that the running score matches a full rescan of the table."""
+    names = ["Wasabi", "Egg Nigiri", "Tempura", "Squid Nigiri", "Tempura"]
+    names += ["Dumpling", "Sashimi", "Dumpling", "Maki 2", "Sashimi"]
+    names += ["Sashimi", "Dumpling"]
+    game = Game("Player 1", "Player 2", 1, Deck())
+    player1 = game.player1
+    player2 = game.player2
+    table = game.table
+    for name in names:
+        table.update_table_with_card(player1, Card(name))
+        assert table.score(player1) == game.calculate_final_score(
+            table.player1_table
+        ), "Running score should match the final score"
+    assert table.score(player1) == 1 + 3 + 9 + 5 + 6 + 2 + 10
+    assert table.score(player2) == 0, "Player 2's table should be empty"
+
+
+def test_marginal_score() -> None:
+    """Test the points a card would add to a table."""
+    player1 = Player("Player 1")
+    table = RandomTable([], player1, None)
+    table.update_table_with_card(player1, Card("Salmon Nigiri"))
+    assert table.marginal_score(player1, Card("Wasabi")) == 6
+    table.update_table_with_card(player1, Card("Wasabi"))
+    assert table.marginal_score(player1, Card("Squid Nigiri")) == 6
+    assert table.marginal_score(player1, Card("Egg Nigiri")) == 1
+
+
+def test_common_tally_follows_cards_on_table() -> None:
+    """Test that replacing the shared cards refreshes their tally."""
+    table = RandomTable([], None, None)
+    assert table.common_tally.counts[CardKind.WASABI] == 0
+    table.cards_on_table = [Card("Wasabi")]
+    assert table.common_tally.has_wasabi, "Tally should see the Wasabi"
+    assert TableTally([Card("Egg Nigiri")]).top_nigiri == 1
@@ -0,0 +1,37 @@
+"""Tests for the tournament runner."""
+
+import os
+import sys
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from stats import ResultsAggregator, StatsSink
+from tournament import game_seed, play_game, run_tournament
+
+
+def test_game_seed() -> None:
+    """Test that game seeds are stable and differ between games."""
+    assert game_seed(1, 5) == game_seed(1, 5), "Seeds should be stable"
+    assert game_seed(1, 5) != game_seed(1, 6)
+    assert game_seed(1, 5) != game_seed(2, 5)
+
+
+def test_results_do_not_depend_on_workers() -> None:
+    """Test that the worker count does not change the results."""
+    serial = run_tournament(40, master_seed=3, workers=1, chunk_size=7)
+    parallel = run_tournament(40, master_seed=3, workers=2, chunk_size=7)
+    assert serial == parallel, "Results should match at any worker count"
+    assert serial.games == 40
+    assert sum(serial.wins) + serial.ties == 40
+
+
+def test_replay_game() -> None:
+    """Test that replaying every game rebuilds the tournament results."""
+    result = ResultsAggregator()
+    sink = StatsSink(result)
+    for game_index in range(10):
+        game = play_game(3, game_index, sink=sink)
+        assert game.round_scores == play_game(3, game_index).round_scores
+    assert result == run_tournament(10, master_seed=3, workers=1)